@@ -5,13 +5,14 @@ import functools
 import logging
 import random
 import secrets
+import threading
 import warnings
 from argparse import Namespace
 from collections import Counter, deque, defaultdict
 from collections.abc import Collection, MutableSequence
 from enum import IntEnum, IntFlag
-from typing import (AbstractSet, Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Literal, Mapping, NamedTuple,
-                    Optional, Protocol, Set, Tuple, Union, TYPE_CHECKING, Literal, overload)
+from typing import (AbstractSet, Any, Callable, ClassVar, Dict, Generator, Iterable, Iterator, List, Literal, Mapping,
+                    NamedTuple, Optional, Protocol, Set, Tuple, Union, TYPE_CHECKING, Literal, overload)
 import dataclasses
 
 from typing_extensions import NotRequired, TypedDict
@@ -101,6 +102,8 @@ class MultiWorld():
     random: random.Random
     per_slot_randoms: Utils.DeprecateDict[int, random.Random]
     """Deprecated. Please use `self.random` instead."""
+    sphere_cache: Optional[SphereCache] = None
+    """Set once the item placement is final, so the spheres are only swept once for all output."""
 
     class AttributeProxy():
         def __init__(self, rule):
@@ -581,33 +584,56 @@ class MultiWorld():
 
         return False
 
-    def get_spheres(self) -> Iterator[Set[Location]]:
+    def sweep_spheres(self, state: CollectionState, locations: Iterable[Location],
+                      events: Iterable[Location] = ()) -> Generator[Set[Location], None, Set[Location]]:
         """
-        yields a set of locations for each logical sphere
-
-        If there are unreachable locations, the last sphere of reachable
-        locations is followed by an empty set, and then a set of all of the
-        unreachable locations.
+        Yields the set of locations reachable in each logical sphere, collecting each sphere into state, and returns
+        the locations that stay unreachable. Reachable events are collected as soon as possible instead of forming
+        spheres of their own.
         """
-        state = CollectionState(self)
-        locations = set(self.get_filled_locations())
+        locations = set(locations)
+        events = set(events)
+        index = LocationDependencyIndex(state)
 
         while locations:
-            sphere: Set[Location] = set()
+            # cull events out
+            done_events = index.partition(events)[0]
+            while done_events:
+                for event in done_events:
+                    index.collect(event)
+                events.difference_update(done_events)
+                done_events = index.partition(events)[0]
 
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-            yield sphere
+            sphere = set(index.partition(locations)[0])
             if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
                 break
 
+            yield sphere
             for location in sphere:
-                state.collect(location.item, True, location)
+                index.collect(location)
             locations -= sphere
 
+        return locations
+
+    def get_spheres(self) -> Iterator[Set[Location]]:
+        """
+        yields a set of locations for each logical sphere
+
+        If there are unreachable locations, the last sphere of reachable
+        locations is followed by an empty set, and then a set of all of the
+        unreachable locations.
+        """
+        if self.sphere_cache:
+            sweep = self.sphere_cache.get_spheres()
+            for sphere in sweep.spheres:
+                yield set(sphere)
+            unreachable = set(sweep.unreachable)
+        else:
+            unreachable = yield from self.sweep_spheres(CollectionState(self), self.get_filled_locations())
+        if unreachable:
+            yield set()
+            yield unreachable
+
     def get_sendable_spheres(self) -> Iterator[Set[Location]]:
         """
         yields a set of multiserver sendable locations (location.item.code: int) for each logical sphere
@@ -615,44 +641,31 @@ class MultiWorld():
         If there are unreachable locations, the last sphere of reachable locations is followed by an empty set,
         and then a set of all of the unreachable locations.
         """
-        state = CollectionState(self)
-        locations: Set[Location] = set()
-        events: Set[Location] = set()
+        if self.sphere_cache:
+            sweep = self.sphere_cache.get_sendable_spheres()
+            for sphere in sweep.spheres:
+                yield set(sphere)
+            unreachable = set(sweep.unreachable)
+        else:
+            unreachable = yield from self.sweep_sendable_spheres(CollectionState(self))
+        if unreachable:
+            yield set()
+            yield unreachable
+
+    def sweep_sendable_spheres(self, state: CollectionState) -> Generator[Set[Location], None, Set[Location]]:
+        """sweep_spheres over the filled locations, with every location not sendable by the multiserver as an event"""
+        locations: List[Location] = []
+        events: List[Location] = []
         for location in self.get_filled_locations():
             if type(location.item.code) is int and type(location.address) is int:
-                locations.add(location)
+                locations.append(location)
             else:
-                events.add(location)
-
-        while locations:
-            sphere: Set[Location] = set()
-
-            # cull events out
-            done_events: Set[Union[Location, None]] = {None}
-            while done_events:
-                done_events = set()
-                for event in events:
-                    if event.can_reach(state):
-                        state.collect(event.item, True, event)
-                        done_events.add(event)
-                events -= done_events
-
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-
-            yield sphere
-            if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
-                break
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-            locations -= sphere
+                events.append(location)
+        return self.sweep_spheres(state, locations, events)
 
     def fulfills_accessibility(self, state: Optional[CollectionState] = None):
         """Check if accessibility rules are fulfilled with current or supplied state."""
+        supplied_state = state is not None
         if not state:
             state = CollectionState(self)
         players: Dict[str, Set[int]] = {
@@ -684,6 +697,16 @@ class MultiWorld():
 
         locations = [location for location in self.get_locations() if location_relevant(location)]
 
+        if self.sphere_cache and not supplied_state:
+            # the spheres are final, so only what they never reached is left to sweep, starting from their end state
+            sweep = self.sphere_cache.get_spheres()
+            state = sweep.state
+            reached = set().union(*sweep.spheres)
+            locations = [location for location in locations if location not in reached]
+            beatable_fulfilled = self.has_beaten_game(state)
+            if all_done():
+                return True
+
         while locations:
             sphere: List[Location] = []
             for n in range(len(locations) - 1, -1, -1):
@@ -715,9 +738,439 @@ class MultiWorld():
         return False
 
 
+class SphereSweep(NamedTuple):
+    spheres: List[Set[Location]]
+    """reachable locations of each sphere, in order"""
+    unreachable: Set[Location]
+    state: CollectionState
+    """state after collecting every sphere, not to be modified"""
+
+
+class SphereCache:
+    """
+    Sweeps the spheres of a multiworld with final item placement once, when first needed, and shares the result with
+    everything that needs spheres afterwards, like the accessibility check, the multidata and the playthrough.
+    Safe to use from multiple threads.
+    """
+    multiworld: MultiWorld
+    _spheres: Optional[SphereSweep]
+    _sendable_spheres: Optional[SphereSweep]
+
+    def __init__(self, multiworld: MultiWorld):
+        self.multiworld = multiworld
+        self._spheres = None
+        self._sendable_spheres = None
+        self._spheres_lock = threading.Lock()
+        self._sendable_spheres_lock = threading.Lock()
+
+    @staticmethod
+    def _sweep(state: CollectionState,
+               sweep: Generator[Set[Location], None, Set[Location]]) -> SphereSweep:
+        spheres: List[Set[Location]] = []
+        while True:
+            try:
+                spheres.append(next(sweep))
+            except StopIteration as stop:
+                return SphereSweep(spheres, stop.value, state)
+
+    def get_spheres(self) -> SphereSweep:
+        """The spheres of all filled locations, as yielded by MultiWorld.get_spheres."""
+        with self._spheres_lock:
+            if self._spheres is None:
+                state = CollectionState(self.multiworld)
+                self._spheres = self._sweep(state,
+                                            self.multiworld.sweep_spheres(state, self.multiworld.get_filled_locations()))
+            return self._spheres
+
+    def get_sendable_spheres(self) -> SphereSweep:
+        """The spheres of all multiserver sendable locations, as yielded by MultiWorld.get_sendable_spheres."""
+        with self._sendable_spheres_lock:
+            if self._sendable_spheres is None:
+                state = CollectionState(self.multiworld)
+                self._sendable_spheres = self._sweep(state, self.multiworld.sweep_sendable_spheres(state))
+            return self._sendable_spheres
+
+
 PathValue = Tuple[str, Optional["PathValue"]]
 
 
+class _RuleTrace:
+    """Records what an access rule read from a CollectionState while it was evaluated."""
+    __slots__ = ("items", "regions", "untraceable")
+
+    items: Set[Any]
+    """item names read from a single player's prog_items, or (player, item name) for rules traced across players"""
+    regions: Set[Region]
+    untraceable: bool
+
+    def __init__(self) -> None:
+        self.items = set()
+        self.regions = set()
+        self.untraceable = False
+
+    def reset(self) -> None:
+        self.items.clear()
+        self.regions.clear()
+        self.untraceable = False
+
+
+class _TracedProgItems:
+    """Stands in for a player's prog_items Counter while entrance rules are tested, recording every item name looked up.
+    Anything that is not a plain lookup marks the rule as untraceable, so it gets re-tested on every update."""
+    __slots__ = ("counter", "trace")
+
+    def __init__(self, counter: Counter[str], trace: _RuleTrace) -> None:
+        self.counter = counter
+        self.trace = trace
+
+    def __getitem__(self, item: str) -> int:
+        self.trace.items.add(item)
+        return self.counter[item]
+
+    def get(self, item: str, default: Any = None) -> Any:
+        self.trace.items.add(item)
+        return self.counter.get(item, default)
+
+    def __contains__(self, item: str) -> bool:
+        self.trace.items.add(item)
+        return item in self.counter
+
+    def __setitem__(self, item: str, value: int) -> None:
+        self.trace.untraceable = True
+        self.counter[item] = value
+
+    def __delitem__(self, item: str) -> None:
+        self.trace.untraceable = True
+        del self.counter[item]
+
+    def __iter__(self) -> Iterator[str]:
+        self.trace.untraceable = True
+        return iter(self.counter)
+
+    def __len__(self) -> int:
+        self.trace.untraceable = True
+        return len(self.counter)
+
+    def __getattr__(self, name: str) -> Any:
+        self.trace.untraceable = True
+        return getattr(self.counter, name)
+
+
+class _TracedPlayerProgItems(_TracedProgItems):
+    """_TracedProgItems that records each item name together with the player, for rules that may read any player."""
+    __slots__ = ("player",)
+
+    def __init__(self, counter: Counter[str], trace: _RuleTrace, player: int) -> None:
+        super().__init__(counter, trace)
+        self.player = player
+
+    def __getitem__(self, item: str) -> int:
+        self.trace.items.add((self.player, item))
+        return self.counter[item]
+
+    def get(self, item: str, default: Any = None) -> Any:
+        self.trace.items.add((self.player, item))
+        return self.counter.get(item, default)
+
+    def __contains__(self, item: str) -> bool:
+        self.trace.items.add((self.player, item))
+        return item in self.counter
+
+
+class _TracedRegions:
+    """Stands in for a player's reachable_regions set while entrance rules are tested, recording every Region checked."""
+    __slots__ = ("regions", "trace")
+
+    def __init__(self, regions: Set[Region], trace: _RuleTrace) -> None:
+        self.regions = regions
+        self.trace = trace
+
+    def __contains__(self, region: Region) -> bool:
+        self.trace.regions.add(region)
+        return region in self.regions
+
+    def __iter__(self) -> Iterator[Region]:
+        self.trace.untraceable = True
+        return iter(self.regions)
+
+    def __len__(self) -> int:
+        self.trace.untraceable = True
+        return len(self.regions)
+
+    def __getattr__(self, name: str) -> Any:
+        self.trace.untraceable = True
+        return getattr(self.regions, name)
+
+
+class _TracedPlayers(dict):
+    """Stands in for one of CollectionState's per-player mappings while location rules are tested, handing out a traced
+    stand-in for the container of each player a rule looks up."""
+    __slots__ = ("containers", "trace", "wrap")
+
+    def __init__(self, containers: Dict[int, Any], trace: _RuleTrace, wrap: Callable[[Any, int], Any]) -> None:
+        super().__init__()
+        self.containers = containers
+        self.trace = trace
+        self.wrap = wrap
+
+    def __missing__(self, player: int) -> Any:
+        traced = self.wrap(self.containers[player], player)
+        self[player] = traced
+        return traced
+
+    def __contains__(self, player: object) -> bool:
+        return player in self.containers
+
+    def get(self, player: int, default: Any = None) -> Any:
+        return self[player] if player in self.containers else default
+
+    def __setitem__(self, player: int, value: Any) -> None:
+        if not isinstance(value, (_TracedProgItems, _TracedRegions)):
+            self.trace.untraceable = True
+            self.containers[player] = value
+        super().__setitem__(player, value)
+
+    def __iter__(self) -> Iterator[int]:
+        self.trace.untraceable = True
+        return iter(self.containers)
+
+    def __len__(self) -> int:
+        self.trace.untraceable = True
+        return len(self.containers)
+
+    def keys(self):
+        self.trace.untraceable = True
+        return self.containers.keys()
+
+    def values(self):
+        self.trace.untraceable = True
+        return self.containers.values()
+
+    def items(self):
+        self.trace.untraceable = True
+        return self.containers.items()
+
+    def copy(self) -> Dict[int, Any]:
+        self.trace.untraceable = True
+        return self.containers.copy()
+
+
+class _TracedOwnPlayer(_TracedPlayers):
+    """_TracedPlayers for the entrance rules of a single player. The containers of other players are handed out as they
+    are, but looking one up marks the rule as untraceable, as their changes don't update this player's index."""
+    __slots__ = ()
+
+    def __init__(self, containers: Dict[int, Any], trace: _RuleTrace, player: int, traced: Any) -> None:
+        super().__init__(containers, trace, lambda container, player: container)
+        dict.__setitem__(self, player, traced)
+
+    def __missing__(self, player: int) -> Any:
+        self.trace.untraceable = True
+        return self.containers[player]
+
+    def __setitem__(self, player: int, value: Any) -> None:
+        self.trace.untraceable = True
+        self.containers[player] = value
+
+
+class ReachabilityIndex:
+    """
+    Per-player bookkeeping of CollectionState for worlds with World.incremental_reachability.
+
+    Maps item names and regions to the blocked entrances whose access rule read them the last time it failed, so that
+    an update of the reachable regions only has to re-test the entrances affected by what changed since the last one.
+    """
+    __slots__ = ("item_dependents", "region_dependents", "always_retest", "dirty_items")
+
+    item_dependents: Dict[str, Set[Entrance]]
+    """item name -> blocked entrances whose rule read that item"""
+    region_dependents: Dict[Region, Set[Entrance]]
+    """unreached region -> blocked entrances whose rule checked that region"""
+    always_retest: Set[Entrance]
+    """blocked entrances whose rule could not be traced, re-tested on every update"""
+    dirty_items: Set[str]
+    """item names added or removed since the last update"""
+
+    def __init__(self) -> None:
+        self.item_dependents = {}
+        self.region_dependents = {}
+        self.always_retest = set()
+        self.dirty_items = set()
+
+    def copy(self) -> ReachabilityIndex:
+        ret = ReachabilityIndex()
+        ret.item_dependents = {item: entrances.copy() for item, entrances in self.item_dependents.items()}
+        ret.region_dependents = {region: entrances.copy() for region, entrances in self.region_dependents.items()}
+        ret.always_retest = self.always_retest.copy()
+        ret.dirty_items = self.dirty_items.copy()
+        return ret
+
+    def pop_affected(self, blocked_connections: Set[Entrance]) -> deque:
+        """Returns the blocked entrances that have to be re-tested and forgets their recorded dependencies."""
+        affected = self.always_retest
+        self.always_retest = set()
+        item_dependents = self.item_dependents
+        for item in self.dirty_items:
+            entrances = item_dependents.pop(item, None)
+            if entrances:
+                affected |= entrances
+        self.dirty_items.clear()
+        return deque(entrance for entrance in affected if entrance in blocked_connections)
+
+    def register(self, entrance: Entrance, trace: _RuleTrace, reachable_regions: Set[Region]) -> None:
+        """Records what a failed access rule read, so the entrance is only re-tested once any of it changes."""
+        if trace.untraceable:
+            self.always_retest.add(entrance)
+            return
+        for item in trace.items:
+            self.item_dependents.setdefault(item, set()).add(entrance)
+        for region in trace.regions:
+            if region not in reachable_regions:
+                self.region_dependents.setdefault(region, set()).add(entrance)
+
+
+class LocationDependencyIndex:
+    """
+    Bookkeeping of a sweep over the locations of a CollectionState, for worlds with World.incremental_reachability.
+
+    Maps the items and regions of any player to the unreached locations whose access rule, including the check of the
+    parent region, read them the last time it failed, so that each iteration of the sweep only re-tests the locations
+    affected by what was collected since the previous one. Locations of other worlds and locations whose rule could not
+    be traced are re-tested every time.
+    """
+    __slots__ = ("state", "traced_players", "waiting", "item_dependents", "item_counts", "region_dependents",
+                 "changed_players")
+
+    state: CollectionState
+    traced_players: Set[int]
+    """players whose locations are traced"""
+    waiting: Set[Location]
+    """traced locations that are unreachable until something their rule read changes"""
+    item_dependents: Dict[int, Dict[str, Set[Location]]]
+    """player -> item name -> waiting locations whose rule read that item"""
+    item_counts: Dict[int, Dict[str, Optional[int]]]
+    """player -> item name -> count of the item when the rules in item_dependents read it, None if not in state"""
+    region_dependents: Dict[int, Dict[Region, Set[Location]]]
+    """player -> unreached region -> waiting locations whose rule checked that region"""
+    changed_players: Set[int]
+    """players who were collected an item since the last test"""
+
+    def __init__(self, state: CollectionState) -> None:
+        self.state = state
+        self.traced_players = {player for player, world in state.multiworld.worlds.items()
+                               if world.incremental_reachability}
+        self.waiting = set()
+        self.item_dependents = {}
+        self.item_counts = {}
+        self.region_dependents = {}
+        self.changed_players = set()
+
+    def collect(self, location: Location) -> bool:
+        """Collects the item at location into state, see CollectionState.collect."""
+        item = location.item
+        assert isinstance(item, Item), "tried to collect Location with no Item"
+        self.changed_players.add(item.player)
+        return self.state.collect(item, True, location)
+
+    def partition(self, locations: Iterable[Location]) -> Tuple[List[Location], List[Location]]:
+        """Returns the reachable and the unreachable locations, both in the order they were given in."""
+        state = self.state
+        reachable: List[Location] = []
+        unreachable: List[Location] = []
+        if not self.traced_players:
+            for location in locations:
+                if location.can_reach(state):
+                    reachable.append(location)
+                else:
+                    unreachable.append(location)
+            return reachable, unreachable
+
+        self.update()
+        waiting = self.waiting
+        traced_players = self.traced_players
+        locations = list(locations)
+        reached: Set[Location] = set()
+        to_trace: List[Location] = []
+        for location in locations:
+            if location in waiting:
+                continue
+            if location.player not in traced_players:
+                if location.can_reach(state):
+                    reached.add(location)
+            else:
+                to_trace.append(location)
+        if to_trace:
+            reached.update(self.trace(to_trace))
+        for location in locations:
+            if location in reached:
+                reachable.append(location)
+            else:
+                unreachable.append(location)
+        return reachable, unreachable
+
+    def update(self) -> None:
+        """Stops waiting for the locations of which something their rule read changed since the last test."""
+        state = self.state
+        affected: Set[Location] = set()
+        for player in self.changed_players:
+            item_dependents = self.item_dependents.get(player)
+            if item_dependents:
+                prog_items = state.prog_items[player]
+                item_counts = self.item_counts[player]
+                for item in [item for item, count in item_counts.items() if prog_items.get(item) != count]:
+                    del item_counts[item]
+                    affected |= item_dependents.pop(item)
+            region_dependents = self.region_dependents.get(player)
+            if region_dependents:
+                if state.stale[player]:
+                    state.update_reachable_regions(player)
+                reachable_regions = state.reachable_regions[player]
+                for region in [region for region in region_dependents if region in reachable_regions]:
+                    affected |= region_dependents.pop(region)
+        self.changed_players.clear()
+        self.waiting -= affected
+
+    def trace(self, locations: List[Location]) -> List[Location]:
+        """Tests locations while recording what their rules read, and returns the reachable ones."""
+        state = self.state
+        # bring every player's regions up to date first, so no rule updates them while it is traced
+        for player, stale in state.stale.items():
+            if stale:
+                state.update_reachable_regions(player)
+        prog_items = state.prog_items
+        reachable_regions = state.reachable_regions
+        trace = _RuleTrace()
+        state.prog_items = _TracedPlayers(prog_items, trace, lambda counter, player:  # type: ignore[assignment]
+                                          _TracedPlayerProgItems(counter, trace, player))
+        state.reachable_regions = _TracedPlayers(reachable_regions, trace,  # type: ignore[assignment]
+                                                 lambda regions, player: _TracedRegions(regions, trace))
+        reachable: List[Location] = []
+        try:
+            for location in locations:
+                trace.reset()
+                if location.can_reach(state):
+                    reachable.append(location)
+                elif not trace.untraceable:
+                    self.register(location, trace, prog_items, reachable_regions)
+        finally:
+            state.prog_items = prog_items
+            state.reachable_regions = reachable_regions
+        return reachable
+
+    def register(self, location: Location, trace: _RuleTrace, prog_items: Dict[int, Counter[str]],
+                 reachable_regions: Dict[int, Set[Region]]) -> None:
+        """Records what a failed access rule read, so the location is only re-tested once any of it changes."""
+        for player, item in trace.items:
+            item_counts = self.item_counts.setdefault(player, {})
+            if item not in item_counts:
+                item_counts[item] = prog_items[player].get(item)
+            self.item_dependents.setdefault(player, {}).setdefault(item, set()).add(location)
+        for region in trace.regions:
+            if region not in reachable_regions[region.player]:
+                self.region_dependents.setdefault(region.player, {}).setdefault(region, set()).add(location)
+        self.waiting.add(location)
+
+
 class CollectionState():
     prog_items: Dict[int, Counter[str]]
     multiworld: MultiWorld
@@ -727,7 +1180,13 @@ class CollectionState():
     path: Dict[Union[Region, Entrance], PathValue]
     locations_checked: Set[Location]
     stale: Dict[int, bool]
+    reachability_indexes: Dict[int, ReachabilityIndex]
     allow_partial_entrances: bool
+    _sharing: Dict[int, List[int]]
+    """
+    per player, how many states share that player's reachable_regions, blocked_connections and reachability index,
+    and the sizes of both sets when they were last shared, in a list shared by all of those states
+    """
     additional_init_functions: List[Callable[[CollectionState, MultiWorld], None]] = []
     additional_copy_functions: List[Callable[[CollectionState, CollectionState], CollectionState]] = []
 
@@ -741,18 +1200,49 @@ class CollectionState():
         self.path = {}
         self.locations_checked = set()
         self.stale = {player: True for player in parent.get_all_ids()}
+        self.reachability_indexes = {player: ReachabilityIndex() for player in parent.get_all_ids()
+                                     if parent.worlds[player].incremental_reachability}
         self.allow_partial_entrances = allow_partial_entrances
+        self._sharing = {}
         for function in self.additional_init_functions:
             function(self, parent)
         for items in parent.precollected_items.values():
             for item in items:
                 self.collect(item, True)
 
+    def unshare(self, player: int) -> None:
+        """
+        Gives this state its own copies of player's reachable_regions and blocked_connections, if it still shares them
+        with states it was copied from or into. The methods of CollectionState do this on their own, code changing either
+        set directly has to call this first, which is asserted the next time the sets are shared or unshared.
+        """
+        sharing = self._sharing.get(player)
+        if sharing is None or sharing[0] == 1:
+            return
+        self._assert_unchanged_while_shared(player, sharing)
+        sharing[0] -= 1
+        self._sharing[player] = [1, 0, 0]
+        self.reachable_regions[player] = self.reachable_regions[player].copy()
+        self.blocked_connections[player] = self.blocked_connections[player].copy()
+        index = self.reachability_indexes.get(player)
+        if index is not None:
+            self.reachability_indexes[player] = index.copy()
+
+    def _assert_unchanged_while_shared(self, player: int, sharing: List[int]) -> None:
+        assert sharing[1:] == [len(self.reachable_regions[player]), len(self.blocked_connections[player])], \
+            f"reachable_regions or blocked_connections of player {player} were changed while shared with another " \
+            f"CollectionState, changing them directly requires calling state.unshare({player}) first."
+
     def update_reachable_regions(self, player: int):
+        self.unshare(player)
         self.stale[player] = False
         world: AutoWorld.World = self.multiworld.worlds[player]
         reachable_regions = self.reachable_regions[player]
-        queue = deque(self.blocked_connections[player])
+        index = self.reachability_indexes.get(player)
+        if index is None:
+            queue = deque(self.blocked_connections[player])
+        else:
+            queue = index.pop_affected(self.blocked_connections[player])
         start: Region = world.get_region(world.origin_region_name)
 
         # init on first call - this can't be done on construction since the regions don't exist yet
@@ -761,7 +1251,9 @@ class CollectionState():
             self.blocked_connections[player].update(start.exits)
             queue.extend(start.exits)
 
-        if world.explicit_indirect_conditions:
+        if index is not None:
+            self._update_reachable_regions_incremental(player, queue, index)
+        elif world.explicit_indirect_conditions:
             self._update_reachable_regions_explicit_indirect_conditions(player, queue)
         else:
             self._update_reachable_regions_auto_indirect_conditions(player, queue)
@@ -815,17 +1307,85 @@ class CollectionState():
             # sweep for indirect connections, mostly Entrance.can_reach(unrelated_Region)
             queue.extend(blocked_connections)
 
+    def _update_reachable_regions_incremental(self, player: int, queue: deque, index: ReachabilityIndex):
+        if not queue:
+            return
+        reachable_regions = self.reachable_regions[player]
+        blocked_connections = self.blocked_connections[player]
+        indirect_connections = self.multiworld.indirect_connections
+        all_prog_items = self.prog_items
+        all_reachable_regions = self.reachable_regions
+        trace = _RuleTrace()
+        # while testing rules, record what they read, which replaces both explicit and automatic indirect conditions
+        self.prog_items = _TracedOwnPlayer(all_prog_items, trace, player,  # type: ignore[assignment]
+                                           _TracedProgItems(all_prog_items[player], trace))
+        self.reachable_regions = _TracedOwnPlayer(all_reachable_regions, trace, player,  # type: ignore[assignment]
+                                                  _TracedRegions(reachable_regions, trace))
+        try:
+            while queue:
+                connection = queue.popleft()
+                if connection not in blocked_connections:
+                    continue  # queued more than once
+                new_region = connection.connected_region
+                if new_region in reachable_regions:
+                    blocked_connections.remove(connection)
+                    continue
+                trace.reset()
+                if connection.can_reach(self):
+                    if self.allow_partial_entrances and not new_region:
+                        # may get connected later, without anything in state changing
+                        index.always_retest.add(connection)
+                        continue
+                    assert new_region, f"tried to search through an Entrance \"{connection}\" with no connected Region"
+                    reachable_regions.add(new_region)
+                    blocked_connections.remove(connection)
+                    blocked_connections.update(new_region.exits)
+                    queue.extend(new_region.exits)
+                    self.path[new_region] = (new_region.name, self.path.get(connection, None))
+
+                    # Retry connections that checked the new region, or were registered to depend on it
+                    dependents = index.region_dependents.pop(new_region, None)
+                    if dependents:
+                        queue.extend(dependents)
+                    for new_entrance in indirect_connections.get(new_region, ()):
+                        if new_entrance in blocked_connections:
+                            queue.append(new_entrance)
+                elif self.allow_partial_entrances and not new_region:
+                    index.always_retest.add(connection)
+                else:
+                    index.register(connection, trace, reachable_regions)
+        finally:
+            self.prog_items = all_prog_items
+            self.reachable_regions = all_reachable_regions
+
     def copy(self) -> CollectionState:
-        ret = CollectionState(self.multiworld)
+        # The region and connection sets and reachability indexes are shared between both states until either of
+        # them updates a player's reachability, which unshares that player first. So copying them costs O(players)
+        # references, plus copying the sets of each player that is updated afterwards once. prog_items is small and
+        # often changed directly by worlds, so it is always copied.
+        ret = CollectionState.__new__(CollectionState)
+        ret.multiworld = self.multiworld
         ret.prog_items = {player: counter.copy() for player, counter in self.prog_items.items()}
-        ret.reachable_regions = {player: region_set.copy() for player, region_set in
-                                 self.reachable_regions.items()}
-        ret.blocked_connections = {player: entrance_set.copy() for player, entrance_set in
-                                   self.blocked_connections.items()}
+        ret.reachable_regions = self.reachable_regions.copy()
+        ret.blocked_connections = self.blocked_connections.copy()
+        ret.reachability_indexes = self.reachability_indexes.copy()
+        for player in self.prog_items:
+            sharing = self._sharing.get(player)
+            if sharing is None:
+                sharing = self._sharing[player] = [1, 0, 0]
+            elif sharing[0] > 1:
+                self._assert_unchanged_while_shared(player, sharing)
+            sharing[0] += 1
+            sharing[1] = len(self.reachable_regions[player])
+            sharing[2] = len(self.blocked_connections[player])
+        ret._sharing = self._sharing.copy()
         ret.advancements = self.advancements.copy()
         ret.path = self.path.copy()
         ret.locations_checked = self.locations_checked.copy()
+        ret.stale = self.stale.copy()
         ret.allow_partial_entrances = self.allow_partial_entrances
+        for function in self.additional_init_functions:
+            function(ret, self.multiworld)
         for function in self.additional_copy_functions:
             ret = function(self, ret)
         return ret
@@ -873,6 +1433,8 @@ class CollectionState():
         # under this assumption, an extra sweep iteration is performed that checks every player, to confirm that the
         # sweep is finished.
         checking_if_finished = False
+        # Locations of worlds that support it are only re-tested once something their access rule read has changed.
+        index = LocationDependencyIndex(self)
         while players_to_check:
             next_advancements_per_player: List[Tuple[int, List[Location]]] = []
             next_players_to_check = set()
@@ -884,16 +1446,10 @@ class CollectionState():
 
                 # Accessibility of each location is checked first because a player's region accessibility cache becomes
                 # stale whenever one of their own items is collected into the state.
-                reachable_locations: List[Location] = []
-                unreachable_locations: List[Location] = []
-                for location in locations:
-                    if location.can_reach(self):
-                        # Locations containing items that do not belong to `player` could be collected immediately
-                        # because they won't stale `player`'s region accessibility cache, but, for simplicity, all the
-                        # items at reachable locations are collected in a single loop.
-                        reachable_locations.append(location)
-                    else:
-                        unreachable_locations.append(location)
+                # Locations containing items that do not belong to `player` could be collected immediately because
+                # they won't stale `player`'s region accessibility cache, but, for simplicity, all the items at
+                # reachable locations are collected in a single loop.
+                reachable_locations, unreachable_locations = index.partition(locations)
                 if unreachable_locations:
                     next_advancements_per_player.append((player, unreachable_locations))
 
@@ -911,12 +1467,10 @@ class CollectionState():
                 # Collect the items from the reachable locations.
                 for advancement in reachable_locations:
                     self.advancements.add(advancement)
-                    item = advancement.item
-                    assert isinstance(item, Item), "tried to collect advancement Location with no Item"
-                    if self.collect(item, True, advancement):
+                    if index.collect(advancement):
                         # The player the item belongs to may be able to reach additional locations in the next sweep
                         # iteration.
-                        next_players_to_check.add(item.player)
+                        next_players_to_check.add(advancement.item.player)
 
             if not next_players_to_check:
                 if not checking_if_finished:
@@ -1113,6 +1667,7 @@ class CollectionState():
         if location:
             self.locations_checked.add(location)
 
+        self.unshare(item.player)
         changed = self.multiworld.worlds[item.player].collect(self, item)
 
         self.stale[item.player] = True
@@ -1131,14 +1686,21 @@ class CollectionState():
         :param count: How many of the item to add.
         """
         assert count > 0
+        self.unshare(player)
         self.prog_items[player][item] += count
+        index = self.reachability_indexes.get(player)
+        if index is not None:
+            index.dirty_items.add(item)
 
     def remove(self, item: Item):
+        self.unshare(item.player)
         changed = self.multiworld.worlds[item.player].remove(self, item)
         if changed:
             # invalidate caches, nothing can be trusted anymore now
             self.reachable_regions[item.player] = set()
             self.blocked_connections[item.player] = set()
+            if item.player in self.reachability_indexes:
+                self.reachability_indexes[item.player] = ReachabilityIndex()
             self.stale[item.player] = True
 
     def remove_item(self, item: str, player: int, count: int = 1) -> None:
@@ -1150,9 +1712,13 @@ class CollectionState():
         :param count: How many of the item to remove.
         """
         assert count > 0
+        self.unshare(player)
         self.prog_items[player][item] -= count
         if self.prog_items[player][item] < 1:
             del (self.prog_items[player][item])
+        index = self.reachability_indexes.get(player)
+        if index is not None:
+            index.dirty_items.add(item)
 
     def set_item(self, item: str, player: int, count: int) -> None:
         """
@@ -1163,10 +1729,14 @@ class CollectionState():
         :param count: How many of the item to now have.
         """
         assert count >= 0
+        self.unshare(player)
         if count == 0:
             del (self.prog_items[player][item])
         else:
             self.prog_items[player][item] = count
+        index = self.reachability_indexes.get(player)
+        if index is not None:
+            index.dirty_items.add(item)
 
 
 class EntranceType(IntEnum):
@@ -1669,17 +2239,21 @@ class Spoiler:
     multiworld: MultiWorld
     hashes: Dict[int, str]
     entrances: Dict[Tuple[str, str, int], EntranceInfo]
-    playthrough: Dict[str, Union[List[str], Dict[str, str]]]  # sphere "0" is list, others are dict
     unreachables: Set[Location]
-    paths: Dict[str, List[Union[Tuple[str, str], Tuple[str, None]]]]  # last step takes no further exits
+    max_playthrough_checkpoints: ClassVar[int] = 16
+    """states kept while culling the playthrough, states of the spheres in between get rebuilt from the one before"""
+    _starting_items: List[str]
+    _collection_spheres: Optional[List[Set[Location]]]
+    _paths_state: Optional[CollectionState]
 
     def __init__(self, multiworld: MultiWorld) -> None:
         self.multiworld = multiworld
         self.hashes = {}
         self.entrances = {}
-        self.playthrough = {}
         self.unreachables = set()
-        self.paths = {}
+        self._starting_items = []
+        self._collection_spheres = None
+        self._paths_state = None
 
     def set_entrance(self, entrance: str, exit_: str, direction: str, player: int) -> None:
         if self.multiworld.players == 1:
@@ -1695,24 +2269,41 @@ class Spoiler:
         # get locations containing progress items
         multiworld = self.multiworld
         prog_locations = {location for location in multiworld.get_filled_locations() if location.item.advancement}
-        state_cache: List[Optional[CollectionState]] = [None]
+        # state before collecting the sphere of the same index, for every checkpoint_interval-th sphere
+        checkpoints: Dict[int, CollectionState] = {}
+        checkpoint_interval = 1
+        # all spheres are kept, as they are culled from the last one down, but they only refer to locations
         collection_spheres: List[Set[Location]] = []
         state = CollectionState(multiworld)
         sphere_candidates = set(prog_locations)
+        known_spheres: Optional[deque[Set[Location]]] = None
+        if multiworld.sphere_cache:
+            # spheres without progress items don't change the state, so they can be left out
+            known_spheres = deque(sphere for sphere in multiworld.sphere_cache.get_spheres().spheres
+                                  if not sphere.isdisjoint(prog_locations))
         logging.debug('Building up collection spheres.')
         while sphere_candidates:
 
             # build up spheres of collection radius.
             # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
 
-            sphere = {location for location in sphere_candidates if state.can_reach(location)}
+            if known_spheres is None:
+                sphere = {location for location in sphere_candidates if state.can_reach(location)}
+            else:
+                known_sphere = known_spheres.popleft() if known_spheres else set()
+                sphere = {location for location in sphere_candidates if location in known_sphere}
 
             for location in sphere:
                 state.collect(location.item, True, location)
 
             sphere_candidates -= sphere
             collection_spheres.append(sphere)
-            state_cache.append(state.copy())
+            if len(collection_spheres) % checkpoint_interval == 0:
+                checkpoints[len(collection_spheres)] = state.copy()
+                if len(checkpoints) > self.max_playthrough_checkpoints:
+                    checkpoint_interval *= 2
+                    checkpoints = {index: checkpoint for index, checkpoint in checkpoints.items()
+                                   if index % checkpoint_interval == 0}
 
             logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres),
                           len(sphere),
@@ -1730,15 +2321,27 @@ class Spoiler:
 
         # in the second phase, we cull each sphere such that the game is still beatable,
         # reducing each range of influence to the bare minimum required inside it
+        def get_state_before(num: int) -> Optional[CollectionState]:
+            checkpoint = num - num % checkpoint_interval
+            if checkpoint == num:
+                return checkpoints.get(num)  # None before the first sphere, see can_beat_game
+            state = checkpoints[checkpoint].copy() if checkpoint else CollectionState(multiworld)
+            # spheres are culled from the last one down, so the spheres collected here are still complete
+            for sphere in collection_spheres[checkpoint:num]:
+                for location in sphere:
+                    state.collect(location.item, True, location)
+            return state
+
         required_locations = {location for sphere in collection_spheres for location in sphere}
         for num, sphere in reversed(tuple(enumerate(collection_spheres))):
             to_delete: Set[Location] = set()
+            state_before = get_state_before(num)
             for location in sphere:
                 # we remove the location from required_locations to sweep from, and check if the game is still beatable
                 logging.debug('Checking if %s (Player %d) is required to beat the game.', location.item.name,
                               location.item.player)
                 required_locations.remove(location)
-                if multiworld.can_beat_game(state_cache[num], required_locations):
+                if multiworld.can_beat_game(state_before, required_locations):
                     to_delete.add(location)
                 else:
                     # still required, got to keep it around
@@ -1789,31 +2392,50 @@ class Spoiler:
             if not sphere:
                 raise RuntimeError(f'Not all required items reachable. Unreachable locations: {required_locations}')
 
-        # we can finally output our playthrough
-        self.playthrough = {"0": sorted([self.multiworld.get_name_string_for_object(item) for item in
-                                         chain.from_iterable(multiworld.precollected_items.values())
-                                         if item.advancement])}
-
-        for i, sphere in enumerate(collection_spheres):
-            self.playthrough[str(i + 1)] = {
-                str(location): str(location.item) for location in sorted(sphere)}
-        if create_paths:
-            self.create_paths(state, collection_spheres)
+        # we can finally output our playthrough, which is only put into words when it gets written
+        self._starting_items = sorted([self.multiworld.get_name_string_for_object(item) for item in
+                                       chain.from_iterable(multiworld.precollected_items.values())
+                                       if item.advancement])
+        self._collection_spheres = collection_spheres
+        self._paths_state = state if create_paths else None
 
         # repair the multiworld again
         for item in removed_precollected:
             multiworld.push_precollected(item)
 
-    def create_paths(self, state: CollectionState, collection_spheres: List[Set[Location]]) -> None:
+    @property
+    def playthrough(self) -> Dict[str, Union[List[str], Dict[str, str]]]:
+        """The whole playthrough, sphere "0" is list, others are dict. See iter_playthrough."""
+        return dict(self.iter_playthrough())
+
+    def iter_playthrough(self) -> Iterator[Tuple[str, Union[List[str], Dict[str, str]]]]:
+        """Yields the playthrough one sphere at a time, starting with the required starting items as sphere "0"."""
+        if self._collection_spheres is None:
+            return
+        yield "0", self._starting_items
+        for i, sphere in enumerate(self._collection_spheres):
+            yield str(i + 1), {str(location): str(location.item) for location in sorted(sphere)}
+
+    @property
+    def paths(self) -> Dict[str, List[Union[Tuple[str, str], Tuple[str, None]]]]:
+        """The path to each location of the playthrough, last step takes no further exits. See iter_paths."""
+        return dict(self.iter_paths())
+
+    def iter_paths(self) -> Iterator[Tuple[str, List[Union[Tuple[str, str], Tuple[str, None]]]]]:
+        """Yields the path to each location of the playthrough in worlds with topology, sorted by name.
+        Each path is only worked out when it is yielded."""
         from itertools import zip_longest
         multiworld = self.multiworld
+        state = self._paths_state
+        if state is None:
+            return
 
         def flist_to_iter(path_value: Optional[PathValue]) -> Iterator[str]:
             while path_value:
                 region_or_entrance, path_value = path_value
                 yield region_or_entrance
 
-        def get_path(state: CollectionState, region: Region) -> List[Union[Tuple[str, str], Tuple[str, None]]]:
+        def get_path(region: Region) -> List[Union[Tuple[str, str], Tuple[str, None]]]:
             reversed_path_as_flist: PathValue = state.path.get(region, (str(region), None))
             string_path_flat = reversed(list(map(str, flist_to_iter(reversed_path_as_flist))))
             # Now we combine the flat string list into (region, exit) pairs
@@ -1821,24 +2443,29 @@ class Spoiler:
             pathpairs = zip_longest(pathsiter, pathsiter)
             return list(pathpairs)
 
-        self.paths = {}
+        targets: Dict[str, Region] = {}
+        passes_pyramid_fairy = False
         topology_worlds = (player for player in multiworld.player_ids if multiworld.worlds[player].topology_present)
         for player in topology_worlds:
-            self.paths.update(
-                {str(location): get_path(state, location.parent_region)
-                 for sphere in collection_spheres for location in sphere
-                 if location.player == player})
+            player_targets = {str(location): location.parent_region
+                              for sphere in self._collection_spheres for location in sphere
+                              if location.player == player}
+            targets.update(player_targets)
             if player in multiworld.get_game_players("A Link to the Past"):
                 # If Pyramid Fairy Entrance needs to be reached, also path to Big Bomb Shop
                 # Maybe move the big bomb over to the Event system instead?
-                if any(exit_path == 'Pyramid Fairy' for path in self.paths.values()
-                       for (_, exit_path) in path):
+                passes_pyramid_fairy = passes_pyramid_fairy or any(
+                    exit_path == 'Pyramid Fairy' for region in player_targets.values()
+                    for (_, exit_path) in get_path(region))
+                if passes_pyramid_fairy:
                     if multiworld.worlds[player].options.mode != 'inverted':
-                        self.paths[str(multiworld.get_region('Big Bomb Shop', player))] = \
-                            get_path(state, multiworld.get_region('Big Bomb Shop', player))
+                        big_bomb_shop = multiworld.get_region('Big Bomb Shop', player)
                     else:
-                        self.paths[str(multiworld.get_region('Inverted Big Bomb Shop', player))] = \
-                            get_path(state, multiworld.get_region('Inverted Big Bomb Shop', player))
+                        big_bomb_shop = multiworld.get_region('Inverted Big Bomb Shop', player)
+                    targets[str(big_bomb_shop)] = big_bomb_shop
+
+        for name in sorted(targets):
+            yield name, get_path(targets[name])
 
     def to_file(self, filename: str) -> None:
         from itertools import chain
@@ -1894,35 +2521,32 @@ class Spoiler:
                 outfile.write("\n\nStarting Items:\n\n")
                 outfile.write("\n".join([item for item in precollected_items]))
 
-            locations = [(str(location), str(location.item) if location.item is not None else "Nothing")
-                         for location in self.multiworld.get_locations() if location.show_in_spoiler]
             outfile.write('\n\nLocations:\n\n')
-            outfile.write('\n'.join(
-                ['%s: %s' % (location, item) for location, item in locations]))
+            locations = (location for location in self.multiworld.get_locations() if location.show_in_spoiler)
+            for i, location in enumerate(locations):
+                outfile.write('%s%s: %s' % ('\n' if i else '', location,
+                                            location.item if location.item is not None else "Nothing"))
 
             outfile.write('\n\nPlaythrough:\n\n')
-            outfile.write('\n'.join(['%s: {\n%s\n}' % (sphere_nr, '\n'.join(
-                [f"  {location}: {item}" for (location, item) in sphere.items()] if isinstance(sphere, dict) else
-                [f"  {item}" for item in sphere])) for (sphere_nr, sphere) in self.playthrough.items()]))
+            for i, (sphere_nr, sphere) in enumerate(self.iter_playthrough()):
+                outfile.write('%s%s: {\n%s\n}' % ('\n' if i else '', sphere_nr, '\n'.join(
+                    [f"  {location}: {item}" for (location, item) in sphere.items()] if isinstance(sphere, dict) else
+                    [f"  {item}" for item in sphere])))
             if self.unreachables:
                 outfile.write('\n\nUnreachable Progression Items:\n\n')
                 outfile.write(
                     '\n'.join(['%s: %s' % (unreachable.item, unreachable)
                                for unreachable in sorted(self.unreachables)]))
 
-            if self.paths:
-                outfile.write('\n\nPaths:\n\n')
-                path_listings: List[str] = []
-                for location, path in sorted(self.paths.items()):
-                    path_lines: List[str] = []
-                    for region, exit in path:
-                        if exit is not None:
-                            path_lines.append("{} -> {}".format(region, exit))
-                        else:
-                            path_lines.append(region)
-                    path_listings.append("{}\n        {}".format(location, "\n   =>   ".join(path_lines)))
-
-                outfile.write('\n'.join(path_listings))
+            for i, (location, path) in enumerate(self.iter_paths()):
+                path_lines: List[str] = []
+                for region, exit in path:
+                    if exit is not None:
+                        path_lines.append("{} -> {}".format(region, exit))
+                    else:
+                        path_lines.append(region)
+                outfile.write("{}{}\n        {}".format('\n\nPaths:\n\n' if i == 0 else '\n', location,
+                                                      "\n   =>   ".join(path_lines)))
             AutoWorld.call_all(self.multiworld, "write_spoiler_end", outfile)
 
 
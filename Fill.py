@@ -1,10 +1,12 @@
 import collections
+import heapq
 import itertools
 import logging
 import typing
 from collections import Counter, deque
 
-from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock
+from BaseClasses import CollectionState, Item, Location, LocationDependencyIndex, LocationProgressType, MultiWorld, \
+    PlandoItemBlock
 from Options import Accessibility
 
 from worlds.AutoWorld import call_all
@@ -33,6 +35,112 @@ def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item]
     return new_state
 
 
+class _PlacementIndex:
+    """
+    The candidate locations of a fill_restrictive call, bucketed by player and progress type.
+
+    Placements return the first location in the original order of the locations list that can take the item, exactly
+    like a linear scan over it, but only walk the buckets that can possibly accept the item, and only evaluate each
+    location's access rule once per exploration state.
+    """
+    buckets: typing.Dict[typing.Tuple[int, LocationProgressType], typing.List[Location]]
+    heads: typing.Dict[typing.Tuple[int, LocationProgressType], int]
+    """index of the first location of each bucket that may still be unfilled"""
+    positions: typing.Dict[Location, int]
+    """position of each location in the original locations list"""
+    accepts_any_item: typing.Set[typing.Tuple[int, LocationProgressType]]
+    """excluded buckets with locations that may accept progression or useful items anyway"""
+    filled: typing.Set[Location]
+    remaining: int
+    state: typing.Optional[CollectionState]
+    reachable: typing.Dict[Location, bool]
+
+    def __init__(self, locations: typing.List[Location]) -> None:
+        self.buckets = {}
+        self.positions = {}
+        self.accepts_any_item = set()
+        for position, location in enumerate(locations):
+            key = location.player, location.progress_type
+            self.buckets.setdefault(key, []).append(location)
+            self.positions[location] = position
+            if location.progress_type == LocationProgressType.EXCLUDED and not self._uses_default_rules(location):
+                self.accepts_any_item.add(key)
+        self.heads = dict.fromkeys(self.buckets, 0)
+        self.filled = set()
+        self.remaining = len(locations)
+        self.state = None
+        self.reachable = {}
+
+    @staticmethod
+    def _uses_default_rules(location: Location) -> bool:
+        return type(location).can_fill is Location.can_fill and location.always_allow is Location.always_allow
+
+    def set_state(self, state: CollectionState) -> None:
+        """Sets the state that placements are checked against, forgetting cached reachability if it changed."""
+        if state is not self.state:
+            self.state = state
+            self.reachable = {}
+
+    def can_fill(self, location: Location, item: Item, check_access: bool) -> bool:
+        state = self.state
+        if type(location).can_fill is not Location.can_fill:
+            return location.can_fill(state, item, check_access)
+        # same as Location.can_fill, but with the access check cached
+        if location.always_allow(state, item) \
+                and item.name not in state.multiworld.worlds[item.player].options.non_local_items:
+            return True
+        if location.progress_type == LocationProgressType.EXCLUDED and (item.advancement or item.useful):
+            return False
+        if not location.item_rule(item):
+            return False
+        if not check_access:
+            return True
+        reachable = self.reachable.get(location)
+        if reachable is None:
+            reachable = self.reachable[location] = location.can_reach(state)
+        return reachable
+
+    def _next_unfilled(self, bucket: typing.List[Location], index: int) -> int:
+        filled = self.filled
+        while index < len(bucket) and bucket[index] in filled:
+            index += 1
+        return index
+
+    def pop(self, item: Item, player: typing.Optional[int], check_access: bool) -> typing.Optional[Location]:
+        """
+        Finds, removes and returns the first location that can be filled with item, or None.
+
+        :param player: if not None, only consider locations of this player
+        """
+        important = item.advancement or item.useful
+        heap: typing.List[typing.Tuple[int, typing.Tuple[int, LocationProgressType], int]] = []
+        for key, bucket in self.buckets.items():
+            if player is not None and key[0] != player:
+                continue
+            if important and key[1] == LocationProgressType.EXCLUDED and key not in self.accepts_any_item:
+                continue
+            index = self.heads[key] = self._next_unfilled(bucket, self.heads[key])
+            if index < len(bucket):
+                heap.append((self.positions[bucket[index]], key, index))
+        heapq.heapify(heap)
+
+        # merge the buckets back into their original order, as a scan over the whole list would see them
+        while heap:
+            _, key, index = heap[0]
+            bucket = self.buckets[key]
+            location = bucket[index]
+            if self.can_fill(location, item, check_access):
+                self.filled.add(location)
+                self.remaining -= 1
+                return location
+            index = self._next_unfilled(bucket, index + 1)
+            if index < len(bucket):
+                heapq.heapreplace(heap, (self.positions[bucket[index]], key, index))
+            else:
+                heapq.heappop(heap)
+        return None
+
+
 def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locations: typing.List[Location],
                      item_pool: typing.List[Item], single_player_placement: bool = False, lock: bool = False,
                      swap: bool = True, on_place: typing.Optional[typing.Callable[[Location], None]] = None,
@@ -63,7 +171,9 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     total = min(len(item_pool), len(locations))
     placed = 0
 
-    while any(reachable_items.values()) and locations:
+    placement_index = _PlacementIndex(locations)
+
+    while any(reachable_items.values()) and placement_index.remaining:
         if one_item_per_player:
             # grab one item per player
             items_to_place = [items.pop()
@@ -87,10 +197,11 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             if single_player_placement else None)
 
         has_beaten_game = multiworld.has_beaten_game(maximum_exploration_state)
+        placement_index.set_state(maximum_exploration_state)
 
         while items_to_place:
             # if we have run out of locations to fill,break out of this loop
-            if not locations:
+            if not placement_index.remaining:
                 unplaced_items += items_to_place
                 break
             item_to_place = items_to_place.pop(0)
@@ -105,15 +216,10 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             else:
                 perform_access_check = True
 
-            for i, location in enumerate(locations):
-                if (not single_player_placement or location.player == item_to_place.player) \
-                        and location.can_fill(maximum_exploration_state, item_to_place, perform_access_check):
-                    # popping by index is faster than removing by content,
-                    spot_to_fill = locations.pop(i)
-                    # skipping a scan for the element
-                    break
-
-            else:
+            spot_to_fill = placement_index.pop(item_to_place,
+                                               item_to_place.player if single_player_placement else None,
+                                               perform_access_check)
+            if spot_to_fill is None:
                 # we filled all reachable spots.
                 if swap:
                     # Keep a cache of previous safe swap states that might be usable to sweep from to produce the next
@@ -209,6 +315,10 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     if total > 1000:
         _log_fill_progress(name, placed, total)
 
+    # remove the filled locations from the list all at once
+    if placement_index.filled:
+        locations[:] = [location for location in locations if location not in placement_index.filled]
+
     if cleanup_required:
         # validate all placements and remove invalid ones
         state = sweep_from_pool(
@@ -768,14 +878,40 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
         }
         sphere_num: int = 1
         moved_item_count: int = 0
+        # locations of worlds with incremental reachability are only re-tested once their rule inputs changed,
+        # so everything collected into state has to go through index
+        index = LocationDependencyIndex(state)
 
-        def get_sphere_locations(sphere_state: CollectionState,
+        def get_sphere_locations(sphere_index: LocationDependencyIndex,
                                  locations: typing.Set[Location]) -> typing.Set[Location]:
-            return {loc for loc in locations if sphere_state.can_reach(loc)}
+            return set(sphere_index.partition(locations)[0])
 
         def item_percentage(player: int, num: int) -> float:
             return num / total_locations_count[player]
 
+        def is_needed(reducing_state: CollectionState, player: int, locations: typing.Set[Location]) -> bool:
+            """
+            Sweeps reducing_state over locations and returns if the player still falls short of their threshold or
+            the game is no longer beatable. Reachability only grows during the sweep, so it stops as soon as that is
+            decided, counting the collected advancements as reachable locations on the way.
+            """
+            if beatable:
+                if multiworld.has_beaten_game(reducing_state):
+                    return False
+                for _ in reducing_state.sweep_for_advancements(locations, yield_each_sweep=True):
+                    if multiworld.has_beaten_game(reducing_state):
+                        return False
+                return True
+            reachable_count = reachable_locations_count[player]
+            threshold = threshold_percentages[player]
+            checked_count = len(state.advancements)
+            for _ in reducing_state.sweep_for_advancements(locations, yield_each_sweep=True):
+                if item_percentage(player, reachable_count + len(reducing_state.advancements) - checked_count) \
+                        >= threshold:
+                    return False
+            reduced_sphere = {location for location in locations if reducing_state.can_reach(location)}
+            return item_percentage(player, reachable_count + len(reduced_sphere)) < threshold
+
         # If there are no locations that aren't locked, there's no point in attempting to balance progression.
         if len(total_locations_count) == 0:
             return
@@ -784,7 +920,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
-            sphere_locations = get_sphere_locations(state, unchecked_locations)
+            sphere_locations = get_sphere_locations(index, unchecked_locations)
             for location in sphere_locations:
                 unchecked_locations.remove(location)
                 if not location.locked:
@@ -815,6 +951,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                 }
                 if balancing_players:
                     balancing_state = state.copy()
+                    balancing_index = LocationDependencyIndex(balancing_state)
                     balancing_unchecked_locations = unchecked_locations.copy()
                     balancing_reachables = reachable_locations_count.copy()
                     balancing_sphere = sphere_locations.copy()
@@ -823,7 +960,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         # Check locations in the current sphere and gather progression items to swap earlier
                         for location in balancing_sphere:
                             if location.advancement:
-                                balancing_state.collect(location.item, True, location)
+                                balancing_index.collect(location)
                                 player = location.item.player
                                 # only replace items that end up in another player's world
                                 if (not location.locked and not location.item.skip_in_prog_balancing and
@@ -832,7 +969,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                                         location.progress_type != LocationProgressType.PRIORITY):
                                     candidate_items[player].add(location)
                                     logging.debug(f"Candidate item: {location.name}, {location.item.name}")
-                        balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
+                        balancing_sphere = get_sphere_locations(balancing_index, balancing_unchecked_locations)
                         for location in balancing_sphere:
                             balancing_unchecked_locations.remove(location)
                             if not location.locked:
@@ -850,30 +987,25 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         if l not in balancing_unchecked_locations:
                             unlocked_locations[l.player].add(l)
                     items_to_replace: typing.List[Location] = []
+                    beatable = multiworld.has_beaten_game(balancing_state)
                     for player in balancing_players:
                         locations_to_test = unlocked_locations[player]
                         items_to_test = list(candidate_items[player])
                         items_to_test.sort()
                         multiworld.random.shuffle(items_to_test)
+                        # Every test collects the items to replace and the untested items, and the items to replace
+                        # only grow, so what they reach is swept once into replaced_state instead of for every test.
+                        replaced_state = state.copy()
                         while items_to_test:
                             testing = items_to_test.pop()
-                            reducing_state = state.copy()
-                            for location in itertools.chain((
-                                    l for l in items_to_replace
-                                    if l.item.player == player
-                            ), items_to_test):
+                            reducing_state = replaced_state.copy()
+                            for location in items_to_test:
                                 reducing_state.collect(location.item, True, location)
 
-                            reducing_state.sweep_for_advancements(locations=locations_to_test)
-
-                            if multiworld.has_beaten_game(balancing_state):
-                                if not multiworld.has_beaten_game(reducing_state):
-                                    items_to_replace.append(testing)
-                            else:
-                                reduced_sphere = get_sphere_locations(reducing_state, locations_to_test)
-                                p = item_percentage(player, reachable_locations_count[player] + len(reduced_sphere))
-                                if p < threshold_percentages[player]:
-                                    items_to_replace.append(testing)
+                            if is_needed(reducing_state, player, locations_to_test):
+                                items_to_replace.append(testing)
+                                replaced_state.collect(testing.item, True, testing)
+                                replaced_state.sweep_for_advancements(locations=locations_to_test)
 
                     old_moved_item_count = moved_item_count
 
@@ -895,7 +1027,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                                 logging.debug(f"Progression balancing moved {new_location.item} to {new_location}, "
                                               f"displacing {old_location.item} into {old_location}")
                                 moved_item_count += 1
-                                state.collect(new_location.item, True, new_location)
+                                index.collect(new_location)
                                 break
                         else:
                             logging.warning(f"Could not Progression Balance {old_location.item}")
@@ -903,7 +1035,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                     if old_moved_item_count < moved_item_count:
                         logging.debug(f"Moved {moved_item_count} items so far\n")
                         unlocked = {fresh for player in balancing_players for fresh in unlocked_locations[player]}
-                        for location in get_sphere_locations(state, unlocked):
+                        for location in get_sphere_locations(index, unlocked):
                             unchecked_locations.remove(location)
                             if not location.locked:
                                 reachable_locations_count[location.player] += 1
@@ -911,7 +1043,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
 
             for location in sphere_locations:
                 if location.advancement:
-                    state.collect(location.item, True, location)
+                    index.collect(location)
             checked_locations |= sphere_locations
 
             if multiworld.has_beaten_game(state):
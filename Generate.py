@@ -51,12 +51,17 @@ def mystery_argparse():
                         help="List of options that can be set manually. Can be combined, for example \"bosses, items\"")
     parser.add_argument("--skip_prog_balancing", action="store_true",
                         help="Skip progression balancing step during generation.")
+    parser.add_argument("--workers", default=defaults.workers, type=lambda value: max(int(value), 1),
+                        help="Amount of processes to run the precompute step of worlds in.")
     parser.add_argument("--skip_output", action="store_true",
                         help="Skips generation assertion and output stages and skips multidata and spoiler output. "
                              "Intended for debugging and testing purposes.")
     parser.add_argument("--spoiler_only", action="store_true",
                         help="Skips generation assertion and multidata, outputting only a spoiler log. "
                              "Intended for debugging and testing purposes.")
+    parser.add_argument("--profile_rules", nargs="?", const=20, default=0, type=int, metavar="TOP",
+                        help="Profiles access rules from item plando to progression balancing, logs the TOP (20) "
+                             "slowest and writes all to a json file next to the output.")
     args = parser.parse_args()
 
     if args.skip_output and args.spoiler_only:
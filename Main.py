@@ -10,7 +10,7 @@ import zipfile
 import zlib
 
 import worlds
-from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld
+from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, SphereCache
 from Fill import FillError, balance_multiworld_progression, distribute_items_restrictive, flood_items, \
     parse_planned_blocks, distribute_planned_blocks, resolve_early_locations_for_planned
 from NetUtils import convert_to_base_types
@@ -73,6 +73,7 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     if not args.skip_output and not args.spoiler_only:
         AutoWorld.call_stage(multiworld, "assert_generate")
 
+    AutoWorld.call_precompute(multiworld, args.workers)
     AutoWorld.call_all(multiworld, "generate_early")
 
     logger.info('')
@@ -184,6 +185,12 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     if any(world.options.item_links for world in multiworld.worlds.values()):
         multiworld._all_state = None
 
+    profiler = None
+    if args.profile_rules:
+        from rule_profiler import RuleProfiler
+        profiler = RuleProfiler()
+        profiler.instrument(multiworld, "plando")
+
     logger.info("Running Item Plando.")
     resolve_early_locations_for_planned(multiworld)
     distribute_planned_blocks(multiworld, [x for player in multiworld.plando_item_blocks
@@ -191,17 +198,25 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     logger.info('Running Pre Main Fill.')
 
+    if profiler:
+        profiler.instrument(multiworld, "pre_fill")
     AutoWorld.call_all(multiworld, "pre_fill")
 
     logger.info(f'Filling the multiworld with {len(multiworld.itempool)} items.')
 
+    if profiler:
+        profiler.instrument(multiworld, "fill")
     if multiworld.algorithm == 'flood':
         flood_items(multiworld)  # different algo, biased towards early game progress items
     elif multiworld.algorithm == 'balanced':
         distribute_items_restrictive(multiworld, get_settings().generator.panic_method)
 
+    if profiler:
+        profiler.instrument(multiworld, "post_fill")
     AutoWorld.call_all(multiworld, 'post_fill')
 
+    if profiler:
+        profiler.instrument(multiworld, "balancing")
     if multiworld.players > 1 and not args.skip_prog_balancing:
         balance_multiworld_progression(multiworld)
     else:
@@ -209,6 +224,14 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     # we're about to output using multithreading, so we're removing the global random state to prevent accidental use
     multiworld.random.passthrough = False
+    # item placement is final from here on, so the spheres only need to be swept once for all output
+    multiworld.sphere_cache = SphereCache(multiworld)
+
+    if profiler:
+        # output evaluates rules from multiple threads, so profiling ends here
+        profiler.stop(multiworld)
+        profiler.report(multiworld, args.profile_rules)
+        profiler.to_file(output_path(f"AP_{multiworld.seed_name}_RuleProfile.json"))
 
     if args.skip_output:
         logger.info('Done. Skipped output/spoiler generation. Total Time: %s', time.perf_counter() - start)
@@ -16,6 +16,7 @@ import operator
 import pickle
 import random
 import shlex
+import struct
 import threading
 import time
 import typing
@@ -133,6 +134,116 @@ def get_saving_second(seed_name: str, interval: int = 60) -> int:
     return int(hashlib.sha256(seed_name.encode()).hexdigest(), 16) % interval
 
 
+class SaveJournal:
+    """
+    Turns Context.get_save() results into records for an append-only save file.
+    The first record is a full snapshot, every following one only holds the entries of the large sections that changed
+    since the previous record, plus the small sections in full. Once the appended records outgrow the snapshot, the
+    next record is a new snapshot, replacing the file.
+    """
+    magic = b"APSJ"
+    record_header = struct.Struct("<I")
+
+    received_items_lengths: typing.Dict[typing.Tuple[int, int, bool], int]
+    location_checks_lengths: typing.Dict[team_slot, int]
+    hint_hashes: typing.Dict[team_slot, int]
+    snapshot_size: int
+    """size of the snapshot record, 0 if there is none and the next record has to be one"""
+    journal_size: int
+    """size of the records appended after the snapshot"""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Makes the next record a full snapshot."""
+        self.received_items_lengths = {}
+        self.location_checks_lengths = {}
+        self.hint_hashes = {}
+        self.snapshot_size = 0
+        self.journal_size = 0
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return not self.snapshot_size or self.journal_size > self.snapshot_size
+
+    @staticmethod
+    def _hash_hints(hints: typing.Set[Hint]) -> int:
+        # Hint.__hash__ leaves out found and status, which do change
+        return hash(frozenset(tuple(hint) for hint in hints))
+
+    def _get_delta(self, save: typing.Dict[str, typing.Any],
+                   changed_stored_data: typing.Set[str]) -> typing.Dict[str, typing.Any]:
+        delta = {key: value for key, value in save.items()
+                 if key not in {"received_items", "location_checks", "hints", "stored_data"}}
+        # received items only ever get appended to
+        delta["received_items"] = received_items = {}
+        for key, items in save["received_items"].items():
+            start = self.received_items_lengths.get(key, 0)
+            if len(items) != start:
+                received_items[key] = start, items[start:]
+        # checked locations only ever get added
+        delta["location_checks"] = {key: locations for key, locations in save["location_checks"].items()
+                                    if len(locations) != self.location_checks_lengths.get(key, 0)}
+        delta["hints"] = {key: hints for key, hints in save["hints"].items()
+                          if self._hash_hints(hints) != self.hint_hashes.get(key)}
+        delta["stored_data"] = {key: save["stored_data"][key] for key in changed_stored_data
+                                if key in save["stored_data"]}
+        return delta
+
+    def _track(self, save: typing.Dict[str, typing.Any]) -> None:
+        self.received_items_lengths = {key: len(items) for key, items in save["received_items"].items()}
+        self.location_checks_lengths = {key: len(locations) for key, locations in save["location_checks"].items()}
+        self.hint_hashes = {key: self._hash_hints(hints) for key, hints in save["hints"].items()}
+
+    def get_record(self, save: typing.Dict[str, typing.Any],
+                   changed_stored_data: typing.Set[str]) -> typing.Tuple[bytes, bool]:
+        """
+        Returns the next record to write and whether it is a snapshot, which replaces the file instead of being
+        appended to it. The record counts as written, call reset() if writing it fails.
+        """
+        snapshot = self.needs_snapshot
+        # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
+        encoded = zlib.compress(pickle.dumps(save if snapshot else self._get_delta(save, changed_stored_data)))
+        record = self.record_header.pack(len(encoded)) + encoded
+        self._track(save)
+        if snapshot:
+            self.snapshot_size = len(record)
+            self.journal_size = 0
+            record = self.magic + record
+        else:
+            self.journal_size += len(record)
+        return record, snapshot
+
+    @classmethod
+    def load(cls, data: bytes, logger: logging.Logger) -> typing.Dict[str, typing.Any]:
+        """Reads a save file, replaying its appended records onto its snapshot. Also reads the old single zlib blob."""
+        if not data.startswith(cls.magic):
+            return restricted_loads(zlib.decompress(data))
+        records = []
+        position = len(cls.magic)
+        while position < len(data):
+            if position + cls.record_header.size > len(data):
+                logger.warning("Save file ends in an incomplete record, ignoring it.")
+                break
+            size, = cls.record_header.unpack_from(data, position)
+            position += cls.record_header.size
+            if position + size > len(data):
+                logger.warning("Save file ends in an incomplete record, ignoring it.")
+                break
+            records.append(restricted_loads(zlib.decompress(data[position:position + size])))
+            position += size
+
+        save, *deltas = records
+        for delta in deltas:
+            for key, (start, items) in delta.pop("received_items").items():
+                save["received_items"].setdefault(key, [])[start:] = items
+            for key in ("location_checks", "hints", "stored_data"):
+                save[key].update(delta.pop(key))
+            save.update(delta)
+        return save
+
+
 class Client(Endpoint):
     __slots__ = (
         "version",
@@ -238,6 +349,11 @@ class Context:
     location_name_groups: typing.Dict[str, typing.Dict[str, typing.Set[str]]]
     all_item_and_group_names: typing.Dict[str, typing.Set[str]]
     all_location_and_group_names: typing.Dict[str, typing.Set[str]]
+    all_item_and_group_name_matchers: typing.Dict[str, Utils.FuzzyMatcher]
+    all_location_and_group_name_matchers: typing.Dict[str, Utils.FuzzyMatcher]
+    item_name_matchers: typing.Dict[str, Utils.FuzzyMatcher]
+    location_name_matchers: typing.Dict[str, Utils.FuzzyMatcher]
+    """fuzzy name lookup indexes of each game, built on first use"""
     non_hintable_names: typing.Dict[str, typing.AbstractSet[str]]
     spheres: typing.List[typing.Dict[int, typing.Set[int]]]
     """ each sphere is { player: { location_id, ... } } """
@@ -294,6 +410,16 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread: typing.Optional[threading.Thread] = None
         self.save_dirty = False
+        self.slots_with_new_items: typing.Set[team_slot] = set()
+        self.pending_item_deliveries: typing.Counter[team_slot] = collections.Counter()
+        """amount of send_new_items calls for each slot since its items were last delivered"""
+        self.item_delivery_handle: typing.Optional[asyncio.Handle] = None
+        self.item_delivery_stats: typing.Counter[str] = collections.Counter()
+        """ReceivedItems packets sent and merged into others by send_new_items"""
+        self.broadcast_groups: typing.Dict[typing.Tuple[typing.Optional[int], bool], typing.Tuple[Client, ...]] = {}
+        """authenticated endpoints to broadcast to, by team (None for all) and whether the message is text"""
+        self.save_journal = SaveJournal()
+        self.changed_stored_data: typing.Set[str] = set()
         self.tags = ['AP']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
@@ -313,6 +439,14 @@ class Context:
         self.location_name_groups = {}
         self.all_item_and_group_names = {}
         self.all_location_and_group_names = {}
+        self.all_item_and_group_name_matchers = Utils.KeyedDefaultDict(
+            lambda game: Utils.FuzzyMatcher(self.all_item_and_group_names[game]))
+        self.all_location_and_group_name_matchers = Utils.KeyedDefaultDict(
+            lambda game: Utils.FuzzyMatcher(self.all_location_and_group_names[game]))
+        self.item_name_matchers = Utils.KeyedDefaultDict(
+            lambda game: Utils.FuzzyMatcher(self.gamespackage[game]["item_name_to_id"]))
+        self.location_name_matchers = Utils.KeyedDefaultDict(
+            lambda game: Utils.FuzzyMatcher(self.gamespackage[game]["location_name_to_id"]))
         self.item_names = collections.defaultdict(
             lambda: Utils.KeyedDefaultDict(lambda code: f'Unknown item (ID:{code})'))
         self.location_names = collections.defaultdict(
@@ -335,8 +469,8 @@ class Context:
 
         for game_package in self.gamespackage.values():
             # remove groups from data sent to clients
-            del game_package["item_name_groups"]
-            del game_package["location_name_groups"]
+            game_package.pop("item_name_groups", None)
+            game_package.pop("location_name_groups", None)
 
     def _init_game_data(self):
         for game_name, game_package in self.gamespackage.items():
@@ -350,6 +484,9 @@ class Context:
                 set(game_package["item_name_to_id"]) | set(self.item_name_groups[game_name])
             self.all_location_and_group_names[game_name] = \
                 set(game_package["location_name_to_id"]) | set(self.location_name_groups.get(game_name, []))
+        for matchers in (self.all_item_and_group_name_matchers, self.all_location_and_group_name_matchers,
+                         self.item_name_matchers, self.location_name_matchers):
+            matchers.clear()
 
         archipelago_item_names = self.item_names["Archipelago"]
         archipelago_location_names = self.location_names["Archipelago"]
@@ -409,15 +546,33 @@ class Context:
                 self.logger.info(f"Outgoing broadcast: {msg}")
             return True
 
+    def get_broadcast_group(self, team: typing.Optional[int], msg_is_text: bool) -> typing.Tuple[Client, ...]:
+        """
+        Returns the clients of a team, or the authenticated endpoints of all teams if team is None,
+        leaving out those that don't want text if the messages are text only.
+        Groups are cached until invalidate_broadcast_groups is called.
+        """
+        key = team, msg_is_text
+        group = self.broadcast_groups.get(key, None)
+        if group is None:
+            if team is None:
+                endpoints = (endpoint for endpoint in self.endpoints if endpoint.auth)
+            else:
+                endpoints = itertools.chain.from_iterable(self.clients[team].values())
+            group = self.broadcast_groups[key] = tuple(endpoint for endpoint in endpoints
+                                                       if not (msg_is_text and endpoint.no_text))
+        return group
+
+    def invalidate_broadcast_groups(self):
+        """Has to be called whenever a client joins or leaves a team, or changes its auth or no_text."""
+        self.broadcast_groups.clear()
+
     def broadcast_all(self, msgs: typing.List[dict]):
         msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
-        data = self.dumper(msgs)
-        endpoints = (
-            endpoint
-            for endpoint in self.endpoints
-            if endpoint.auth and not (msg_is_text and endpoint.no_text)
-        )
-        async_start(self.broadcast_send_encoded_msgs(endpoints, data))
+        self.broadcast_encoded_all(self.dumper(msgs), msg_is_text)
+
+    def broadcast_encoded_all(self, data: str, msg_is_text: bool):
+        async_start(self.broadcast_send_encoded_msgs(self.get_broadcast_group(None, msg_is_text), data))
 
     def broadcast_text_all(self, text: str, additional_arguments: dict = {}):
         self.logger.info("Notice (all): %s" % text)
@@ -425,13 +580,19 @@ class Context:
 
     def broadcast_team(self, team: int, msgs: typing.List[dict]):
         msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
-        data = self.dumper(msgs)
-        endpoints = (
-            endpoint
-            for endpoint in itertools.chain.from_iterable(self.clients[team].values())
-            if not (msg_is_text and endpoint.no_text)
-        )
-        async_start(self.broadcast_send_encoded_msgs(endpoints, data))
+        self.broadcast_encoded_team(team, self.dumper(msgs), msg_is_text)
+
+    def dump_send_events(self, events: typing.Sequence[typing.Tuple[NetworkItem, int]]) -> str:
+        """Encodes the ItemSend PrintJSON messages of (item, receiving player) events like self.dumper would."""
+        if self.dumper is encode:
+            # encode each message on its own, skipping the NamedTuple scan that takes most of the time of encode
+            return NetUtils.encode_batch(encode_send_event(net_item, receiving_player)
+                                         for net_item, receiving_player in events)
+        return self.dumper([json_format_send_event(net_item, receiving_player)
+                            for net_item, receiving_player in events])
+
+    def broadcast_encoded_team(self, team: int, data: str, msg_is_text: bool):
+        async_start(self.broadcast_send_encoded_msgs(self.get_broadcast_group(team, msg_is_text), data))
 
     def broadcast(self, endpoints: typing.Iterable[Client], msgs: typing.List[dict]):
         msgs = self.dumper(msgs)
@@ -442,6 +603,7 @@ class Context:
             self.endpoints.remove(endpoint)
         if endpoint.slot and endpoint in self.clients[endpoint.team][endpoint.slot]:
             self.clients[endpoint.team][endpoint.slot].remove(endpoint)
+        self.invalidate_broadcast_groups()
         await on_client_disconnected(self, endpoint)
 
     def notify_client(self, client: Client, text: str, additional_arguments: dict = {}):
@@ -583,11 +745,12 @@ class Context:
 
     def _save(self, exit_save: bool = False) -> bool:
         try:
-            # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-            encoded_save = pickle.dumps(self.get_save())
-            with open(self.save_filename, "wb") as f:
-                f.write(zlib.compress(encoded_save))
+            changed_stored_data, self.changed_stored_data = self.changed_stored_data, set()
+            record, snapshot = self.save_journal.get_record(self.get_save(), changed_stored_data)
+            with open(self.save_filename, "wb" if snapshot else "ab") as f:
+                f.write(record)
         except Exception as e:
+            self.save_journal.reset()
             self.logger.exception(e)
             return False
         else:
@@ -603,7 +766,7 @@ class Context:
                     else self.data_filename + '_' + 'apsave'
             try:
                 with open(self.save_filename, 'rb') as f:
-                    save_data = restricted_loads(zlib.decompress(f.read()))
+                    save_data = SaveJournal.load(f.read(), self.logger)
                     self.set_save(save_data)
             except FileNotFoundError:
                 self.logger.error('No save data found, starting a new game')
@@ -1061,20 +1224,42 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """
+    Queues the items received since the last call for delivery. Deliveries of the same event loop tick get merged,
+    so every client gets at most one ReceivedItems packet per tick.
+    """
+    for team_slot in ctx.slots_with_new_items:
+        ctx.pending_item_deliveries[team_slot] += 1
+    ctx.slots_with_new_items.clear()
+    if ctx.item_delivery_handle or not ctx.pending_item_deliveries:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_new_items(ctx)
+    else:
+        ctx.item_delivery_handle = loop.call_soon(flush_new_items, ctx)
+
+
+def flush_new_items(ctx: Context):
+    """Sends one ReceivedItems packet with everything new to each client of the slots with queued deliveries."""
+    ctx.item_delivery_handle = None
+    pending, ctx.pending_item_deliveries = ctx.pending_item_deliveries, collections.Counter()
+    for (team, slot), deliveries in pending.items():
+        for client in ctx.clients.get(team, {}).get(slot, ()):
+            if client.no_items:
+                continue
+            start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
+            items = get_received_items(ctx, team, slot, client.remote_items)
+            if len(start_inventory) + len(items) > client.send_index:
+                first_new_item = max(0, client.send_index - len(start_inventory))
+                async_start(ctx.send_msgs(client, [{
+                    "cmd": "ReceivedItems",
+                    "index": client.send_index,
+                    "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
+                client.send_index = len(start_inventory) + len(items)
+                ctx.item_delivery_stats["packets"] += 1
+                ctx.item_delivery_stats["merged"] += deliveries - 1
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
@@ -1122,6 +1307,7 @@ def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem
             if item.player != target_slot:
                 get_received_items(ctx, team, target, False).append(item)
             get_received_items(ctx, team, target, True).append(item)
+        ctx.slots_with_new_items.add((team, target))
 
 
 def register_location_checks(ctx: Context, team: int, slot: int, locations: typing.Iterable[int],
@@ -1140,7 +1326,7 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             # sort/group by receiver and item
             sortable.append((target_player, item_id, location, flags))
 
-        info_texts: list[dict[str, typing.Any]] = []
+        info_texts: list[tuple[NetworkItem, int]] = []
         for target_player, item_id, location, flags in sorted(sortable):
             new_item = NetworkItem(item_id, location, slot, flags)
             send_items_to(ctx, team, target_player, new_item)
@@ -1151,10 +1337,10 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             if len(info_texts) >= 140:
                 # split into chunks that are close to compression window of 64K but not too big on the wire
                 # (roughly 1300-2600 bytes after compression depending on repetitiveness)
-                ctx.broadcast_team(team, info_texts)
+                ctx.broadcast_encoded_team(team, ctx.dump_send_events(info_texts), True)
                 info_texts.clear()
-            info_texts.append(json_format_send_event(new_item, target_player))
-        ctx.broadcast_team(team, info_texts)
+            info_texts.append((new_item, target_player))
+        ctx.broadcast_encoded_team(team, ctx.dump_send_events(info_texts), True)
         del info_texts
         del sortable
 
@@ -1288,6 +1474,13 @@ def json_format_send_event(net_item: NetworkItem, receiving_player: int):
             "item": net_item}
 
 
+def encode_send_event(net_item: NetworkItem, receiving_player: int) -> str:
+    """Encodes json_format_send_event(net_item, receiving_player) on its own, to be joined with NetUtils.encode_batch"""
+    event = json_format_send_event(net_item, receiving_player)
+    event["item"] = NetUtils.encode_typed_tuple(net_item)
+    return NetUtils.encode_plain(event)
+
+
 class CommandMeta(type):
     def __new__(cls, name, bases, attrs):
         commands = attrs["commands"] = {}
@@ -1631,15 +1824,17 @@ class ClientMessageProcessor(CommonCommandProcessor):
     def _cmd_getitem(self, item_name: str) -> bool:
         """Cheat in an item, if it is enabled on this server"""
         if self.ctx.item_cheat:
-            names = self.ctx.item_names_for_game(self.ctx.games[self.client.slot])
+            game = self.ctx.games[self.client.slot]
+            names = self.ctx.item_names_for_game(game)
             item_name, usable, response = get_intended_text(
                 item_name,
-                names
+                self.ctx.item_name_matchers[game]
             )
             if usable:
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
                 get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
                 get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                self.ctx.slots_with_new_items.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -1690,9 +1885,9 @@ class ClientMessageProcessor(CommonCommandProcessor):
             if game not in self.ctx.all_item_and_group_names:
                 self.output("Can't look up item/location for unknown game. Hint for ID instead.")
                 return False
-            names = self.ctx.all_location_and_group_names[game] \
+            names = self.ctx.all_location_and_group_name_matchers[game] \
                 if for_location else \
-                self.ctx.all_item_and_group_names[game]
+                self.ctx.all_item_and_group_name_matchers[game]
             hint_name, usable, response = get_intended_text(input_text, names)
 
             if usable:
@@ -1882,6 +2077,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             client.no_locations = bool(client.tags & _non_game_messages.keys())
             # set NoText for old PopTracker clients that predate the tag to save traffic
             client.no_text = "NoText" in client.tags or ("PopTracker" in client.tags and client.version < (0, 5, 1))
+            ctx.invalidate_broadcast_groups()
             connected_packet = {
                 "cmd": "Connected",
                 "team": client.team, "slot": client.slot,
@@ -1899,6 +2095,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 client.send_index = len(start_inventory) + len(items)
             if not client.auth:  # if this was a Re-Connect, don't print to console
                 client.auth = True
+                ctx.invalidate_broadcast_groups()
                 await on_client_joined(ctx, client)
             if args.get("slot_data", True):
                 connected_packet["slot_data"] = ctx.slot_data[client.slot]
@@ -1957,6 +2154,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                     client.no_text = "NoText" in client.tags or (
                         "PopTracker" in client.tags and client.version < (0, 5, 1)
                     )
+                    ctx.invalidate_broadcast_groups()
                     ctx.broadcast_text_all(
                         f"{ctx.get_aliased_name(client.team, client.slot)} (Team #{client.team + 1}) has changed tags "
                         f"from {old_tags} to {client.tags}.",
@@ -2152,6 +2350,7 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
             ctx.stored_data[args["key"]] = args["value"] = value
+            ctx.changed_stored_data.add(args["key"])
             targets = set(ctx.stored_data_notification_clients[args["key"]])
             if args.get("want_reply", False):
                 targets.add(client)
@@ -2341,8 +2540,9 @@ class ServerCommandProcessor(CommonCommandProcessor):
         if usable:
             team, slot = self.ctx.player_name_lookup[seeked_player]
             item_name = " ".join(item_name)
-            names = self.ctx.item_names_for_game(self.ctx.games[slot])
-            item_name, usable, response = get_intended_text(item_name, names)
+            game = self.ctx.games[slot]
+            names = self.ctx.item_names_for_game(game)
+            item_name, usable, response = get_intended_text(item_name, self.ctx.item_name_matchers[game])
             if usable:
                 amount: int = int(amount)
                 if amount > 100:
@@ -2377,7 +2577,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif self.ctx.location_names_for_game(game) is not None:
-                location, usable, response = get_intended_text(full_name, self.ctx.location_names_for_game(game))
+                location, usable, response = get_intended_text(full_name, self.ctx.location_name_matchers[game])
             else:
                 self.output("Can't look up location for unknown game. Send by ID instead.")
                 return False
@@ -2408,7 +2608,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 item, usable, response = int(full_name), True, None
             elif game in self.ctx.all_item_and_group_names:
-                item, usable, response = get_intended_text(full_name, self.ctx.all_item_and_group_names[game])
+                item, usable, response = get_intended_text(full_name, self.ctx.all_item_and_group_name_matchers[game])
             else:
                 self.output("Can't look up item for unknown game. Hint for ID instead.")
                 return False
@@ -2447,7 +2647,8 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif game in self.ctx.all_location_and_group_names:
-                location, usable, response = get_intended_text(full_name, self.ctx.all_location_and_group_names[game])
+                location, usable, response = get_intended_text(full_name,
+                                                               self.ctx.all_location_and_group_name_matchers[game])
             else:
                 self.output("Can't look up location for unknown game. Hint for ID instead.")
                 return False
@@ -2504,6 +2705,14 @@ class ServerCommandProcessor(CommonCommandProcessor):
             self.ctx.broadcast_all([{"cmd": "RoomUpdate", option_name: getattr(self.ctx, option_name)}])
         return True
 
+    def _cmd_item_delivery(self):
+        """Debug Tool: show how many ReceivedItems packets were sent, and how many got merged into those."""
+        sent = self.ctx.item_delivery_stats["packets"]
+        merged = self.ctx.item_delivery_stats["merged"]
+        self.output(f"Sent {sent} ReceivedItems packets, merged {merged} more into those "
+                    f"({merged / max(1, sent + merged):.1%} saved).")
+        return True
+
     def _cmd_datastore(self):
         """Debug Tool: list writable datastorage keys and approximate the size of their values with pickle."""
         total: int = 0
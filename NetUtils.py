@@ -95,11 +95,15 @@ class NetworkItem(typing.NamedTuple):
     flags: int = 0
 
 
+def encode_typed_tuple(obj: typing.NamedTuple) -> typing.Dict[str, typing.Any]:
+    data = obj._asdict()
+    data["class"] = obj.__class__.__name__
+    return data
+
+
 def _scan_for_TypedTuples(obj: typing.Any) -> typing.Any:
     if isinstance(obj, tuple) and hasattr(obj, "_fields"):  # NamedTuple is not actually a parent class
-        data = obj._asdict()
-        data["class"] = obj.__class__.__name__
-        return data
+        return encode_typed_tuple(obj)
     if isinstance(obj, (tuple, list, set, frozenset)):
         return tuple(_scan_for_TypedTuples(o) for o in obj)
     if isinstance(obj, dict):
@@ -139,6 +143,16 @@ def encode(obj: typing.Any) -> str:
     return _encode(_scan_for_TypedTuples(obj))
 
 
+def encode_plain(obj: typing.Any) -> str:
+    """Same as encode, for objects that are known to not contain any NamedTuples, skipping the scan for them."""
+    return _encode(obj)
+
+
+def encode_batch(encoded_msgs: typing.Iterable[str]) -> str:
+    """Joins messages that were encoded on their own into the encoded list of them."""
+    return "[" + ",".join(encoded_msgs) + "]"
+
+
 def get_any_version(data: dict) -> Version:
     data = {key.lower(): value for key, value in data.items()}  # .NET version classes have capitalized keys
     return Version(int(data["major"]), int(data["minor"]), int(data["build"]))
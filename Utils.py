@@ -672,8 +672,10 @@ def format_SI_prefix(value, power=1000, power_labels=("", "k", "M", "G", "T", "P
     return f"{value.quantize(decimal.Decimal('1.00'))} {chaining_prefix(n, power_labels)}"
 
 
-def get_fuzzy_results(input_word: str, word_list: typing.Collection[str], limit: typing.Optional[int] = None) \
-        -> typing.List[typing.Tuple[str, int]]:
+def get_fuzzy_results(input_word: str, word_list: typing.Union[typing.Collection[str], FuzzyMatcher],
+                      limit: typing.Optional[int] = None) -> typing.List[typing.Tuple[str, int]]:
+    if isinstance(word_list, FuzzyMatcher):
+        return word_list.get_results(input_word, limit)
     import jellyfish
 
     def get_fuzzy_ratio(word1: str, word2: str) -> float:
@@ -695,7 +697,95 @@ def get_fuzzy_results(input_word: str, word_list: typing.Collection[str], limit:
     )
 
 
-def get_intended_text(input_text: str, possible_answers) -> typing.Tuple[str, bool, str]:
+class FuzzyMatcher:
+    """
+    Index of a fixed collection of words, to repeatedly get the same results as get_fuzzy_results for it faster.
+
+    Words are grouped by length, and as the length difference alone limits how well a word can match, the groups are
+    searched from the best possible match down, until no word left can make it into the requested number of results.
+    Within a group, the edit distance is only computed for words whose letter counts are close enough to make it.
+    """
+    words: typing.List[str]
+    """the words in the order of the collection, which decides between equally good matches"""
+    groups: typing.Dict[int, typing.List[typing.Tuple[int, str, str, typing.Dict[str, int]]]]
+    """word length -> position, word, lowercase word and its letter counts of each word of that length"""
+    uneven: typing.List[typing.Tuple[int, str, str, typing.Dict[str, int]]]
+    """words that change length when lowercased, which the length difference says nothing about"""
+
+    def __init__(self, word_list: typing.Collection[str]) -> None:
+        self.words = list(word_list)
+        self.groups = collections.defaultdict(list)
+        self.uneven = []
+        for position, word in enumerate(self.words):
+            lower_word = word.lower()
+            entry = (position, word, lower_word, dict(collections.Counter(lower_word)))
+            if len(lower_word) == len(word):
+                self.groups[len(word)].append(entry)
+            else:
+                self.uneven.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.words)
+
+    def get_results(self, input_word: str, limit: typing.Optional[int] = None) -> typing.List[typing.Tuple[str, int]]:
+        """Returns the same as get_fuzzy_results(input_word, word_list, limit) for the word_list this was built with."""
+        import heapq
+        import jellyfish
+
+        limit = limit if limit else len(self.words)
+        lower_input = input_word.lower()
+        if limit >= len(self.words) or len(lower_input) != len(input_word):
+            return get_fuzzy_results(input_word, self.words, limit)
+
+        input_length = len(input_word)
+        input_counts = collections.Counter(lower_input)
+        distance = jellyfish.damerau_levenshtein_distance
+        # the worst of the best matches so far is at the top of the heap, ties going to the later word
+        best: typing.List[typing.Tuple[float, int]] = []
+
+        def search(candidates: typing.List[typing.Tuple[int, str, str, typing.Dict[str, int]]]) -> None:
+            for position, word, lower_word, counts in candidates:
+                if word == input_word:
+                    ratio = 1.01
+                else:
+                    longest = max(input_length, len(word))
+                    if len(best) == limit:
+                        # an edit changes the counts of at most two letters by one each, a transposition none
+                        shared = 0
+                        for letter, count in counts.items():
+                            input_count = input_counts[letter]
+                            shared += count if count < input_count else input_count
+                        least_distance = (input_length + len(lower_word) - 2 * shared + 1) // 2
+                        if 1 - least_distance / longest < best[0][0]:
+                            continue
+                    ratio = 1 - distance(lower_input, lower_word) / longest
+                if len(best) < limit:
+                    heapq.heappush(best, (ratio, -position))
+                elif (ratio, -position) > best[0]:
+                    heapq.heapreplace(best, (ratio, -position))
+
+        search(self.uneven)
+        bounds: typing.List[typing.Tuple[float, int]] = []
+        for length in self.groups:
+            if length == input_length:
+                bounds.append((1.01, length))
+            else:
+                # the distance is at least the length difference
+                bounds.append((1 - abs(length - input_length) / max(length, input_length), length))
+        bounds.sort(reverse=True)
+        for bound, length in bounds:
+            if len(best) == limit and bound < best[0][0]:
+                break
+            search(self.groups[length])
+
+        return [(self.words[-position], int(ratio * 100)) for ratio, position in sorted(best, reverse=True)]
+
+
+def get_intended_text(input_text: str, possible_answers: typing.Union[typing.Collection[str], FuzzyMatcher]) \
+        -> typing.Tuple[str, bool, str]:
     picks = get_fuzzy_results(input_text, possible_answers, limit=2)
     if len(picks) > 1:
         dif = picks[0][1] - picks[1][1]
@@ -27,6 +27,7 @@ if not os.path.exists(configpath):  # fall back to config.yaml in home
 def get_app() -> "Flask":
     from WebHostLib import register, cache, app as raw_app
     from WebHostLib.models import db
+    from WebHostLib.multidata import multidata_cache
 
     app = raw_app
     if os.path.exists(configpath) and not app.config["TESTING"]:
@@ -49,6 +50,7 @@ def get_app() -> "Flask":
 
     register()
     cache.init_app(app)
+    multidata_cache.max_size = app.config["MULTIDATA_CACHE_SIZE"]
     db.bind(**app.config["PONY"])
     db.generate_mapping(create_tables=True)
     return app
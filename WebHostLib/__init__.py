@@ -29,6 +29,9 @@ app.config["SELFLAUNCH"] = True  # application process is in charge of launching
 app.config["SELFLAUNCHCERT"] = None  # can point to a SSL Certificate to encrypt Room websocket connections
 app.config["SELFLAUNCHKEY"] = None  # can point to a SSL Certificate Key to encrypt Room websocket connections
 app.config["SELFGEN"] = True  # application process is in charge of scheduling Generations.
+# seconds between checks for Rooms and Generations to start that were not announced within the same process
+app.config["AUTOLAUNCH_POLL_INTERVAL"] = 1
+app.config["AUTOLAUNCH_REPORT_INTERVAL"] = 600  # seconds between logging queue latency and load of the room hosters
 app.config["DEBUG"] = False
 app.config["PORT"] = 80
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
@@ -53,6 +56,8 @@ app.config["PONY"] = {
     'create_db': True
 }
 app.config["MAX_ROLL"] = 20
+# budget in bytes of compressed multidata and pickled data packages to keep decoded in each web and hoster process
+app.config["MULTIDATA_CACHE_SIZE"] = 256 * 1024 * 1024
 app.config["CACHE_TYPE"] = "SimpleCache"
 app.config["HOST_ADDRESS"] = ""
 app.config["ASSET_RIGHTS"] = False
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import multiprocessing
+import time
 import typing
 from datetime import timedelta, datetime
 from threading import Event, Thread
@@ -11,10 +12,12 @@ from uuid import UUID
 
 from pony.orm import db_session, select, commit, PrimaryKey
 
-from Utils import restricted_loads
+from Utils import format_SI_prefix, restricted_loads
 from .locker import Locker, AlreadyRunningException
 
 _stop_event = Event()
+_room_activity = Event()
+_generation_queued = Event()
 
 
 def stop():
@@ -23,6 +26,21 @@ def stop():
     stop_event = _stop_event
     _stop_event = Event()  # new event for new threads
     stop_event.set()
+    # wake up the threads, so they notice they should stop
+    _room_activity.set()
+    _generation_queued.set()
+
+
+def notify_room_activity() -> None:
+    """Wakes up the autohost of this process, so a room whose activity was just committed starts without waiting for
+    the next poll. Autohosts in other processes pick it up on their next poll."""
+    _room_activity.set()
+
+
+def notify_generation_queued() -> None:
+    """Wakes up the autogen of this process, so a just committed Generation starts without waiting for the next
+    poll. Autogens in other processes pick it up on their next poll."""
+    _generation_queued.set()
 
 
 def handle_generation_success(seed_id):
@@ -91,6 +109,8 @@ def cleanup():
     with db_session:
         # >>> bool(uuid.UUID(int=0))
         # True
+        # bulk delete does not cascade, so the tracker slots of the rooms have to go first
+        TrackerSlot.select(lambda tracker_slot: tracker_slot.room.owner == UUID(int=0)).delete(bulk=True)
         rooms = Room.select(lambda room: room.owner == UUID(int=0)).delete(bulk=True)
         seeds = Seed.select(lambda seed: seed.owner == UUID(int=0) and not seed.rooms).delete(bulk=True)
         slots = Slot.select(lambda slot: not slot.seed).delete(bulk=True)
@@ -99,6 +119,79 @@ def cleanup():
         logging.info(f"{rooms} Rooms, {seeds} Seeds and {slots} Slots have been deleted.")
 
 
+class RoomScheduler:
+    """
+    Starts rooms with recent activity, each on the least loaded hoster.
+
+    Instead of scanning every room with activity in the last days, each poll only reads the rooms whose last_activity,
+    which is indexed, moved past the newest activity seen so far. Rooms that are still hosted are remembered, so the
+    continuous activity of running rooms does not start them again.
+    """
+    lookback = timedelta(seconds=5)
+    """how far before the newest activity seen to look, to not miss activity committed out of order"""
+    hosters: typing.List[MultiworldInstance]
+    hosted: typing.Dict[UUID, MultiworldInstance]
+    watermark: datetime
+
+    def __init__(self, hosters: typing.List[MultiworldInstance]) -> None:
+        self.hosters = hosters
+        self.hosted = {}
+        self.watermark = datetime.utcnow() - timedelta(days=3)
+        self.started = 0
+        self.total_latency = timedelta()
+        self.max_latency = timedelta()
+
+    def poll(self) -> None:
+        """Starts all rooms that had activity since the last poll and are not hosted. Requires a db_session."""
+        now = datetime.utcnow()
+        for hoster in self.hosters:
+            for room_id in hoster.collect_shut_down():
+                # the room may have seen activity while it was shutting down, which has to start it again
+                self.hosted.pop(room_id, None)
+                room = Room.get(id=room_id)
+                if room:
+                    self.start(room, now)
+        since = self.watermark - self.lookback
+        rooms = select(room for room in Room if room.last_activity >= since)
+        for room in rooms:
+            self.watermark = max(self.watermark, room.last_activity)
+            self.start(room, now)
+
+    def start(self, room: Room, now: datetime) -> None:
+        if room.id in self.hosted:
+            return  # should already be hosted currently.
+        # the per-room timeout can't currently be PonyORM transpiled, so it is filtered here
+        if room.last_activity < now - timedelta(seconds=room.timeout + 5):
+            return
+        hoster = self.get_least_loaded_hoster()
+        hoster.start_room(room.id)
+        self.hosted[room.id] = hoster
+        latency = max(now - room.last_activity, timedelta())
+        self.started += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def get_least_loaded_hoster(self) -> MultiworldInstance:
+        """Returns the hoster with the smallest sum of its shares of all rooms, clients and memory."""
+        loads = [hoster.load for hoster in self.hosters]
+        totals = [sum(values) or 1 for values in zip(*loads)]
+        shares = [sum(value / total for value, total in zip(load, totals)) for load in loads]
+        return self.hosters[shares.index(min(shares))]
+
+    def report(self) -> None:
+        """Logs queue latency since the last report and the load of each hoster."""
+        if self.started:
+            logging.info(f"Autohost started {self.started} rooms, queue latency "
+                         f"average {(self.total_latency / self.started).total_seconds():.2f}s, "
+                         f"max {self.max_latency.total_seconds():.2f}s")
+        self.started = 0
+        self.total_latency = timedelta()
+        self.max_latency = timedelta()
+        for hoster in self.hosters:
+            rooms, clients, memory = hoster.load
+            logging.info(f"{hoster.name}: {rooms} rooms, {clients} clients, {format_SI_prefix(memory, 1024)}iB")
+
+
 def autohost(config: dict):
     def keep_running():
         stop_event = _stop_event
@@ -111,15 +204,17 @@ def autohost(config: dict):
                     hosters.append(hoster)
                     hoster.start()
 
-                while not stop_event.wait(0.1):
+                scheduler = RoomScheduler(hosters)
+                next_report = time.monotonic() + config["AUTOLAUNCH_REPORT_INTERVAL"]
+                while not stop_event.is_set():
+                    # clear before polling, so activity committed during the poll wakes up the next one
+                    _room_activity.clear()
                     with db_session:
-                        rooms = select(
-                            room for room in Room if
-                            room.last_activity >= datetime.utcnow() - timedelta(days=3))
-                        for room in rooms:
-                            # we have to filter twice, as the per-room timeout can't currently be PonyORM transpiled.
-                            if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout + 5):
-                                hosters[room.id.int % len(hosters)].start_room(room.id)
+                        scheduler.poll()
+                    if time.monotonic() >= next_report:
+                        scheduler.report()
+                        next_report = time.monotonic() + config["AUTOLAUNCH_REPORT_INTERVAL"]
+                    _room_activity.wait(config["AUTOLAUNCH_POLL_INTERVAL"])
 
         except AlreadyRunningException:
             logging.info("Autohost reports as already running, not starting another.")
@@ -150,7 +245,8 @@ def autogen(config: dict):
                             commit()
                         select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
 
-                    while not stop_event.wait(0.1):
+                    while not stop_event.is_set():
+                        _generation_queued.clear()
                         with db_session:
                             # for update locks the database row(s) during transaction, preventing writes from elsewhere
                             to_start = select(
@@ -158,6 +254,7 @@ def autogen(config: dict):
                                 if generation.state == STATE_QUEUED).for_update()
                             for generation in to_start:
                                 launch_generator(generator_pool, generation)
+                        _generation_queued.wait(config["AUTOLAUNCH_POLL_INTERVAL"])
         except AlreadyRunningException:
             logging.info("Autogen reports as already running, not starting another.")
 
@@ -172,8 +269,12 @@ class MultiworldInstance():
         self.cert = config["SELFLAUNCHCERT"]
         self.key = config["SELFLAUNCHKEY"]
         self.host = config["HOST_ADDRESS"]
+        self.multidata_cache_size = config["MULTIDATA_CACHE_SIZE"]
         self.rooms_to_start = multiprocessing.Queue()
         self.rooms_shutting_down = multiprocessing.Queue()
+        # reported by the hoster process
+        self.connected_clients = multiprocessing.Value("q", 0)
+        self.memory_usage = multiprocessing.Value("q", 0)
         self.name = f"MultiHoster{id}"
 
     def start(self):
@@ -183,19 +284,30 @@ class MultiworldInstance():
         process = multiprocessing.Process(group=None, target=run_server_process,
                                           args=(self.name, self.ponyconfig, get_static_server_data(),
                                                 self.cert, self.key, self.host,
-                                                self.rooms_to_start, self.rooms_shutting_down),
+                                                self.rooms_to_start, self.rooms_shutting_down,
+                                                self.multidata_cache_size, self.connected_clients,
+                                                self.memory_usage),
                                           name=self.name)
         process.start()
         self.process = process
 
+    @property
+    def load(self) -> typing.Tuple[int, int, int]:
+        """Rooms hosted, clients connected and bytes of memory used."""
+        return len(self.room_ids), self.connected_clients.value, self.memory_usage.value
+
     def start_room(self, room_id):
+        self.room_ids.add(room_id)
+        self.rooms_to_start.put(room_id)
+
+    def collect_shut_down(self) -> typing.List[UUID]:
+        """Returns the rooms that finished shutting down since the last call."""
+        room_ids = []
         while not self.rooms_shutting_down.empty():
-            self.room_ids.remove(self.rooms_shutting_down.get(block=True, timeout=None))
-        if room_id in self.room_ids:
-            pass  # should already be hosted currently.
-        else:
-            self.room_ids.add(room_id)
-            self.rooms_to_start.put(room_id)
+            room_id = self.rooms_shutting_down.get(block=True, timeout=None)
+            self.room_ids.remove(room_id)
+            room_ids.append(room_id)
+        return room_ids
 
     def stop(self):
         if self.process:
@@ -210,6 +322,6 @@ class MultiworldInstance():
         self.process = None
 
 
-from .models import Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed, Slot
+from .models import Room, Generation, STATE_QUEUED, STATE_STARTED, STATE_ERROR, db, Seed, Slot, TrackerSlot
 from .customserver import run_server_process, get_static_server_data
 from .generate import gen_game
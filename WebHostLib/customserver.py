@@ -25,7 +25,9 @@ from MultiServer import (
 )
 from Utils import restricted_loads, cache_argsless
 from .locker import Locker
-from .models import Command, GameDataPackage, Room, db
+from .models import Command, Room, TrackerSlot, db
+from .multidata import multidata_cache
+from .snapshot import get_tracker_slot_signature, make_tracker_slots
 
 
 class CustomClientMessageProcessor(ClientMessageProcessor):
@@ -74,6 +76,8 @@ class WebHostContext(Context):
         self.main_loop = asyncio.get_running_loop()
         self.video = {}
         self.tags = ["AP", "WebHost"]
+        self.tracker_slot_signatures: typing.Dict[typing.Tuple[int, int], typing.Dict[str, typing.Any]] = {}
+        """signatures of the tracker slots as last saved, see WebHostLib.snapshot"""
 
     def __del__(self):
         try:
@@ -89,20 +93,6 @@ class WebHostContext(Context):
             setattr(self, key, value)
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
-    def listen_to_db_commands(self):
-        cmdprocessor = DBCommandProcessor(self)
-
-        while not self.exit_event.is_set():
-            with db_session:
-                commands = select(command for command in Command if command.room.id == self.room_id)
-                if commands:
-                    for command in commands:
-                        self.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
-                        command.delete()
-                    commit()
-            del commands
-            time.sleep(5)
-
     @db_session
     def load(self, room_id: int):
         self.room_id = room_id
@@ -112,7 +102,10 @@ class WebHostContext(Context):
         else:
             self.port = get_random_port()
 
-        multidata = self.decompress(room.seed.multidata)
+        # the decoded multidata is shared with other rooms of the same seed, so copy whatever _load modifies
+        multidata = dict(multidata_cache.get_multidata(room.seed))
+        if "datapackage" in multidata:
+            multidata["datapackage"] = {game: dict(game_data) for game, game_data in multidata["datapackage"].items()}
         game_data_packages = {}
 
         static_gamespackage = self.gamespackage  # this is shared across all rooms
@@ -131,9 +124,10 @@ class WebHostContext(Context):
                     # games package could be dropped from static data once all rooms embed data package
                     del multidata["datapackage"][game]
                 else:
-                    row = GameDataPackage.get(checksum=game_data["checksum"])
-                    if row:  # None if rolled on >= 0.3.9 but uploaded to <= 0.3.8. multidata should be complete
-                        game_data_packages[game] = restricted_loads(row.data)
+                    game_data_package = multidata_cache.get_game_data_package(game_data["checksum"])
+                    # None if rolled on >= 0.3.9 but uploaded to <= 0.3.8. multidata should be complete
+                    if game_data_package is not None:
+                        game_data_packages[game] = dict(game_data_package)
                         continue
                     else:
                         self.logger.warning(f"Did not find game_data_package for {game}: {game_data['checksum']}")
@@ -158,24 +152,93 @@ class WebHostContext(Context):
                 if savegame_data:
                     self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
             self._start_async_saving(atexit_save=False)
-        threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
 
     @db_session
     def _save(self, exit_save: bool = False) -> bool:
         room = Room.get(id=self.room_id)
+        save = self.get_save()
         # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-        room.multisave = pickle.dumps(self.get_save())
+        room.multisave = pickle.dumps(save)
+        tracker_slot_signatures = self._save_tracker_slots(room, save)
         # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
         if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
             room.last_activity = datetime.datetime.utcnow()
+        commit()
+        self.tracker_slot_signatures.update(tracker_slot_signatures)
         return True
 
+    def _save_tracker_slots(self, room: Room, save: dict) \
+            -> typing.Dict[typing.Tuple[int, int], typing.Dict[str, typing.Any]]:
+        """Writes the tracker data of the slots that changed since the last save, and returns their new signatures."""
+        tracker_slots = make_tracker_slots(save)
+        for team_slot in self.tracker_slot_signatures.keys() - tracker_slots.keys():
+            tracker_slots[team_slot] = {}  # lost all of its data, such as its alias
+        changed: typing.Dict[typing.Tuple[int, int], typing.Dict[str, typing.Any]] = {}
+        for (team, slot), fields in tracker_slots.items():
+            signature = get_tracker_slot_signature(fields)
+            if self.tracker_slot_signatures.get((team, slot)) == signature:
+                continue
+            changed[team, slot] = signature
+            data = pickle.dumps(fields)
+            tracker_slot = TrackerSlot.get(room=room, team=team, slot=slot)
+            if tracker_slot:
+                tracker_slot.data = data
+            else:
+                TrackerSlot(room=room, team=team, slot=slot, data=data)
+        return changed
+
     def get_save(self) -> dict:
         d = super(WebHostContext, self).get_save()
         d["video"] = [(tuple(playerslot), videodata) for playerslot, videodata in self.video.items()]
         return d
 
 
+class DBCommandDispatcher(threading.Thread):
+    """
+    Delivers the Commands posted for the rooms of this process to each room's DBCommandProcessor on its main loop.
+    Pending commands of all rooms are fetched with one query, instead of every room polling for its own.
+    """
+    batch_size = 500
+    """rooms per query, keeps the query parameters below the limit of SQLite"""
+    interval: float
+    """seconds between queries"""
+
+    def __init__(self, interval: float = 1) -> None:
+        super().__init__(name="DBCommandDispatcher", daemon=True)
+        self.interval = interval
+        self._processors: typing.Dict[typing.Any, DBCommandProcessor] = {}
+        self._lock = threading.Lock()
+
+    def register(self, ctx: WebHostContext) -> None:
+        with self._lock:
+            self._processors[ctx.room_id] = DBCommandProcessor(ctx)
+
+    def unregister(self, room_id) -> None:
+        with self._lock:
+            self._processors.pop(room_id, None)
+
+    @db_session
+    def dispatch(self) -> None:
+        with self._lock:
+            processors = self._processors.copy()
+        room_ids = list(processors)
+        for start in range(0, len(room_ids), self.batch_size):
+            batch = room_ids[start:start + self.batch_size]
+            commands = select(command for command in Command if command.room.id in batch).order_by(Command.id)
+            for command in commands:
+                cmdprocessor = processors[command.room.id]
+                cmdprocessor.ctx.main_loop.call_soon_threadsafe(cmdprocessor, command.commandtext)
+                command.delete()
+
+    def run(self) -> None:
+        while 1:
+            try:
+                self.dispatch()
+            except Exception as e:
+                logging.exception(e)
+            time.sleep(self.interval)
+
+
 def get_random_port():
     return random.randint(49152, 65535)
 
@@ -231,11 +294,15 @@ def set_up_logging(room_id) -> logging.Logger:
 
 def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                        cert_file: typing.Optional[str], cert_key_file: typing.Optional[str],
-                       host: str, rooms_to_run: multiprocessing.Queue, rooms_shutting_down: multiprocessing.Queue):
+                       host: str, rooms_to_run: multiprocessing.Queue, rooms_shutting_down: multiprocessing.Queue,
+                       multidata_cache_size: int = multidata_cache.max_size,
+                       connected_clients: typing.Optional[multiprocessing.Value] = None,
+                       memory_usage: typing.Optional[multiprocessing.Value] = None):
     from setproctitle import setproctitle
 
     setproctitle(name)
     Utils.init_logging(name)
+    multidata_cache.max_size = multidata_cache_size
     try:
         import resource
     except ModuleNotFoundError:
@@ -275,14 +342,31 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
     gc.collect()  # free intermediate objects used during setup
 
     loop = asyncio.get_event_loop()
+    contexts: typing.Set[WebHostContext] = set()
+    command_dispatcher = DBCommandDispatcher()
+
+    async def report_load():
+        """Reports the clients connected to and memory used by this process to the autohost for room placement."""
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        while 1:
+            if connected_clients is not None:
+                connected_clients.value = sum(len(ctx.endpoints) for ctx in contexts)
+            if memory_usage is not None and psutil:
+                memory_usage.value = psutil.Process().memory_info().rss
+            await asyncio.sleep(10)
 
     async def start_room(room_id):
         with Locker(f"RoomLocker {room_id}"):
             try:
                 logger = set_up_logging(room_id)
                 ctx = WebHostContext(static_server_data, logger)
+                contexts.add(ctx)
                 ctx.load(room_id)
                 ctx.init_save()
+                command_dispatcher.register(ctx)
                 assert ctx.server is None
                 try:
                     ctx.server = websockets.serve(
@@ -339,6 +423,8 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                     ctx._save()
                     setattr(asyncio.current_task(), "save", None)
             finally:
+                command_dispatcher.unregister(room_id)
+                contexts.discard(ctx)
                 try:
                     ctx.save_dirty = False  # make sure the saving thread does not write to DB after final wakeup
                     ctx.exit_event.set()  # make sure the saving thread stops at some point
@@ -378,6 +464,8 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
     starter = Starter()
     starter.daemon = True
     starter.start()
+    command_dispatcher.start()
+    loop.create_task(report_load())
     try:
         loop.run_forever()
     finally:
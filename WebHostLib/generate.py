@@ -101,6 +101,8 @@ def start_generation(options: dict[str, dict | str], meta: dict[str, Any]):
             return render_template("seedError.html", seed_error=meta["error"], details=details)
 
         commit()
+        from .autolauncher import notify_generation_queued
+        notify_generation_queued()
 
         return redirect(url_for("wait_seed", seed=gen.id))
     else:
@@ -151,6 +153,8 @@ def gen_game(gen_options: dict, meta: dict[str, Any] | None = None, owner=None,
         args.skip_output = False
         args.spoiler_only = False
         args.csv_output = False
+        args.profile_rules = 0
+        args.workers = 1
         args.sprite = dict.fromkeys(range(1, args.multi+1), None)
         args.sprite_pool = dict.fromkeys(range(1, args.multi+1), None)
 
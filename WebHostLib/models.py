@@ -31,6 +31,7 @@ class Room(db.Entity):
     tracker = Optional(UUID, index=True)
     # Port special value -1 means the server errored out. Another attempt can be made with a page refresh
     last_port = Optional(int, default=lambda: 0)
+    tracker_slots = Set('TrackerSlot', cascade_delete=True)
 
 
 class Seed(db.Entity):
@@ -44,6 +45,15 @@ class Seed(db.Entity):
     meta = Required(LongStr, default=lambda: "{\"race\": false}")  # additional meta information/tags
 
 
+class TrackerSlot(db.Entity):
+    # what the trackers show of one slot from multisave, written alongside it when it changed, see WebHostLib.snapshot
+    room = Required(Room)
+    team = Required(int)
+    slot = Required(int)
+    data = Required(bytes)
+    PrimaryKey(room, team, slot)
+
+
 class Command(db.Entity):
     id = PrimaryKey(int, auto=True)
     room = Required(Room)
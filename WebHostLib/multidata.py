@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import collections
+import threading
+import typing
+
+from MultiServer import Context
+from Utils import restricted_loads
+from .models import GameDataPackage, Seed
+
+
+class GameNames(typing.NamedTuple):
+    item_id_to_name: typing.Dict[int, str]
+    location_id_to_name: typing.Dict[int, str]
+
+
+class MultidataCache:
+    """
+    Per-process least recently used cache of decoded multidata by seed and of data packages by checksum, shared
+    between all rooms hosted and all trackers rendered by the process.
+
+    Everything returned is shared and must not be modified. Lookups read from the database, so they have to happen
+    within a db_session. Multidata is looked up by seed id and creation time, as seeds are never changed after they
+    are created, so the stored data is only read from the database when it has to be decoded. The size of an entry is
+    the size of the stored data it was decoded from, compressed for multidata and pickled for data packages, which is
+    a fraction of the memory the decoded data takes up.
+    """
+    max_size: int
+    """budget for the total size of all entries, in bytes"""
+    size: int
+    hits: int
+    misses: int
+
+    def __init__(self, max_size: int = 256 * 1024 * 1024) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[typing.Hashable, typing.Tuple[typing.Any, int]] = \
+            collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: typing.Hashable,
+             load: typing.Callable[[], typing.Optional[typing.Tuple[typing.Any, int]]]) -> typing.Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        # loaded without holding the lock, concurrent misses of the same key just decode it more than once
+        entry = load()
+        if entry is None:
+            return None
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self.size += entry[1]
+                # always keep the newest entry, even if it is over budget on its own
+                while self.size > self.max_size and len(self._entries) > 1:
+                    _, (_, size) = self._entries.popitem(last=False)
+                    self.size -= size
+            return self._entries.get(key, entry)[0]
+
+    def get_multidata(self, seed: Seed) -> typing.Dict[str, typing.Any]:
+        """Returns the decoded multidata of seed, see Context.decompress."""
+        def load() -> typing.Tuple[typing.Dict[str, typing.Any], int]:
+            data: bytes = seed.multidata
+            return Context.decompress(data), len(data)
+
+        return self._get(("multidata", seed.id, seed.creation_time), load)
+
+    def get_game_data_package(self, checksum: str) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """Returns the data package with checksum, or None if it is not in the database."""
+        def load() -> typing.Optional[typing.Tuple[typing.Dict[str, typing.Any], int]]:
+            row = GameDataPackage.get(checksum=checksum)
+            if not row:
+                return None
+            return restricted_loads(row.data), len(row.data)
+
+        return self._get(("game_data_package", checksum), load)
+
+    def get_game_names(self, checksum: str) -> typing.Optional[GameNames]:
+        """Returns the id to name lookups of the data package with checksum, or None if it is not in the database."""
+        def load() -> typing.Optional[typing.Tuple[GameNames, int]]:
+            game_package = self.get_game_data_package(checksum)
+            if game_package is None:
+                return None
+            names = GameNames({item_id: name for name, item_id in game_package["item_name_to_id"].items()},
+                              {location_id: name for name, location_id in game_package["location_name_to_id"].items()})
+            # the names are shared with the data package, so only count about what their ids take up pickled
+            return names, 8 * (len(names.item_id_to_name) + len(names.location_id_to_name))
+
+        return self._get(("game_names", checksum), load)
+
+
+multidata_cache = MultidataCache()
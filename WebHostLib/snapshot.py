@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import typing
+
+
+tracker_fields = ("location_checks", "received_items", "hints", "client_game_state", "name_aliases",
+                  "client_activity_timers", "client_connection_timers", "video")
+
+
+def make_tracker_snapshot(save: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """
+    Extracts what the trackers show from a multisave, see Context.get_save.
+
+    Leaves out data storage, random state and everything else only the room server needs, and turns the timers into
+    dictionaries, so trackers can look up players directly. Everything is keyed by (team, slot).
+    """
+    return {
+        "location_checks": save.get("location_checks", {}),
+        "received_items": {
+            (team, slot): items for (team, slot, remote_items), items in save.get("received_items", {}).items()
+            if remote_items
+        },
+        "hints": save.get("hints", {}),
+        "client_game_state": save.get("client_game_state", {}),
+        "name_aliases": save.get("name_aliases", {}),
+        "client_activity_timers": {
+            tuple(team_player): timestamp for team_player, timestamp in save.get("client_activity_timers", ())
+        },
+        "client_connection_timers": {
+            tuple(team_player): timestamp for team_player, timestamp in save.get("client_connection_timers", ())
+        },
+        "video": {tuple(team_player): video_data for team_player, video_data in save.get("video", ())},
+    }
+
+
+def make_tracker_slots(save: typing.Dict[str, typing.Any]) \
+        -> typing.Dict[typing.Tuple[int, int], typing.Dict[str, typing.Any]]:
+    """Splits the tracker snapshot of a multisave by (team, slot), so each slot can be stored on its own."""
+    slots: typing.Dict[typing.Tuple[int, int], typing.Dict[str, typing.Any]] = {}
+    for field, values in make_tracker_snapshot(save).items():
+        for team_slot, value in values.items():
+            slots.setdefault(team_slot, {})[field] = value
+    return slots
+
+
+def join_tracker_slots(slots: typing.Dict[typing.Tuple[int, int], typing.Dict[str, typing.Any]]) \
+        -> typing.Dict[str, typing.Any]:
+    """Puts the slots of make_tracker_slots back together into a tracker snapshot."""
+    snapshot: typing.Dict[str, typing.Any] = {field: {} for field in tracker_fields}
+    for team_slot, fields in slots.items():
+        for field, value in fields.items():
+            snapshot[field][team_slot] = value
+    return snapshot
+
+
+def get_tracker_slot_signature(fields: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """
+    What changes whenever the tracker data of a slot changes, without copying the checks and received items, which
+    are only ever appended to.
+    """
+    signature = dict(fields)
+    signature["location_checks"] = len(fields.get("location_checks", ()))
+    signature["received_items"] = len(fields.get("received_items", ()))
+    if "hints" in fields:
+        signature["hints"] = frozenset(fields["hints"])
+    return signature
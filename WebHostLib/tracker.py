@@ -8,14 +8,18 @@ from email.utils import parsedate_to_datetime
 from flask import make_response, render_template, request, Request, Response
 from werkzeug.exceptions import abort
 
-from MultiServer import Context, get_saving_second
+from MultiServer import get_saving_second
 from NetUtils import ClientStatus, Hint, NetworkItem, NetworkSlot, SlotType
 from Utils import restricted_loads, KeyedDefaultDict
 from . import app, cache
-from .models import GameDataPackage, Room
+from .models import Room
+from .multidata import multidata_cache
+from .snapshot import join_tracker_slots, make_tracker_snapshot
 
 # Multisave is currently updated, at most, every minute.
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
+# Spheres shown per page of the sphere tracker, so very large multiworlds don't render every location at once.
+SPHERE_TRACKER_PAGE_SIZE = 20
 
 _multiworld_trackers: Dict[str, Callable] = {}
 _player_trackers: Dict[str, Callable] = {}
@@ -40,6 +44,16 @@ def _cache_results(func: Callable) -> Callable:
     return method_wrapper
 
 
+class _NameLookup(collections.ChainMap):
+    """Names ids through an id to name lookup shared through the multidata cache, without modifying it."""
+    def __init__(self, names: Dict[int, str], unknown: Callable[[int], str]):
+        super().__init__({}, names)
+        self.unknown = unknown
+
+    def __missing__(self, code: int) -> str:
+        return self.unknown(code)
+
+
 @dataclass
 class TrackerData:
     """A helper dataclass that is instantiated each time an HTTP request comes in for tracker data.
@@ -49,14 +63,21 @@ class TrackerData:
     """
     room: Room
     _multidata: Dict[str, Any]
-    _multisave: Dict[str, Any]
+    _snapshot: Dict[str, Any]
     _tracker_cache: Dict[str, Any]
 
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
+        self._multidata = multidata_cache.get_multidata(room.seed)
+        tracker_slots = room.tracker_slots.select()[:]
+        if tracker_slots:
+            self._snapshot = join_tracker_slots({(tracker_slot.team, tracker_slot.slot):
+                                                 restricted_loads(tracker_slot.data)
+                                                 for tracker_slot in tracker_slots})
+        else:
+            # rooms that have not been saved since snapshots were introduced
+            self._snapshot = make_tracker_snapshot(restricted_loads(room.multisave) if room.multisave else {})
         self._tracker_cache = {}
 
         self.item_name_to_id: Dict[str, Dict[str, int]] = {}
@@ -70,11 +91,13 @@ class TrackerData:
             game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
         })
         for game, game_package in self._multidata["datapackage"].items():
-            game_package = restricted_loads(GameDataPackage.get(checksum=game_package["checksum"]).data)
-            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", {
-                id: name for name, id in game_package["item_name_to_id"].items()})
-            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})", {
-                id: name for name, id in game_package["location_name_to_id"].items()})
+            checksum = game_package["checksum"]
+            game_package = multidata_cache.get_game_data_package(checksum)
+            game_names = multidata_cache.get_game_names(checksum)
+            self.item_id_to_name[game] = _NameLookup(game_names.item_id_to_name,
+                                                     lambda code: f"Unknown Item (ID: {code})")
+            self.location_id_to_name[game] = _NameLookup(game_names.location_id_to_name,
+                                                         lambda code: f"Unknown Location (ID: {code})")
 
             # Normal lookup tables as well.
             self.item_name_to_id[game] = game_package["item_name_to_id"]
@@ -110,7 +133,7 @@ class TrackerData:
 
     def get_player_checked_locations(self, team: int, player: int) -> Set[int]:
         """Retrieves the set of all locations marked complete by this player."""
-        return self._multisave.get("location_checks", {}).get((team, player), set())
+        return self._snapshot["location_checks"].get((team, player), set())
 
     @_cache_results
     def get_player_missing_locations(self, team: int, player: int) -> Set[int]:
@@ -119,7 +142,7 @@ class TrackerData:
 
     def get_player_received_items(self, team: int, player: int) -> List[NetworkItem]:
         """Returns all items received to this player in order of received."""
-        return self._multisave.get("received_items", {}).get((team, player, True), [])
+        return self._snapshot["received_items"].get((team, player), [])
 
     @_cache_results
     def get_player_inventory_counts(self, team: int, player: int) -> collections.Counter:
@@ -137,7 +160,7 @@ class TrackerData:
     @_cache_results
     def get_player_hints(self, team: int, player: int) -> Set[Hint]:
         """Retrieves a set of all hints relevant for a particular player."""
-        return self._multisave.get("hints", {}).get((team, player), set())
+        return self._snapshot["hints"].get((team, player), set())
 
     @_cache_results
     def get_player_last_activity(self, team: int, player: int) -> Optional[datetime.timedelta]:
@@ -146,13 +169,23 @@ class TrackerData:
         """
         return self.get_room_last_activity().get((team, player), None)
 
+    def get_player_activity_time(self, team: int, player: int) -> Optional[datetime.datetime]:
+        """Retrieves when a particular player was last active. Returns None if no activity was ever recorded."""
+        timestamp = self._snapshot["client_activity_timers"].get((team, player), None)
+        return None if timestamp is None else datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+    def get_player_connection_time(self, team: int, player: int) -> Optional[datetime.datetime]:
+        """Retrieves when a particular player last connected. Returns None if no connection was ever made."""
+        timestamp = self._snapshot["client_connection_timers"].get((team, player), None)
+        return None if timestamp is None else datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
     def get_player_client_status(self, team: int, player: int) -> ClientStatus:
         """Retrieves the ClientStatus of a particular player."""
-        return self._multisave.get("client_game_state", {}).get((team, player), ClientStatus.CLIENT_UNKNOWN)
+        return self._snapshot["client_game_state"].get((team, player), ClientStatus.CLIENT_UNKNOWN)
 
     def get_player_alias(self, team: int, player: int) -> Optional[str]:
         """Returns the alias of a particular player, if any."""
-        return self._multisave.get("name_aliases", {}).get((team, player), None)
+        return self._snapshot["name_aliases"].get((team, player), None)
 
     @_cache_results
     def get_team_completed_worlds_count(self) -> Dict[int, int]:
@@ -274,7 +307,7 @@ class TrackerData:
         """
         last_activity: Dict[TeamPlayer, datetime.timedelta] = {}
         now = datetime.datetime.utcnow()
-        for (team, player), timestamp in self._multisave.get("client_activity_timers", []):
+        for (team, player), timestamp in self._snapshot["client_activity_timers"].items():
             last_activity[team, player] = now - datetime.datetime.utcfromtimestamp(timestamp)
 
         return last_activity
@@ -285,15 +318,14 @@ class TrackerData:
 
         Only supported platforms are Twitch and YouTube.
         """
-        video_feeds = {}
-        for (team, player), video_data in self._multisave.get("video", []):
-            video_feeds[team, player] = video_data
-
-        return video_feeds
+        return self._snapshot["video"]
 
     @_cache_results
     def get_spheres(self) -> List[List[int]]:
-        """ each sphere is { player: { location_id, ... } } """
+        """
+        each sphere is { player: { location_id, ... } }
+        This is the list of the cached multidata itself, pages of the sphere tracker only render a slice of it.
+        """
         return self._multidata.get("spheres", [])
 
 
@@ -466,24 +498,35 @@ def render_generic_multiworld_tracker(tracker_data: TrackerData, enabled_tracker
     )
 
 
-def render_generic_multiworld_sphere_tracker(tracker_data: TrackerData) -> str:
+def render_generic_multiworld_sphere_tracker(tracker_data: TrackerData, page: int = 1) -> str:
+    spheres = tracker_data.get_spheres()
+    page_count = max(1, -(-len(spheres) // SPHERE_TRACKER_PAGE_SIZE))
+    if not 1 <= page <= page_count:
+        abort(404)
+
+    first_sphere = (page - 1) * SPHERE_TRACKER_PAGE_SIZE
     return render_template(
         "multispheretracker.html",
         room=tracker_data.room,
         tracker_data=tracker_data,
+        spheres=spheres[first_sphere:first_sphere + SPHERE_TRACKER_PAGE_SIZE],
+        first_sphere=first_sphere + 1,
+        page=page,
+        page_count=page_count,
     )
 
 
 @app.route("/sphere_tracker/<suuid:tracker>")
+@app.route("/sphere_tracker/<suuid:tracker>/<int:page>")
 @cache.memoize(timeout=TRACKER_CACHE_TIMEOUT_IN_SECONDS)
-def get_multiworld_sphere_tracker(tracker: UUID):
+def get_multiworld_sphere_tracker(tracker: UUID, page: int = 1):
     # Room must exist.
     room = Room.get(tracker=tracker)
     if not room:
         abort(404)
 
     tracker_data = TrackerData(room)
-    return render_generic_multiworld_sphere_tracker(tracker_data)
+    return render_generic_multiworld_sphere_tracker(tracker_data, page)
 
 
 # TODO: This is a temporary solution until a proper Tracker API can be implemented for tracker templates and data to
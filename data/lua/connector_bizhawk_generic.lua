@@ -20,7 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 ]]
 
-local SCRIPT_VERSION = 1
+local SCRIPT_VERSION = 2
 
 -- Set to log incoming requests
 -- Will cause lag due to large console output
@@ -37,6 +37,16 @@ field `type`. The value of `type` determines what other fields may exist.
 To get the script version, instead of JSON, send "VERSION" to get the script
 version directly (e.g. "2").
 
+A list of requests may also be wrapped in an object with an `id`, in which
+case the response is wrapped in an object with the same `id`. The client can
+then send more messages before the previous ones are answered. Every message
+which has arrived by the end of a frame is answered on that frame, in the
+order they were sent.
+
+Request: `{"id": 3, "requests": [{"type": "PING"}]}`
+
+Response: `{"id": 3, "responses": [{"type": "PONG"}]}`
+
 #### Ex. 1
 
 Request: `[{"type": "PING"}]`
@@ -487,62 +497,72 @@ function process_request (req)
     end
 end
 
--- Receive data from AP client and send message back
+function process_requests (data)
+    local res = {}
+    local failed_guard_response = nil
+    for i, req in ipairs(data) do
+        if failed_guard_response ~= nil then
+            res[i] = failed_guard_response
+        else
+            -- An error is more likely to cause an NLua exception than to return an error here
+            local status, response = pcall(process_request, req)
+            if status then
+                res[i] = response
+
+                -- If the GUARD validation failed, skip the remaining commands
+                if response["type"] == "GUARD_RESPONSE" and not response["value"] then
+                    failed_guard_response = response
+                end
+            else
+                if type(response) ~= "string" then response = "Unknown error" end
+                res[i] = {type = "ERROR", err = response}
+            end
+        end
+    end
+
+    return res
+end
+
+-- Receive data from AP client and send messages back until no more messages are waiting
 function send_receive ()
-    local message, err = client_socket:receive()
+    while true do
+        local message, err = client_socket:receive()
 
-    -- Handle errors
-    if err == "closed" then
-        if current_state == STATE_CONNECTED then
-            print("Connection to client closed")
+        -- Handle errors
+        if err == "closed" then
+            if current_state == STATE_CONNECTED then
+                print("Connection to client closed")
+            end
+            current_state = STATE_NOT_CONNECTED
+            return
+        elseif err == "timeout" then
+            unlock()
+            return
+        elseif err ~= nil then
+            print(err)
+            current_state = STATE_NOT_CONNECTED
+            unlock()
+            return
         end
-        current_state = STATE_NOT_CONNECTED
-        return
-    elseif err == "timeout" then
-        unlock()
-        return
-    elseif err ~= nil then
-        print(err)
-        current_state = STATE_NOT_CONNECTED
-        unlock()
-        return
-    end
 
-    -- Reset timeout timer
-    timeout_timer = 5
+        -- Reset timeout timer
+        timeout_timer = 5
 
-    -- Process received data
-    if DEBUG then
-        print("Received Message ["..emu.framecount().."]: "..'"'..message..'"')
-    end
+        -- Process received data
+        if DEBUG then
+            print("Received Message ["..emu.framecount().."]: "..'"'..message..'"')
+        end
 
-    if message == "VERSION" then
-        client_socket:send(tostring(SCRIPT_VERSION).."\n")
-    else
-        local res = {}
-        local data = json.decode(message)
-        local failed_guard_response = nil
-        for i, req in ipairs(data) do
-            if failed_guard_response ~= nil then
-                res[i] = failed_guard_response
+        if message == "VERSION" then
+            client_socket:send(tostring(SCRIPT_VERSION).."\n")
+        else
+            local data = json.decode(message)
+            if data["id"] ~= nil then
+                client_socket:send(json.encode({id = data["id"], responses = process_requests(data["requests"])}).."\n")
             else
-                -- An error is more likely to cause an NLua exception than to return an error here
-                local status, response = pcall(process_request, req)
-                if status then
-                    res[i] = response
-
-                    -- If the GUARD validation failed, skip the remaining commands
-                    if response["type"] == "GUARD_RESPONSE" and not response["value"] then
-                        failed_guard_response = response
-                    end
-                else
-                    if type(response) ~= "string" then response = "Unknown error" end
-                    res[i] = {type = "ERROR", err = response}
-                end
+                client_socket:send(json.encode(process_requests(data)).."\n")
             end
         end
-
-        client_socket:send(json.encode(res).."\n")
     end
 end
 
@@ -0,0 +1,175 @@
+"""
+Opt-in profiling of access rules during generation, enabled with Generate's --profile_rules.
+
+Wraps the access rules of all locations and entrances and counts their calls and the time spent in them per game,
+per location and per entrance, so slow rules can be found in fill and progression balancing.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from BaseClasses import CollectionState, Entrance, Location, MultiWorld
+
+__all__ = ["RuleProfiler", "ProfiledRule", "RuleStats"]
+
+logger = logging.getLogger("RuleProfiler")
+
+
+class RuleStats:
+    """Calls of and time spent in the access rule of one location or entrance."""
+    __slots__ = ("game", "player", "kind", "name", "calls", "total_time", "own_time", "active")
+
+    game: str
+    player: int
+    kind: str
+    """either "location" or "entrance\""""
+    name: str
+    calls: int
+    total_time: float
+    """seconds spent in the rule, including rules of other locations and entrances it caused to be evaluated"""
+    own_time: float
+    """seconds spent in the rule, excluding rules of other locations and entrances it caused to be evaluated"""
+    active: bool
+
+    def __init__(self, game: str, player: int, kind: str, name: str) -> None:
+        self.game = game
+        self.player = player
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.own_time = 0.0
+        self.active = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"game": self.game, "player": self.player, "kind": self.kind, "name": self.name,
+                "calls": self.calls, "total_time": self.total_time, "own_time": self.own_time}
+
+
+class ProfiledRule:
+    """Stands in for an access rule and records its calls made from the profiling thread."""
+    __slots__ = ("rule", "stats", "profiler")
+
+    rule: Callable[[CollectionState], bool]
+    stats: RuleStats
+    profiler: "RuleProfiler"
+
+    def __init__(self, rule: Callable[[CollectionState], bool], stats: RuleStats, profiler: "RuleProfiler") -> None:
+        self.rule = rule
+        self.stats = stats
+        self.profiler = profiler
+
+    def __call__(self, state: CollectionState) -> bool:
+        profiler = self.profiler
+        stats = self.stats
+        # rules that were combined with their own old rule only count once
+        if stats.active or not profiler.enabled or threading.get_ident() != profiler.thread_id:
+            return self.rule(state)
+        child_times = profiler.child_times
+        stats.active = True
+        child_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.rule(state)
+        finally:
+            taken = time.perf_counter() - start
+            own = taken - child_times.pop()
+            if child_times:
+                child_times[-1] += taken
+            stats.active = False
+            stats.calls += 1
+            stats.total_time += taken
+            stats.own_time += own
+            profiler.phase_times[stats.game] += own
+
+
+class RuleProfiler:
+    """
+    Collects RuleStats for the access rules of a multiworld.
+
+    Rules are wrapped by instrument, which is called again at the start of every phase to also wrap rules that were
+    set or replaced since. Only calls from the thread that created the profiler are recorded.
+    """
+    stats: dict[tuple[int, str, str], RuleStats]
+    """keyed by player, kind and name"""
+    phases: dict[str, defaultdict[str, float]]
+    """own time of all rules per game, per phase"""
+    phase_times: defaultdict[str, float]
+    child_times: list[float]
+    enabled: bool
+    thread_id: int
+
+    def __init__(self) -> None:
+        self.stats = {}
+        self.phases = {}
+        self.phase_times = defaultdict(float)
+        self.child_times = []
+        self.enabled = False
+        self.thread_id = threading.get_ident()
+
+    def instrument(self, multiworld: MultiWorld, phase: str) -> None:
+        """Starts recording the given phase and wraps all rules that are not wrapped yet."""
+        self.phase_times = self.phases.setdefault(phase, defaultdict(float))
+        self._wrap(multiworld, multiworld.get_locations(), "location", Location.access_rule)
+        self._wrap(multiworld, multiworld.get_entrances(), "entrance", Entrance.access_rule)
+        self.enabled = True
+
+    def _wrap(self, multiworld: MultiWorld, spots: Iterable[Location | Entrance], kind: str,
+              default_rule: Callable[[CollectionState], bool]) -> None:
+        for spot in spots:
+            rule = spot.access_rule
+            if rule is default_rule or isinstance(rule, ProfiledRule):
+                continue
+            key = spot.player, kind, spot.name
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = RuleStats(multiworld.game[spot.player], spot.player, kind, spot.name)
+            spot.access_rule = ProfiledRule(rule, stats, self)
+
+    def stop(self, multiworld: MultiWorld) -> None:
+        """Stops recording and puts the original rules back, so output sees the rules the worlds set."""
+        self.enabled = False
+        for spot in (*multiworld.get_locations(), *multiworld.get_entrances()):
+            rule = spot.access_rule
+            if isinstance(rule, ProfiledRule) and rule.profiler is self:
+                spot.access_rule = rule.rule
+
+    def get_game_totals(self) -> dict[str, dict[str, float]]:
+        totals: dict[str, dict[str, float]] = {}
+        for stats in self.stats.values():
+            game_totals = totals.setdefault(stats.game, {"calls": 0, "own_time": 0.0})
+            game_totals["calls"] += stats.calls
+            game_totals["own_time"] += stats.own_time
+        return totals
+
+    def report(self, multiworld: MultiWorld, top: int) -> None:
+        """Logs the time per game and phase and the top rules by own time."""
+        totals = sorted(self.get_game_totals().items(), key=lambda item: item[1]["own_time"], reverse=True)
+        logger.info(f"Access rule time per game, over phases {', '.join(self.phases)}:")
+        for game, game_totals in totals:
+            by_phase = ", ".join(f"{phase} {times[game]:.3f}s" for phase, times in self.phases.items() if game in times)
+            logger.info(f" {game}: {game_totals['own_time']:.3f}s in {game_totals['calls']} calls ({by_phase})")
+
+        logger.info(f"Top {top} access rules by own time:")
+        ranked = sorted(self.stats.values(), key=lambda stats: stats.own_time, reverse=True)
+        for stats in ranked[:top]:
+            if not stats.calls:
+                break
+            logger.info(f" {stats.own_time:.4f}s own, {stats.total_time:.4f}s total, {stats.calls} calls, "
+                        f"{stats.own_time / stats.calls * 1e6:.1f}us per call: {stats.game} {stats.kind} "
+                        f"\"{stats.name}\" of {multiworld.get_player_name(stats.player)}")
+
+    def to_file(self, filename: str) -> None:
+        """Writes all stats as JSON, to compare runs."""
+        data = {
+            "phases": {phase: dict(times) for phase, times in self.phases.items()},
+            "games": self.get_game_totals(),
+            "rules": [stats.as_dict() for stats in sorted(self.stats.values(),
+                                                          key=lambda stats: stats.own_time, reverse=True)],
+        }
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
@@ -5,3 +5,21 @@ if __name__ == "__main__":
     load_worlds.run_load_worlds_benchmark()
     import locations
     locations.run_locations_benchmark()
+    import reachability
+    reachability.run_reachability_benchmark()
+    import fill
+    fill.run_fill_benchmark()
+    import state_copy
+    state_copy.run_state_copy_benchmark()
+    import spheres
+    spheres.run_spheres_benchmark()
+    import balancing
+    balancing.run_balancing_benchmark()
+    import precalc
+    precalc.run_precalc_benchmark()
+    import mod_output
+    mod_output.run_mod_output_benchmark()
+    import bizhawk
+    bizhawk.run_bizhawk_benchmark()
+    import patch
+    patch.run_patch_benchmark()
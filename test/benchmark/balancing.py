@@ -0,0 +1,44 @@
+"""Benchmark of progression balancing a filled multiworld of many players of the same game."""
+
+
+def run_balancing_benchmark(game: str = "Hollow Knight", players: int = 50, seed: int = 0) -> None:
+    import logging
+
+    from multiworld_setup import setup_multiworld
+    from time_it import TimeIt
+
+    from BaseClasses import CollectionState, Location
+    from Fill import balance_multiworld_progression, distribute_items_restrictive
+    from Utils import init_logging
+    from worlds import AutoWorld
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    # players who progress slower than others get progression pulled into earlier spheres
+    multiworld = setup_multiworld([AutoWorld.AutoWorldRegister.world_types[game]] * players, seed=seed,
+                                  options={"progression_balancing": 99})
+    distribute_items_restrictive(multiworld)
+    locations = len(multiworld.get_filled_locations())
+
+    rule_calls = 0
+    can_reach = Location.can_reach
+
+    def counted_can_reach(location: Location, state: CollectionState) -> bool:
+        nonlocal rule_calls
+        rule_calls += 1
+        return can_reach(location, state)
+
+    Location.can_reach = counted_can_reach  # type: ignore[method-assign]
+    try:
+        with TimeIt(f"{players} players of {game} balance_multiworld_progression over {locations} locations", logger):
+            balance_multiworld_progression(multiworld)
+    finally:
+        Location.can_reach = can_reach  # type: ignore[method-assign]
+    logger.info(f"{rule_calls} location tests")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_balancing_benchmark()
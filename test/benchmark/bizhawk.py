@@ -0,0 +1,67 @@
+"""Benchmark of the BizHawk client transport against the fake connector of test/programs/bizhawk_fake.py."""
+
+import asyncio
+
+
+def run_bizhawk_benchmark(polls: int = 60, reads_per_poll: int = 8, frame_rate: float = 60) -> None:
+    import logging
+    import os
+    import sys
+
+    from time_it import TimeIt
+
+    # test is the standard library's package here, so the fake connector is imported from its own folder
+    sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir, "programs"))
+    from bizhawk_fake import FakeConnector
+
+    from Utils import init_logging
+    from worlds._bizhawk import BizHawkContext, connect, disconnect, get_script_version, guarded_write, read, write
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    async def main() -> None:
+        connector = FakeConnector(frame_rate)
+        server = await connector.start()
+
+        ctx = BizHawkContext()
+        assert await connect(ctx)
+        assert await get_script_version(ctx) == 2
+        read_list = [(0x100 * index, 0x20, "RAM") for index in range(reads_per_poll)]
+        expected = [bytes(connector.memory[address:address + size]) for address, size, _ in read_list]
+
+        with TimeIt(f"{polls} polls of {reads_per_poll} reads awaited one after another", logger) as t:
+            for _ in range(polls):
+                assert [(await read(ctx, [entry]))[0] for entry in read_list] == expected
+        logger.info(f"{t.dif / polls * 1000:.1f} ms per poll")
+
+        messages = connector.messages
+        with TimeIt(f"{polls} polls of {reads_per_poll} reads awaited together", logger) as t:
+            for _ in range(polls):
+                results = await asyncio.gather(*(read(ctx, [entry]) for entry in read_list))
+                assert [result[0] for result in results] == expected
+        logger.info(f"{t.dif / polls * 1000:.1f} ms per poll, "
+                    f"{(connector.messages - messages) / polls:.1f} messages per poll")
+
+        # writes and guarded requests are pipelined but stay in order with reads made before and after them
+        first, written, guarded, after = await asyncio.gather(
+            read(ctx, [(0, 4, "RAM")]),
+            write(ctx, [(0, b"\xff" * 4, "RAM")]),
+            guarded_write(ctx, [(4, b"\xff", "RAM")], [(0, b"\xff" * 4, "RAM")]),
+            read(ctx, [(0, 5, "RAM")]),
+        )
+        assert first == [bytes(range(4))] and guarded and after == [b"\xff" * 5], "requests were reordered"
+
+        disconnect(ctx)
+        # let the connector notice the disconnect on its next frame
+        await asyncio.sleep(2 / frame_rate)
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_bizhawk_benchmark()
@@ -0,0 +1,34 @@
+"""Benchmark of the generation steps up to and including the main fill, for many players of the same game."""
+
+
+def run_fill_benchmark(game: str = "Hollow Knight", players: int = 20, seed: int = 0) -> None:
+    import gc
+    import logging
+
+    from multiworld_setup import gen_steps, setup_multiworld
+    from time_it import TimeIt
+
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+    from worlds import AutoWorld
+    from worlds.AutoWorld import call_all
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    multiworld = setup_multiworld([AutoWorld.AutoWorldRegister.world_types[game]] * players, (), seed)
+
+    with TimeIt(f"{players} players of {game} generation steps", logger):
+        for step in gen_steps:
+            call_all(multiworld, step)
+    locations = len(multiworld.get_unfilled_locations())
+    gc.collect()
+    with TimeIt(f"{players} players of {game} distribute_items_restrictive over {locations} locations", logger) as t:
+        distribute_items_restrictive(multiworld)
+    logger.info(f"{t.dif / max(locations, 1) * 1000:.4f} ms per location")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_fill_benchmark()
@@ -0,0 +1,36 @@
+"""Micro benchmark of typo-tolerant name lookups, with Utils.get_fuzzy_results and with a prebuilt Utils.FuzzyMatcher"""
+
+from timeit import timeit
+
+
+def run_fuzzy_match_benchmark(*games: str, lookups: int = 100, seed: int = 0) -> None:
+    import random
+
+    from Utils import FuzzyMatcher, get_fuzzy_results
+    from worlds.AutoWorld import AutoWorldRegister
+
+    rng = random.Random(seed)
+    for game in games or ("Factorio Bob's", "Ocarina of Time", "A Link to the Past"):
+        world_type = AutoWorldRegister.world_types[game]
+        for kind, names in (("item", world_type.all_item_and_group_names),
+                            ("location", set(world_type.location_names) | set(world_type.location_name_groups))):
+            # a typo in an existing name: a dropped letter
+            inputs = []
+            for name in rng.choices(sorted(names), k=lookups):
+                dropped = rng.randrange(len(name))
+                inputs.append(name[:dropped] + name[dropped + 1:])
+            build = timeit(lambda: FuzzyMatcher(names), number=1)
+            matcher = FuzzyMatcher(names)
+            assert all(matcher.get_results(input_word, 2) == get_fuzzy_results(input_word, names, 2)
+                       for input_word in inputs), "the index gave different results"
+            plain = timeit(lambda: [get_fuzzy_results(input_word, names, 2) for input_word in inputs], number=1)
+            indexed = timeit(lambda: [matcher.get_results(input_word, 2) for input_word in inputs], number=1)
+            print(f"{game} {len(names)} {kind} names: {plain / lookups * 1000:.3f} ms per lookup, "
+                  f"{indexed / lookups * 1000:.3f} ms indexed ({plain / indexed:.1f}x) "
+                  f"after building the index in {build * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_fuzzy_match_benchmark()
@@ -1,4 +1,5 @@
-def run_locations_benchmark():
+def run_locations_benchmark(*games: str):
+    """Benchmarks the access rules of every location, for all games or only the given ones."""
     import argparse
     import logging
     import gc
@@ -44,7 +45,7 @@ def run_locations_benchmark():
             return t.dif
 
         def main(self):
-            for game in sorted(AutoWorld.AutoWorldRegister.world_types):
+            for game in sorted(games or AutoWorld.AutoWorldRegister.world_types):
                 summary_data: typing.Dict[str, collections.Counter[str]] = {
                     "empty_state": collections.Counter(),
                     "all_state": collections.Counter(),
@@ -99,6 +100,8 @@ def run_locations_benchmark():
 
 
 if __name__ == "__main__":
+    import sys
+
     from path_change import change_home
     change_home()
-    run_locations_benchmark()
+    run_locations_benchmark(*sys.argv[1:])
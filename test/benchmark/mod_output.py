@@ -0,0 +1,56 @@
+"""Benchmark of writing the Factorio Bob's mod of every player, one thread per slot like Main's output stage."""
+
+
+def run_mod_output_benchmark(players: int = 40, seed: int = 0) -> None:
+    import concurrent.futures
+    import logging
+    import sys
+    import tempfile
+    import time
+
+    from multiworld_setup import setup_multiworld
+    from time_it import TimeIt
+
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+    from worlds import AutoWorld
+    from worlds.AutoWorld import call_single
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    game = "Factorio Bob's"
+    world_type = AutoWorld.AutoWorldRegister.world_types[game]
+    mod_module = sys.modules[f"{world_type.__module__}.Mod"]
+    multiworld = setup_multiworld([world_type] * players, seed=seed)
+    distribute_items_restrictive(multiworld)
+
+    load_static_mod_files = mod_module.load_static_mod_files
+    static_time = 0.0
+
+    def timed_load_static_mod_files(zip_path):
+        nonlocal static_time
+        start = time.perf_counter()
+        files = load_static_mod_files(zip_path)
+        static_time += time.perf_counter() - start
+        return files
+
+    mod_module.static_mod_files = None
+    mod_module.load_static_mod_files = timed_load_static_mod_files
+    try:
+        with tempfile.TemporaryDirectory() as output_directory:
+            with TimeIt(f"{players} players of {game} generate_output", logger) as t:
+                with concurrent.futures.ThreadPoolExecutor(players) as pool:
+                    for future in [pool.submit(call_single, multiworld, "generate_output", player, output_directory)
+                                   for player in multiworld.player_ids]:
+                        future.result()
+    finally:
+        mod_module.load_static_mod_files = load_static_mod_files
+    logger.info(f"{t.dif / players * 1000:.2f} ms per player, "
+                f"of which {static_time * 1000:.2f} ms deflating data/mod once for all of them")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_mod_output_benchmark()
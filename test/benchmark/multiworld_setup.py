@@ -0,0 +1,36 @@
+gen_steps = (
+    "generate_early",
+    "create_regions",
+    "create_items",
+    "set_rules",
+    "connect_entrances",
+    "generate_basic",
+    "pre_fill",
+)
+
+
+def setup_multiworld(world_types: list, steps: tuple = gen_steps, seed: int = 0, options: dict = None):
+    """Creates a multiworld with a player for each of world_types, with default options apart from options, and calls
+    steps. Same as test.general.setup_multiworld, which can't be imported here, as test is the standard library's."""
+    import argparse
+
+    from BaseClasses import CollectionState, MultiWorld
+    from worlds.AutoWorld import call_all
+
+    if options is None:
+        options = {}
+    multiworld = MultiWorld(len(world_types))
+    multiworld.game = {player: world_type.game for player, world_type in enumerate(world_types, 1)}
+    multiworld.player_name = {player: f"Player{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(seed)
+    args = argparse.Namespace()
+    for player, world_type in enumerate(world_types, 1):
+        for name, option in world_type.options_dataclass.type_hints.items():
+            player_options = getattr(args, name, {})
+            player_options[player] = option.from_any(options.get(name, option.default))
+            setattr(args, name, player_options)
+    multiworld.set_options(args)
+    multiworld.state = CollectionState(multiworld)
+    for step in steps:
+        call_all(multiworld, step)
+    return multiworld
@@ -0,0 +1,64 @@
+"""Benchmark of APProcedurePatch.patch applying synthetic tokens to a synthetic ROM, with its time and peak memory."""
+
+
+def run_patch_benchmark(rom_size: int = 64 * 1024 * 1024, tokens: int = 200_000, seed: int = 0) -> None:
+    import logging
+    import os
+    import random
+    import tempfile
+    import tracemalloc
+
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from worlds.Files import APProcedurePatch, APTokenMixin, APTokenTypes
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    rng = random.Random(seed)
+    source_data = rng.randbytes(rom_size)
+
+    class BenchmarkPatch(APProcedurePatch, APTokenMixin):
+        hash = None
+        procedure = [
+            ("apply_tokens", ["token_data.bin"]),
+            ("calc_snes_crc", []),
+        ]
+
+        @classmethod
+        def get_source_data(cls) -> bytes:
+            return source_data
+
+    with tempfile.TemporaryDirectory() as directory:
+        patch = BenchmarkPatch(os.path.join(directory, "benchmark.apbench"), player=1, player_name="Player1")
+        for _ in range(tokens):
+            offset = rng.randrange(rom_size - 0x100)
+            token_type = rng.choices(list(APTokenTypes), weights=(90, 2, 2, 2, 2, 2))[0]
+            if token_type == APTokenTypes.WRITE:
+                patch.write_token(token_type, offset, rng.randbytes(rng.randrange(1, 0x40)))
+            elif token_type in (APTokenTypes.COPY, APTokenTypes.RLE):
+                patch.write_token(token_type, offset, (rng.randrange(1, 0x40), rng.randrange(0x100)))
+            else:
+                patch.write_token(token_type, offset, rng.randrange(0x100))
+        patch.write_file("token_data.bin", patch.get_token_binary())
+        patch.write()
+
+        patch = BenchmarkPatch(patch.path)
+        BenchmarkPatch.get_source_data_with_cache()
+        target = os.path.join(directory, "benchmark.sfc")
+        tracemalloc.start()
+        try:
+            with TimeIt(f"patching {tokens} tokens onto {rom_size // 1024 // 1024} MiB", logger):
+                patch.patch(target)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        logger.info(f"{peak / rom_size:.2f} ROM sizes of peak memory allocated while patching")
+        assert os.path.getsize(target) == rom_size
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_patch_benchmark()
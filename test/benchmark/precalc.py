@@ -0,0 +1,56 @@
+"""Benchmark of Factorio Bob's create_items per player, which needs the precalculated costs of the shared recipe graph."""
+
+
+def run_precalc_benchmark(players: int = 30, seed: int = 0) -> None:
+    import logging
+    import sys
+    import time
+
+    from multiworld_setup import setup_multiworld
+    from time_it import TimeIt
+
+    from Utils import init_logging
+    from worlds import AutoWorld
+    from worlds.AutoWorld import call_single
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    game = "Factorio Bob's"
+    world_type = AutoWorld.AutoWorldRegister.world_types[game]
+    world_module = sys.modules[world_type.__module__]
+    internal_item = sys.modules[f"{world_type.__module__}.InternalItem"]
+    internal_item.recipe_tree_cache.load()
+    load_precalc = world_module.load_precalc
+    precalc_time = 0.0
+
+    def timed_load_precalc() -> None:
+        nonlocal precalc_time
+        start = time.perf_counter()
+        load_precalc()
+        precalc_time += time.perf_counter() - start
+
+    for reparse in (True, False):
+        multiworld = setup_multiworld([world_type] * players, ("generate_early", "create_regions"), seed)
+
+        precalc_time = 0.0
+        world_module.load_precalc = timed_load_precalc
+        try:
+            with TimeIt(f"{players} players of {game} create_items, "
+                        f"{'parsing precalc.json for every player' if reparse else 'sharing the parsed precalc.json'}",
+                        logger) as t:
+                for player in multiworld.player_ids:
+                    if reparse or player == 1:
+                        internal_item._precalc = None
+                        internal_item.base_graph.frozen = False
+                    call_single(multiworld, "create_items", player)
+        finally:
+            world_module.load_precalc = load_precalc
+        logger.info(f"{t.dif / players * 1000:.2f} ms per player, "
+                    f"of which {precalc_time / players * 1000:.2f} ms loading the precalculated costs")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_precalc_benchmark()
@@ -0,0 +1,91 @@
+"""Benchmark comparing the regular region search of CollectionState against World.incremental_reachability,
+by sweeping synthetic multiworlds with large, item-gated region graphs."""
+
+
+def run_reachability_benchmark(players: int = 60, regions_per_player: int = 300, keys_per_player: int = 100,
+                               copies_per_key: int = 3) -> None:
+    import gc
+    import logging
+    import random
+
+    from multiworld_setup import setup_multiworld
+    from time_it import TimeIt
+
+    from BaseClasses import CollectionState, Item, ItemClassification, MultiWorld, Region
+    from Utils import init_logging
+    from worlds.AutoWorld import World
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    class ReachabilityBenchmarkWorld(World):
+        game = "Reachability Benchmark"
+        item_name_to_id = {}
+        location_name_to_id = {}
+        hidden = True
+
+    def key_rule(key: str, count: int, player: int):
+        return lambda state: state.has(key, player, count)
+
+    def region_rule(key: str, count: int, region: str, player: int):
+        return lambda state: state.has(key, player, count) and state.can_reach_region(region, player)
+
+    def create_multiworld(mode: str) -> MultiWorld:
+        multiworld = setup_multiworld([ReachabilityBenchmarkWorld] * players, (), seed=0)
+        for player in multiworld.player_ids:
+            world = multiworld.worlds[player]
+            world.incremental_reachability = mode == "incremental"
+            world.explicit_indirect_conditions = mode != "automatic indirect conditions"
+            # same layout for every mode
+            layout_random = random.Random(player)
+            regions = [Region("Menu" if i == 0 else f"Region {i}", player, multiworld)
+                       for i in range(regions_per_player)]
+            multiworld.regions += regions
+            for i, region in enumerate(regions[1:], 1):
+                parent = regions[layout_random.randrange(i)]
+                key = f"Key {layout_random.randrange(keys_per_player)}"
+                count = layout_random.randint(1, copies_per_key)
+                if layout_random.random() < 0.1:
+                    # also require some other region, as an indirect condition
+                    other = regions[layout_random.randrange(regions_per_player)]
+                    entrance = parent.connect(region, f"{parent.name} -> {region.name}",
+                                              region_rule(key, count, other.name, player))
+                    multiworld.register_indirect_condition(other, entrance)
+                else:
+                    parent.connect(region, f"{parent.name} -> {region.name}", key_rule(key, count, player))
+        return multiworld
+
+    def create_items(multiworld: MultiWorld) -> list[Item]:
+        items = [Item(f"Key {key}", ItemClassification.progression, None, player)
+                 for player in multiworld.player_ids
+                 for key in range(keys_per_player)
+                 for _ in range(copies_per_key)]
+        random.Random(0).shuffle(items)
+        return items
+
+    results = {}
+    for mode in ("explicit indirect conditions", "automatic indirect conditions", "incremental"):
+        multiworld = create_multiworld(mode)
+        items = create_items(multiworld)
+        last_regions = {player: multiworld.get_region(f"Region {regions_per_player - 1}", player)
+                        for player in multiworld.player_ids}
+        gc.collect()
+        # collect one item at a time and check for reachability in between, as fill does
+        with TimeIt(f"{players} players, collecting {len(items)} items with {mode}", logger) as t:
+            state = CollectionState(multiworld)
+            for item in items:
+                state.collect(item, True)
+                last_regions[item.player].can_reach(state)
+        results[mode] = t.dif, {player: {region.name for region in state.reachable_regions[player]}
+                                for player in multiworld.player_ids}
+
+    explicit_time, explicit_regions = results["explicit indirect conditions"]
+    for mode, (time_taken, regions) in results.items():
+        assert regions == explicit_regions, f"{mode} found different regions"
+        logger.info(f"{mode}: {time_taken:.4f} seconds, {explicit_time / time_taken:.2f}x the speed of explicit")
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_reachability_benchmark()
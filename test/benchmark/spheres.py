@@ -0,0 +1,49 @@
+"""Benchmark of sweeping the spheres of a filled multiworld, with and without tracing location rule dependencies."""
+
+
+def run_spheres_benchmark(game: str = "Factorio Bob's", players: int = 20, seed: int = 0) -> None:
+    import logging
+
+    from multiworld_setup import setup_multiworld
+    from time_it import TimeIt
+
+    from BaseClasses import CollectionState, Location
+    from Utils import init_logging
+    from worlds import AutoWorld
+    from Fill import distribute_items_restrictive
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    multiworld = setup_multiworld([AutoWorld.AutoWorldRegister.world_types[game]] * players, seed=seed)
+    distribute_items_restrictive(multiworld)
+    locations = len(multiworld.get_filled_locations())
+
+    rule_calls = 0
+    can_reach = Location.can_reach
+
+    def counted_can_reach(location: Location, state: CollectionState) -> bool:
+        nonlocal rule_calls
+        rule_calls += 1
+        return can_reach(location, state)
+
+    results = {}
+    Location.can_reach = counted_can_reach  # type: ignore[method-assign]
+    try:
+        for traced in (False, True):
+            for world in multiworld.worlds.values():
+                world.incremental_reachability = traced
+            rule_calls = 0
+            with TimeIt(f"{players} players of {game} get_spheres over {locations} locations "
+                        f"{'with' if traced else 'without'} dependency tracing", logger):
+                results[traced] = list(multiworld.get_spheres())
+            logger.info(f"{rule_calls} location tests in {len(results[traced])} spheres")
+    finally:
+        Location.can_reach = can_reach  # type: ignore[method-assign]
+    assert results[False] == results[True], "tracing changed the spheres"
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_spheres_benchmark()
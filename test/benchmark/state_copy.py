@@ -0,0 +1,78 @@
+"""Benchmark of CollectionState.copy and of the main fill, against the full per-player copies made before copies shared
+their per-player containers."""
+
+
+def run_state_copy_benchmark(game: str = "Hollow Knight", players: int = 20, copies: int = 1000, seed: int = 0) -> None:
+    import gc
+    import logging
+
+    from multiworld_setup import setup_multiworld
+    from time_it import TimeIt
+
+    from BaseClasses import CollectionState, MultiWorld
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+    from worlds import AutoWorld
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    shared_copy = CollectionState.copy
+
+    def full_copy(self: CollectionState) -> CollectionState:
+        ret = CollectionState.__new__(CollectionState)
+        ret.multiworld = self.multiworld
+        ret.prog_items = {player: counter.copy() for player, counter in self.prog_items.items()}
+        ret.reachable_regions = {player: region_set.copy() for player, region_set in
+                                 self.reachable_regions.items()}
+        ret.blocked_connections = {player: entrance_set.copy() for player, entrance_set in
+                                   self.blocked_connections.items()}
+        ret.reachability_indexes = {player: index.copy() for player, index in self.reachability_indexes.items()}
+        ret._sharing = {}
+        ret.advancements = self.advancements.copy()
+        ret.path = self.path.copy()
+        ret.locations_checked = self.locations_checked.copy()
+        ret.stale = {player: True for player in self.stale}
+        ret.allow_partial_entrances = self.allow_partial_entrances
+        for function in self.additional_init_functions:
+            function(ret, self.multiworld)
+        for function in self.additional_copy_functions:
+            ret = function(self, ret)
+        return ret
+
+    def create_multiworld() -> MultiWorld:
+        return setup_multiworld([AutoWorld.AutoWorldRegister.world_types[game]] * players, seed=seed)
+
+    multiworld = create_multiworld()
+    state = multiworld.get_all_state(False)
+    item = next(item for item in multiworld.itempool if item.advancement and item.player == 1)
+    results = {}
+    for name, copy in (("full", full_copy), ("shared", shared_copy)):
+        CollectionState.copy = copy
+        try:
+            with TimeIt(f"{copies} {name} copies of an all state of {players} players of {game}", logger) as t:
+                for _ in range(copies):
+                    state.copy()
+            logger.info(f"{t.dif / copies * 1000:.4f} ms per copy")
+            with TimeIt(f"{copies} {name} copies collecting one item and checking one region", logger) as t:
+                for _ in range(copies):
+                    state_copy = state.copy()
+                    state_copy.collect(item, True)
+                    state_copy.can_reach_region("Menu", 1)
+            logger.info(f"{t.dif / copies * 1000:.4f} ms per copy")
+
+            fill_multiworld = create_multiworld()
+            gc.collect()
+            with TimeIt(f"distribute_items_restrictive with {name} copies", logger) as t:
+                distribute_items_restrictive(fill_multiworld)
+        finally:
+            CollectionState.copy = shared_copy
+        results[name] = {location.name: (location.item.name, location.item.player)
+                         for location in fill_multiworld.get_locations() if location.item}
+    assert results["full"] == results["shared"], "shared copies changed the outcome of the fill"
+
+
+if __name__ == "__main__":
+    from path_change import change_home
+    change_home()
+    run_state_copy_benchmark()
@@ -319,6 +319,25 @@ class TestFillRestrictive(unittest.TestCase):
         self.assertEqual(player2.locations[0].item, player1.prog_items[0])
         self.assertEqual(player2.locations[1].item, player2.prog_items[0])
 
+    def test_fill_keeps_location_order(self):
+        """Test that items go to the earliest fillable location of the list, regardless of player and progress type"""
+        multiworld = generate_test_multiworld(2)
+        player1 = generate_player_data(multiworld, 1, 3, 2, 1)
+        player2 = generate_player_data(multiworld, 2, 2)
+        player1.locations[0].progress_type = LocationProgressType.EXCLUDED
+        player2.locations[0].progress_type = LocationProgressType.PRIORITY
+        locations = [player1.locations[0], player2.locations[1], player1.locations[1], player2.locations[0],
+                     player1.locations[2]]
+        items = [player1.basic_items[0], *player1.prog_items]
+
+        fill_restrictive(multiworld, multiworld.state, locations, items)
+
+        # items are placed from the back of the list, progression skips the excluded location
+        self.assertEqual(player2.locations[1].item, player1.prog_items[1])
+        self.assertEqual(player1.locations[1].item, player1.prog_items[0])
+        self.assertEqual(player1.locations[0].item, player1.basic_items[0])
+        self.assertEqual([player2.locations[0], player1.locations[2]], locations)
+
     def test_multiplayer_rules_fill(self):
         """Test that fill across worlds satisfies the rules"""
         multiworld = generate_test_multiworld(2)
@@ -0,0 +1,103 @@
+import unittest
+
+from BaseClasses import CollectionState, Item, ItemClassification, MultiWorld, Region
+from . import generate_test_multiworld
+
+
+class TestIncrementalReachability(unittest.TestCase):
+    multiworld: MultiWorld
+    regions: list[Region]
+
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(2)
+        self.multiworld.worlds[1].incremental_reachability = True
+        menu = self.multiworld.get_region("Menu", 1)
+        self.regions = [Region(f"Region {i}", 1, self.multiworld) for i in range(5)]
+        self.multiworld.regions += self.regions
+        # Menu -> 0 -> 1 -> 2, each behind a key
+        menu.connect(self.regions[0], "To 0", lambda state: state.has("Key 0", 1))
+        self.regions[0].connect(self.regions[1], "To 1", lambda state: state.has("Key 1", 1))
+        self.regions[1].connect(self.regions[2], "To 2", lambda state: state.has("Key 2", 1, 2))
+        # Menu -> 3 depends on region 2, without an indirect condition
+        menu.connect(self.regions[3], "To 3", lambda state: state.can_reach_region("Region 2", 1))
+        # Menu -> 4 looks at the whole Counter, which can't be traced
+        menu.connect(self.regions[4], "To 4", lambda state: state.prog_items[1].total() >= 5)
+
+    def collect(self, state: CollectionState, name: str) -> None:
+        state.collect(Item(name, ItemClassification.progression, None, 1), True)
+
+    def reachable(self, state: CollectionState) -> set[str]:
+        return {region.name for region in self.regions if region.can_reach(state)}
+
+    def test_collect_unlocks_regions(self) -> None:
+        """Test that collecting items only re-tests affected entrances and still finds every newly reachable region."""
+        state = CollectionState(self.multiworld)
+        self.assertEqual(self.reachable(state), set())
+        self.collect(state, "Key 1")
+        self.assertEqual(self.reachable(state), set())
+        self.collect(state, "Key 0")
+        self.assertEqual(self.reachable(state), {"Region 0", "Region 1"})
+        self.collect(state, "Key 2")
+        self.assertEqual(self.reachable(state), {"Region 0", "Region 1"})
+        self.collect(state, "Key 2")
+        self.assertEqual(self.reachable(state), {"Region 0", "Region 1", "Region 2", "Region 3"})
+        self.collect(state, "Unrelated")
+        self.assertEqual(self.reachable(state), {"Region 0", "Region 1", "Region 2", "Region 3", "Region 4"})
+
+    def test_matches_full_search(self) -> None:
+        """Test that the incremental search finds the same regions as the regular search after every collect."""
+        incremental_state = CollectionState(self.multiworld)
+        self.multiworld.worlds[1].incremental_reachability = False
+        self.multiworld.worlds[1].explicit_indirect_conditions = False
+        full_state = CollectionState(self.multiworld)
+        self.assertNotIn(1, full_state.reachability_indexes)
+        for name in ("Key 2", "Key 0", "Filler", "Key 2", "Key 1"):
+            self.collect(incremental_state, name)
+            self.collect(full_state, name)
+            self.assertEqual(self.reachable(incremental_state), self.reachable(full_state))
+
+    def test_other_player_rules_are_retested(self) -> None:
+        """Test that an entrance reading another player's items or regions is re-tested on every update."""
+        menu = self.multiworld.get_region("Menu", 1)
+        other_menu = self.multiworld.get_region("Menu", 2)
+        other_region = Region("Other Region", 2, self.multiworld)
+        self.multiworld.regions.append(other_region)
+        other_menu.connect(other_region, "To Other", lambda state: state.has("Other Key", 2))
+        cross_item = Region("Cross Item", 1, self.multiworld)
+        cross_region = Region("Cross Region", 1, self.multiworld)
+        self.multiworld.regions += [cross_item, cross_region]
+        self.regions += [cross_item, cross_region]
+        menu.connect(cross_item, "To Cross Item", lambda state: state.has("Shared Key", 2))
+        menu.connect(cross_region, "To Cross Region", lambda state: state.can_reach_region("Other Region", 2))
+
+        state = CollectionState(self.multiworld)
+        self.assertEqual(self.reachable(state), set())
+        state.collect(Item("Shared Key", ItemClassification.progression, None, 2), True)
+        state.collect(Item("Other Key", ItemClassification.progression, None, 2), True)
+        # entrances of player 1 are only updated once player 1 collects anything, like without the index
+        self.collect(state, "Unrelated")
+        self.assertEqual(self.reachable(state), {"Cross Item", "Cross Region"})
+        self.assertTrue(state.can_reach_region("Other Region", 2))
+
+    def test_remove_resets(self) -> None:
+        """Test that removing an item from state makes regions unreachable again."""
+        state = CollectionState(self.multiworld)
+        key = Item("Key 0", ItemClassification.progression, None, 1)
+        state.collect(key, True)
+        self.collect(state, "Key 1")
+        self.assertEqual(self.reachable(state), {"Region 0", "Region 1"})
+        state.remove(key)
+        self.assertEqual(self.reachable(state), set())
+        state.collect(key, True)
+        self.assertEqual(self.reachable(state), {"Region 0", "Region 1"})
+
+    def test_copy_is_independent(self) -> None:
+        """Test that a copied state keeps its own dependency index."""
+        state = CollectionState(self.multiworld)
+        self.assertEqual(self.reachable(state), set())
+        copy = state.copy()
+        self.collect(copy, "Key 0")
+        self.assertEqual(self.reachable(copy), {"Region 0"})
+        self.assertEqual(self.reachable(state), set())
+        self.collect(state, "Key 1")
+        self.assertEqual(self.reachable(state), set())
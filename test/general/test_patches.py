@@ -1,6 +1,17 @@
-﻿import unittest
+﻿import os
+import tempfile
+import unittest
 from worlds.AutoWorld import AutoWorldRegister
-from worlds.Files import AutoPatchRegister
+from worlds.Files import APPatchExtension, APProcedurePatch, APTokenMixin, APTokenTypes, AutoPatchRegister
+
+
+class TokenPatch(APProcedurePatch, APTokenMixin):
+    hash = None
+    procedure = [("apply_tokens", ["token_data.bin"])]
+
+    @classmethod
+    def get_source_data(cls) -> bytes:
+        return bytes(range(16))
 
 
 class TestPatches(unittest.TestCase):
@@ -9,3 +20,37 @@ class TestPatches(unittest.TestCase):
             with self.subTest(game=game_name):
                 self.assertIn(game_name, AutoWorldRegister.world_types.keys(),
                               f"Patch '{game_name}' does not match the name of any world.")
+
+    def test_apply_tokens(self) -> None:
+        patch = TokenPatch()
+        patch.write_token(APTokenTypes.WRITE, 0, b"\xaa\xbb")
+        patch.write_token(APTokenTypes.COPY, 4, (2, 0))
+        patch.write_token(APTokenTypes.RLE, 8, (3, 0xcc))
+        patch.write_token(APTokenTypes.AND_8, 12, 0x0e)
+        patch.write_token(APTokenTypes.OR_8, 13, 0xf0)
+        patch.write_token(APTokenTypes.XOR_8, 14, 0xff)
+        patch.write_file("token_data.bin", patch.get_token_binary())
+        rom = bytearray(TokenPatch.get_source_data())
+        patched = APPatchExtension.apply_tokens(patch, rom, "token_data.bin")
+        self.assertIs(patched, rom, "apply_tokens should change a bytearray in place")
+        self.assertEqual(patched, bytes([0xaa, 0xbb, 2, 3, 0xaa, 0xbb, 6, 7, 0xcc, 0xcc, 0xcc, 11, 12, 0xfd, 0xf1, 15]))
+
+    def test_rewrite_read_patch(self) -> None:
+        """Test that files read lazily from a patch survive writing the patch back to the same path."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.aptest")
+            patch = TokenPatch(path, player=1, player_name="Player1")
+            patch.write_token(APTokenTypes.WRITE, 0, b"\xaa")
+            patch.write_file("token_data.bin", patch.get_token_binary())
+            patch.write()
+
+            patch = TokenPatch(path)
+            patch.read()
+            patch.server = "localhost"
+            patch.write()
+            patch = TokenPatch(path)
+            target = os.path.join(directory, "test.bin")
+            patch.patch(target)
+            self.assertEqual(patch.server, "localhost")
+            with open(target, "rb") as f:
+                self.assertEqual(f.read(), b"\xaa" + bytes(range(1, 16)))
@@ -0,0 +1,47 @@
+import os
+import unittest
+from random import Random
+
+from worlds.AutoWorld import AutoWorldRegister, World, call_precompute
+from . import TestWorld, setup_multiworld
+
+
+class TestPrecompute(unittest.TestCase):
+    world_type: type[World]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        class PrecomputeTestWorld(TestWorld):
+            game = "Precompute Test Game"
+            item_name_to_id = {}
+            location_name_to_id = {}
+
+            def precompute(self, random: Random) -> tuple[int, int, float]:
+                return os.getpid(), self.player, random.random()
+
+        cls.world_type = PrecomputeTestWorld
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        del AutoWorldRegister.world_types[cls.world_type.game]
+
+    def generate(self, workers: int) -> dict[int, tuple[int, int, float]]:
+        multiworld = setup_multiworld([self.world_type, TestWorld, self.world_type, self.world_type], (), seed=0)
+        call_precompute(multiworld, workers)
+        self.assertIsNone(multiworld.worlds[2].precomputed)
+        return {player: multiworld.worlds[player].precomputed for player in (1, 3, 4)}
+
+    def test_results_are_stored(self) -> None:
+        """Test that every implementing world gets its own result, computed in the main process without workers."""
+        results = self.generate(1)
+        self.assertEqual({player: result[1] for player, result in results.items()}, {1: 1, 3: 3, 4: 4})
+        self.assertEqual({result[0] for result in results.values()}, {os.getpid()})
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_workers_match_main_process(self) -> None:
+        """Test that running precompute in worker processes gives the same results as running it in the main process."""
+        sequential = self.generate(1)
+        parallel = self.generate(2)
+        self.assertNotIn(os.getpid(), {result[0] for result in parallel.values()})
+        self.assertEqual({player: result[1:] for player, result in sequential.items()},
+                         {player: result[1:] for player, result in parallel.items()})
@@ -0,0 +1,54 @@
+import unittest
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld
+from rule_profiler import ProfiledRule, RuleProfiler
+from worlds.generic.Rules import add_rule
+from . import generate_test_multiworld
+
+
+class TestRuleProfiler(unittest.TestCase):
+    multiworld: MultiWorld
+
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(1)
+        menu = self.multiworld.get_region("Menu", 1)
+        self.key_location = Location(1, "Key Chest", 1, menu)
+        self.key_location.place_locked_item(Item("Key", ItemClassification.progression, 1, 1))
+        self.locked_location = Location(1, "Locked Chest", 2, menu)
+        self.locked_location.access_rule = lambda state: state.has("Key", 1)
+        menu.locations += [self.key_location, self.locked_location]
+
+    def test_rules_are_counted(self) -> None:
+        """Test that only set rules are wrapped and that their calls are counted."""
+        profiler = RuleProfiler()
+        profiler.instrument(self.multiworld, "fill")
+        self.assertIs(self.key_location.access_rule, Location.access_rule)
+        self.assertIsInstance(self.locked_location.access_rule, ProfiledRule)
+
+        state = CollectionState(self.multiworld)
+        self.assertFalse(self.locked_location.can_reach(state))
+        state.collect(self.key_location.item, True)
+        self.assertTrue(self.locked_location.can_reach(state))
+
+        stats = profiler.stats[1, "location", "Locked Chest"]
+        self.assertEqual(stats.calls, 2)
+        self.assertGreaterEqual(stats.total_time, stats.own_time)
+        self.assertEqual(profiler.get_game_totals()[stats.game]["calls"], 2)
+        self.assertIn(stats.game, profiler.phases["fill"])
+
+    def test_replaced_rules(self) -> None:
+        """Test that rules combined with their old rule are wrapped again but counted once, and get restored."""
+        profiler = RuleProfiler()
+        profiler.instrument(self.multiworld, "pre_fill")
+        add_rule(self.locked_location, lambda state: True)
+        profiler.instrument(self.multiworld, "fill")
+        combined_rule = self.locked_location.access_rule
+        self.assertIsInstance(combined_rule, ProfiledRule)
+
+        self.locked_location.can_reach(CollectionState(self.multiworld))
+        self.assertEqual(profiler.stats[1, "location", "Locked Chest"].calls, 1)
+
+        profiler.stop(self.multiworld)
+        self.assertIs(self.locked_location.access_rule, combined_rule.rule)
+        self.locked_location.can_reach(CollectionState(self.multiworld))
+        self.assertEqual(profiler.stats[1, "location", "Locked Chest"].calls, 1)
@@ -0,0 +1,111 @@
+import unittest
+from collections import Counter
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, MultiWorld, SphereCache
+from worlds.generic.Rules import CollectionRule
+from . import generate_test_multiworld
+
+
+class TestSpheres(unittest.TestCase):
+    multiworld: MultiWorld
+    locations: dict[str, Location]
+    rule_calls: Counter[str]
+
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(2)
+        self.locations = {}
+        self.rule_calls = Counter()
+        # player 1: A -> Key 1 -> B -> Event 1 -> C
+        self.add_location(1, "A", "Key 1", 1)
+        self.add_location(1, "B", "Event 1", 1, lambda state: state.has("Key 1", 1), event=True)
+        self.add_location(1, "C", "Key 2", 2, lambda state: state.has("Event 1", 1))
+        # player 2: D is locked behind Key 2 found at C, E needs an item of player 1, F is never reachable
+        self.add_location(2, "D", "Filler", 2, lambda state: state.has("Key 2", 2))
+        self.add_location(2, "E", "Filler", 2, lambda state: state.has("Key 1", 1))
+        self.add_location(2, "F", "Filler", 2, lambda state: state.has("Missing", 2))
+
+    def add_location(self, player: int, name: str, item_name: str, item_player: int,
+                     access_rule: CollectionRule | None = None, event: bool = False) -> None:
+        menu = self.multiworld.get_region("Menu", player)
+        location = Location(player, name, None if event else len(self.locations), menu)
+        menu.locations.append(location)
+        if access_rule:
+            def counted_rule(state: CollectionState, rule: CollectionRule = access_rule) -> bool:
+                self.rule_calls[name] += 1
+                return rule(state)
+
+            location.access_rule = counted_rule
+        location.place_locked_item(Item(item_name, ItemClassification.progression,
+                                        None if event else len(self.locations), item_player))
+        self.locations[name] = location
+
+    def names(self, spheres) -> list[set[str]]:
+        return [{location.name for location in sphere} for sphere in spheres]
+
+    def test_get_spheres(self) -> None:
+        """Test that spheres follow items across players, including rules that depend on another player."""
+        expected = [{"A"}, {"B", "E"}, {"C"}, {"D"}, set(), {"F"}]
+        self.assertEqual(self.names(self.multiworld.get_spheres()), expected)
+        self.multiworld.sphere_cache = SphereCache(self.multiworld)
+        self.assertEqual(self.names(self.multiworld.get_spheres()), expected)
+        self.assertEqual(self.names(self.multiworld.get_spheres()), expected)
+
+    def test_get_sendable_spheres(self) -> None:
+        """Test that events are collected as soon as they are reachable instead of forming spheres of their own."""
+        expected = [{"A"}, {"C", "E"}, {"D"}, set(), {"F"}]
+        self.assertEqual(self.names(self.multiworld.get_sendable_spheres()), expected)
+        self.multiworld.sphere_cache = SphereCache(self.multiworld)
+        self.assertEqual(self.names(self.multiworld.get_sendable_spheres()), expected)
+
+    def test_sphere_cache_state(self) -> None:
+        """Test that the cached sweep ends in the state with every reachable item collected."""
+        cache = SphereCache(self.multiworld)
+        sweep = cache.get_spheres()
+        self.assertIs(cache.get_spheres(), sweep)
+        self.assertEqual(sweep.unreachable, {self.locations["F"]})
+        self.assertTrue(sweep.state.has_all(("Key 1", "Event 1"), 1))
+        self.assertTrue(sweep.state.has("Key 2", 2))
+
+    def test_fulfills_accessibility(self) -> None:
+        """Test that the accessibility check gives the same answer with and without cached spheres."""
+        self.locations["F"].access_rule = lambda state: state.has("Key 2", 2)
+        self.assertTrue(self.multiworld.fulfills_accessibility())
+        self.multiworld.sphere_cache = SphereCache(self.multiworld)
+        self.assertTrue(self.multiworld.fulfills_accessibility())
+        self.assertTrue(self.multiworld.fulfills_accessibility(CollectionState(self.multiworld)))
+
+    def trace_rules(self) -> None:
+        for world in self.multiworld.worlds.values():
+            world.incremental_reachability = True
+
+    def test_traced_spheres(self) -> None:
+        """Test that traced locations are only re-tested once something their rule read changed."""
+        self.trace_rules()
+        self.assertEqual(self.names(self.multiworld.get_spheres()), [{"A"}, {"B", "E"}, {"C"}, {"D"}, set(), {"F"}])
+        # D fails on Key 2 in the first sphere and is reached in the fourth, F reads an item that never shows up
+        self.assertEqual(self.rule_calls["D"], 2)
+        self.assertEqual(self.rule_calls["F"], 1)
+        self.rule_calls.clear()
+        self.assertEqual(self.names(self.multiworld.get_sendable_spheres()), [{"A"}, {"C", "E"}, {"D"}, set(), {"F"}])
+        self.assertEqual(self.rule_calls["D"], 2)
+
+    def test_untraceable_rule(self) -> None:
+        """Test that a rule that can't be traced is re-tested every sphere, in traced and regular sweeps alike."""
+        self.locations["F"].access_rule = lambda state: len(state.prog_items[1]) >= 2
+        expected = [{"A"}, {"B", "E"}, {"C", "F"}, {"D"}]
+        self.assertEqual(self.names(self.multiworld.get_spheres()), expected)
+        self.trace_rules()
+        self.assertEqual(self.names(self.multiworld.get_spheres()), expected)
+
+    def test_traced_sweep_for_advancements(self) -> None:
+        """Test that a traced sweep collects the same items as a regular one."""
+        regular_state = CollectionState(self.multiworld)
+        regular_state.sweep_for_advancements()
+        regular_calls = self.rule_calls.copy()
+        self.rule_calls.clear()
+        self.trace_rules()
+        traced_state = CollectionState(self.multiworld)
+        traced_state.sweep_for_advancements()
+        self.assertEqual(traced_state.prog_items, regular_state.prog_items)
+        self.assertEqual(traced_state.advancements, regular_state.advancements)
+        self.assertLess(self.rule_calls.total(), regular_calls.total())
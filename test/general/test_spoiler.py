@@ -0,0 +1,40 @@
+import unittest
+
+from BaseClasses import Item, ItemClassification, Location, MultiWorld, Spoiler
+from . import generate_test_multiworld
+
+
+class TestSpoiler(unittest.TestCase):
+    multiworld: MultiWorld
+
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(1)
+        menu = self.multiworld.get_region("Menu", 1)
+        # a chain of keys, each unlocking the next, and a progression item that is never needed
+        for index in range(10):
+            location = Location(1, f"Chest {index}", index, menu)
+            if index:
+                location.access_rule = lambda state, key=f"Key {index - 1}": state.has(key, 1)
+            location.place_locked_item(Item(f"Key {index}", ItemClassification.progression, index, 1))
+            menu.locations.append(location)
+        location = Location(1, "Spare Chest", 10, menu)
+        location.place_locked_item(Item("Spare Key", ItemClassification.progression, 10, 1))
+        menu.locations.append(location)
+        self.multiworld.completion_condition[1] = lambda state: state.has("Key 9", 1)
+
+    def test_playthrough(self) -> None:
+        """Test that the playthrough only keeps what is required, in order, however few states are kept."""
+        expected = {"0": [], **{str(index + 1): {f"Chest {index}": f"Key {index}"} for index in range(10)}}
+        for checkpoints in (Spoiler.max_playthrough_checkpoints, 1):
+            with self.subTest(checkpoints=checkpoints):
+                spoiler = Spoiler(self.multiworld)
+                spoiler.max_playthrough_checkpoints = checkpoints
+                spoiler.create_playthrough(create_paths=False)
+                self.assertEqual(spoiler.playthrough, expected)
+                self.assertEqual(spoiler.paths, {})
+
+    def test_no_playthrough(self) -> None:
+        """Test that a spoiler without a playthrough has neither spheres nor paths."""
+        spoiler = Spoiler(self.multiworld)
+        self.assertEqual(spoiler.playthrough, {})
+        self.assertEqual(spoiler.paths, {})
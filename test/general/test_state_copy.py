@@ -0,0 +1,99 @@
+import copy
+import unittest
+
+from BaseClasses import CollectionState, Item, ItemClassification, Region
+from . import generate_test_multiworld
+
+
+class TestStateCopy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(3)
+        for player in self.multiworld.player_ids:
+            menu = self.multiworld.get_region("Menu", player)
+            region = Region("Locked", player, self.multiworld)
+            self.multiworld.regions.append(region)
+            menu.connect(region, "Unlock", lambda state, player=player: state.has("Key", player))
+        self.state = CollectionState(self.multiworld)
+
+    def collect(self, state: CollectionState, name: str, player: int) -> None:
+        state.collect(Item(name, ItemClassification.progression, None, player), True)
+
+    def test_copies_are_independent(self) -> None:
+        """Test that changes to either state after copying do not show up in the other one."""
+        self.collect(self.state, "Sword", 1)
+        state_copy = self.state.copy()
+        self.collect(state_copy, "Key", 1)
+        self.collect(self.state, "Shield", 2)
+        state_copy.prog_items[3]["Direct"] += 1
+
+        self.assertEqual(self.state.count("Sword", 1), 1)
+        self.assertEqual(state_copy.count("Sword", 1), 1)
+        self.assertEqual(self.state.count("Key", 1), 0)
+        self.assertEqual(state_copy.count("Key", 1), 1)
+        self.assertEqual(self.state.count("Shield", 2), 1)
+        self.assertEqual(state_copy.count("Shield", 2), 0)
+        self.assertEqual(self.state.count("Direct", 3), 0)
+        self.assertTrue(state_copy.can_reach_region("Locked", 1))
+        self.assertFalse(self.state.can_reach_region("Locked", 1))
+
+    def test_copy_of_copy(self) -> None:
+        """Test that repeatedly copying untouched states still keeps every state separate."""
+        self.collect(self.state, "Key", 2)
+        first = self.state.copy()
+        second = first.copy()
+        third = second.copy()
+        self.collect(second, "Key", 1)
+        self.assertTrue(second.can_reach_region("Locked", 1))
+        for state in (self.state, first, third):
+            self.assertFalse(state.can_reach_region("Locked", 1))
+            self.assertTrue(state.can_reach_region("Locked", 2))
+
+    def test_copies_share_until_changed(self) -> None:
+        """Test that a copy only copies the containers of a player once either state changes them."""
+        self.collect(self.state, "Sword", 1)
+        self.assertFalse(self.state.can_reach_region("Locked", 2))
+        state_copy = self.state.copy()
+        for state in (self.state, state_copy):
+            self.assertFalse(state.can_reach_region("Locked", 2))
+            self.assertEqual(state.count("Sword", 1), 1)
+        self.assertIs(state_copy.reachable_regions[2], self.state.reachable_regions[2])
+        self.assertIs(state_copy.blocked_connections[2], self.state.blocked_connections[2])
+
+        regions = self.state.reachable_regions[2]
+        self.collect(state_copy, "Key", 2)
+        self.assertTrue(state_copy.can_reach_region("Locked", 2))
+        self.assertIsNot(state_copy.reachable_regions[2], regions)
+        self.assertIs(self.state.reachable_regions[2], regions)
+        # the copy took its own sets, so the source is the last one using these
+        self.collect(self.state, "Shield", 2)
+        self.assertFalse(self.state.can_reach_region("Locked", 2))
+        self.assertIs(self.state.reachable_regions[2], regions)
+        self.assertIs(state_copy.reachable_regions[3], self.state.reachable_regions[3])
+
+    def test_direct_changes_to_shared_sets(self) -> None:
+        """Test that changing shared region sets directly is caught, and fine after unsharing them."""
+        self.assertFalse(self.state.can_reach_region("Locked", 1))
+        locked = self.multiworld.get_region("Locked", 1)
+        state_copy = self.state.copy()
+        state_copy.reachable_regions[1].add(locked)
+        with self.assertRaises(AssertionError):
+            self.state.copy()
+        state_copy.reachable_regions[1].remove(locked)
+
+        state_copy.unshare(1)
+        state_copy.reachable_regions[1].add(locked)
+        self.assertFalse(self.state.can_reach_region("Locked", 1))
+        self.assertNotIn(locked, self.state.reachable_regions[1])
+        self.state.copy()
+
+    def test_containers_behave_as_dicts(self) -> None:
+        """Test that the per-player containers of a copy can still be used like regular dicts."""
+        self.collect(self.state, "Key", 1)
+        state_copy = self.state.copy()
+        self.assertEqual(set(state_copy.prog_items), set(self.multiworld.get_all_ids()))
+        self.assertEqual(len(state_copy.prog_items), len(self.multiworld.get_all_ids()))
+        self.assertIn(1, state_copy.prog_items)
+        self.assertEqual(state_copy.prog_items, self.state.prog_items)
+        self.assertEqual(dict(state_copy.prog_items.items()), {player: counter for player, counter
+                                                               in self.state.prog_items.items()})
+        self.assertEqual(type(copy.deepcopy(state_copy.prog_items)), dict)
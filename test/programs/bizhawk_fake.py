@@ -0,0 +1,106 @@
+"""A fake connector speaking the JSON line protocol of connector_bizhawk_generic.lua, which answers the messages that
+arrived on each emulated frame."""
+
+import asyncio
+import base64
+import json
+
+
+class FakeConnector:
+    """
+    Stands in for connector_bizhawk_generic.lua on a 64 KiB memory domain, for the transport's tests and benchmark.
+    Set reverse to answer the messages of each frame last first, or silent to never answer.
+    """
+    memory: bytearray
+    messages: int
+    requests: int
+    batches: list[list[dict]]
+    """requests of every batch received, in the order they arrived"""
+
+    def __init__(self, frame_rate: float = 60, reverse: bool = False, silent: bool = False) -> None:
+        self.frame_rate = frame_rate
+        self.reverse = reverse
+        self.silent = silent
+        self.memory = bytearray(range(256)) * 256
+        self.messages = 0
+        self.requests = 0
+        self.batches = []
+        self.writers: list[asyncio.StreamWriter] = []
+
+    async def start(self) -> asyncio.Server:
+        """Listens on the first free port the client tries."""
+        from worlds._bizhawk import BIZHAWK_SOCKET_PORT_RANGE_SIZE, BIZHAWK_SOCKET_PORT_RANGE_START
+
+        for port in range(BIZHAWK_SOCKET_PORT_RANGE_START,
+                          BIZHAWK_SOCKET_PORT_RANGE_START + BIZHAWK_SOCKET_PORT_RANGE_SIZE):
+            try:
+                return await asyncio.start_server(self.serve, "127.0.0.1", port)
+            except OSError:
+                continue
+        raise OSError("no free connector port")
+
+    def close_connections(self) -> None:
+        for writer in self.writers:
+            writer.close()
+
+    def process_request(self, request: dict) -> dict:
+        self.requests += 1
+        address = request.get("address", 0)
+        if request["type"] == "READ":
+            data = self.memory[address:address + request["size"]]
+            return {"type": "READ_RESPONSE", "value": base64.b64encode(data).decode("ascii")}
+        if request["type"] == "WRITE":
+            data = base64.b64decode(request["value"])
+            self.memory[address:address + len(data)] = data
+            return {"type": "WRITE_RESPONSE"}
+        if request["type"] == "GUARD":
+            expected = base64.b64decode(request["expected_data"])
+            return {"type": "GUARD_RESPONSE", "address": address,
+                    "value": self.memory[address:address + len(expected)] == expected}
+        if request["type"] == "PING":
+            return {"type": "PONG"}
+        return {"type": "ERROR", "err": f"Unknown request type {request['type']}"}
+
+    def process_message(self, message: bytes) -> bytes:
+        self.messages += 1
+        if message == b"VERSION":
+            return b"2\n"
+        data = json.loads(message)
+        requests = data["requests"] if isinstance(data, dict) else data
+        self.batches.append(requests)
+        responses = []
+        failed_guard_response = None
+        for request in requests:
+            if failed_guard_response is not None:
+                responses.append(failed_guard_response)
+                continue
+            response = self.process_request(request)
+            if response["type"] == "GUARD_RESPONSE" and not response["value"]:
+                failed_guard_response = response
+            responses.append(response)
+        if isinstance(data, dict):
+            return json.dumps({"id": data["id"], "responses": responses}).encode("utf-8") + b"\n"
+        return json.dumps(responses).encode("utf-8") + b"\n"
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # the script only looks at its socket once per frame, and answers everything that arrived until then
+        self.writers.append(writer)
+        messages: list[bytes] = []
+
+        async def receive() -> None:
+            while message := await reader.readline():
+                messages.append(message.rstrip(b"\n"))
+
+        receiving = asyncio.create_task(receive())
+        while not receiving.done() and not writer.is_closing():
+            await asyncio.sleep(1 / self.frame_rate)
+            # requests are executed in the order they arrived either way
+            replies = [self.process_message(message) for message in messages]
+            messages.clear()
+            if self.silent:
+                continue
+            for reply in reversed(replies) if self.reverse else replies:
+                writer.write(reply)
+            await writer.drain()
+        receiving.cancel()
+        writer.close()
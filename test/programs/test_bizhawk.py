@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+from typing import Any
+from unittest import mock
+
+from test.programs.bizhawk_fake import FakeConnector
+from worlds._bizhawk import BizHawkContext, ConnectionStatus, RequestFailedError, connect, disconnect, \
+    get_script_version, guarded_read, ping, read, send_requests
+
+
+class TestBizHawkTransport(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        # slow enough for everything a test sends at once to arrive within one frame
+        self.connector = FakeConnector(frame_rate=20)
+        self.server = await self.connector.start()
+        self.ctx = BizHawkContext()
+        self.assertTrue(await connect(self.ctx))
+
+    async def asyncTearDown(self) -> None:
+        disconnect(self.ctx)
+        self.connector.close_connections()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def request_types(self) -> list[list[str]]:
+        return [[request["type"] for request in batch] for batch in self.connector.batches]
+
+    async def test_out_of_order_replies(self) -> None:
+        """Test that replies arriving in a different order than their batches were sent still reach their caller."""
+        self.connector.reverse = True
+        version, first, second, pong = await asyncio.gather(
+            get_script_version(self.ctx),
+            send_requests(self.ctx, [{"type": "READ", "address": 1, "size": 1, "domain": "RAM"}]),
+            send_requests(self.ctx, [{"type": "READ", "address": 2, "size": 2, "domain": "RAM"}]),
+            ping(self.ctx),
+        )
+        self.assertEqual(version, 2)
+        self.assertEqual(first[0]["value"], "AQ==")
+        self.assertEqual(second[0]["value"], "AgM=")
+        self.assertIsNone(pong)
+        self.assertEqual(self.request_types(), [["READ"], ["READ"], ["PING"]])
+
+    async def test_coalesced_reads(self) -> None:
+        """Test that reads made together are sent as one batch without duplicates and split back per caller."""
+        results = await asyncio.gather(
+            read(self.ctx, [(0, 4, "RAM"), (16, 2, "RAM")]),
+            read(self.ctx, [(16, 2, "RAM")]),
+            read(self.ctx, [(0, 4, "RAM")]),
+            read(self.ctx, [(32, 1, "RAM"), (0, 4, "RAM")]),
+        )
+        self.assertEqual(results, [
+            [bytes(range(4)), bytes([16, 17])],
+            [bytes([16, 17])],
+            [bytes(range(4))],
+            [bytes([32]), bytes(range(4))],
+        ])
+        self.assertEqual(len(self.connector.batches), 1)
+        self.assertEqual([(request["address"], request["size"]) for request in self.connector.batches[0]],
+                         [(0, 4), (16, 2), (32, 1)])
+
+    async def test_guarded_batches_not_merged(self) -> None:
+        """Test that guarded reads are sent on their own, in order with the coalesced reads before and after them."""
+        before, guarded, failed_guard, after = await asyncio.gather(
+            read(self.ctx, [(0, 1, "RAM")]),
+            guarded_read(self.ctx, [(1, 1, "RAM")], [(0, [0], "RAM")]),
+            guarded_read(self.ctx, [(2, 1, "RAM")], [(0, [0xff], "RAM")]),
+            read(self.ctx, [(3, 1, "RAM")]),
+        )
+        self.assertEqual((before, guarded, failed_guard, after), ([b"\x00"], [b"\x01"], None, [b"\x03"]))
+        self.assertEqual(self.request_types(), [["READ"], ["GUARD", "READ"], ["GUARD", "READ"], ["READ"]])
+
+    async def assert_all_failed(self, pending: list[asyncio.Task[Any]]) -> None:
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            self.assertIsInstance(result, RequestFailedError)
+        self.assertEqual(self.ctx.connection_status, ConnectionStatus.NOT_CONNECTED)
+        self.assertFalse(self.ctx._pending or self.ctx._unnumbered or self.ctx._queued_reads)
+
+    def send_unanswered(self) -> list[asyncio.Task[Any]]:
+        self.connector.silent = True
+        return [
+            asyncio.create_task(get_script_version(self.ctx)),
+            asyncio.create_task(ping(self.ctx)),
+            asyncio.create_task(read(self.ctx, [(0, 1, "RAM")])),
+            asyncio.create_task(guarded_read(self.ctx, [(1, 1, "RAM")], [(0, [0], "RAM")])),
+        ]
+
+    async def test_disconnect_fails_pending(self) -> None:
+        """Test that disconnecting fails every request waiting for a reply."""
+        pending = self.send_unanswered()
+        await asyncio.sleep(0.1)
+        disconnect(self.ctx)
+        await self.assert_all_failed(pending)
+
+    async def test_connection_closed_fails_pending(self) -> None:
+        """Test that the connector closing the connection fails every request waiting for a reply."""
+        pending = self.send_unanswered()
+        await asyncio.sleep(0.1)
+        self.connector.close_connections()
+        await self.assert_all_failed(pending)
+
+    async def test_timeout_fails_pending(self) -> None:
+        """Test that a request timing out fails every other request waiting for a reply too."""
+        wait_for = asyncio.wait_for
+
+        async def short_wait_for(awaitable: Any, timeout: float) -> Any:
+            return await wait_for(awaitable, min(timeout, 0.2))
+
+        with mock.patch.object(asyncio, "wait_for", short_wait_for):
+            await self.assert_all_failed(self.send_unanswered())
@@ -1,5 +1,18 @@
+import asyncio
+import copy
+import logging
+import pickle
+import types
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+import zlib
+from unittest import mock
+
+from typing_extensions import override
+
+from MultiServer import Client, Context, SaveJournal, ServerCommandProcessor, encode_send_event, \
+    json_format_send_event, send_items_to, send_new_items
+from NetUtils import Hint, NetworkItem, encode, encode_batch
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +51,144 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestSaveJournal(unittest.TestCase):
+    save: typing.Dict[str, typing.Any]
+
+    @override
+    def setUp(self) -> None:
+        self.save = {
+            "version": 3,
+            "received_items": {(0, 1, True): [NetworkItem(1, 1, 2, 0)]},
+            "location_checks": {(0, 2): {1}},
+            "hints": {},
+            "stored_data": {"counter": 0, "big": list(range(1000))},
+            "random_state": (1, 2, 3),
+        }
+        self.journal = SaveJournal()
+        self.logger = logging.getLogger("SaveJournal")
+        self.data = self.write(set())
+
+    def write(self, changed_stored_data: typing.Set[str]) -> bytes:
+        record, snapshot = self.journal.get_record(self.save, changed_stored_data)
+        if snapshot:
+            self.data = record
+        else:
+            self.data += record
+        return self.data
+
+    def test_replay(self) -> None:
+        """Test that loading a save with appended records gives the latest save."""
+        snapshot_size = len(self.data)
+        self.save["received_items"][0, 1, True].append(NetworkItem(2, 1, 2, 0))
+        self.save["received_items"][0, 2, True] = [NetworkItem(3, 1, 2, 0)]
+        self.save["location_checks"][0, 2] |= {2, 3}
+        self.save["hints"][0, 1] = {Hint(1, 2, 3, 4, False)}
+        self.save["stored_data"]["counter"] = 1
+        self.save["random_state"] = (4, 5, 6)
+        self.write({"counter"})
+        self.assertGreater(len(self.data), snapshot_size)
+        self.assertLess(len(self.data) - snapshot_size, snapshot_size / 2, "big entries got written again")
+        self.save["hints"][0, 1] = {Hint(1, 2, 3, 4, True)}
+        self.write(set())
+        self.assertEqual(SaveJournal.load(self.data, self.logger), self.save)
+
+    def test_compaction(self) -> None:
+        """Test that a new snapshot replaces the appended records once they outgrow the old one."""
+        for value in range(100):
+            self.save["stored_data"]["big"] = list(range(value, value + 1000))
+            self.write({"big"})
+            self.assertLessEqual(len(self.data), 3 * self.journal.snapshot_size)
+            self.assertEqual(SaveJournal.load(self.data, self.logger), self.save)
+
+    def test_incomplete_record(self) -> None:
+        """Test that a partially written record gets ignored, keeping everything before it."""
+        previous = copy.deepcopy(self.save)
+        self.save["stored_data"]["counter"] = 1
+        self.write({"counter"})
+        self.assertEqual(SaveJournal.load(self.data[:-1], self.logger), previous)
+
+    def test_legacy_save(self) -> None:
+        """Test that saves from before the journal can still be loaded."""
+        self.assertEqual(SaveJournal.load(zlib.compress(pickle.dumps(self.save)), self.logger), self.save)
+
+
+class TestItemDelivery(unittest.IsolatedAsyncioTestCase):
+    @override
+    async def asyncSetUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.sent: list[tuple[typing.Any, list[dict[str, typing.Any]]]] = []
+
+        async def send_msgs(endpoint: typing.Any, msgs: typing.Iterable[dict[str, typing.Any]]) -> bool:
+            self.sent.append((endpoint, list(msgs)))
+            return True
+
+        patcher = mock.patch.object(self.ctx, "send_msgs", send_msgs)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.clients = {slot: typing.cast(Client, types.SimpleNamespace(
+            no_items=False, remote_start_inventory=False, remote_items=True, send_index=0)) for slot in (1, 2)}
+        self.ctx.clients = {0: {slot: [client] for slot, client in self.clients.items()}}
+
+    async def test_deliveries_are_merged(self) -> None:
+        """Test that items sent during one event loop tick reach their receivers in one packet each."""
+        for location in range(3):
+            send_items_to(self.ctx, 0, 1, NetworkItem(location, location, 2, 0))
+            send_new_items(self.ctx)
+        self.assertEqual([], self.sent, "items got delivered before the end of the tick")
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        self.assertEqual(1, len(self.sent))
+        client, [packet] = self.sent[0]
+        self.assertIs(self.clients[1], client)
+        self.assertEqual((0, [0, 1, 2]), (packet["index"], [item.item for item in packet["items"]]))
+        self.assertEqual(3, self.clients[1].send_index)
+        self.assertEqual(0, self.clients[2].send_index)
+        self.assertEqual({"packets": 1, "merged": 2}, dict(self.ctx.item_delivery_stats))
+
+        send_items_to(self.ctx, 0, 2, NetworkItem(3, 3, 1, 0))
+        send_new_items(self.ctx)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        self.assertEqual(2, len(self.sent))
+        self.assertIs(self.clients[2], self.sent[1][0])
+
+
+class TestBroadcast(unittest.TestCase):
+    def test_encoded_send_events(self) -> None:
+        """Test that send events encoded one by one and joined are the same as the encoded list of them."""
+        events = [(NetworkItem(item, item + 100, item % 3 + 1, item % 8), item % 4 + 1) for item in range(20)]
+        self.assertEqual(encode([json_format_send_event(*event) for event in events]),
+                         encode_batch(encode_send_event(*event) for event in events))
+
+    def test_send_events_use_dumper(self) -> None:
+        """Test that send events are encoded with an overridden Context.dumper."""
+        dumped: list[list[typing.Any]] = []
+
+        class DumperContext(Context):
+            @staticmethod
+            @override
+            def dumper(obj: typing.Any) -> str:
+                dumped.append(obj)
+                return encode(obj)
+
+        ctx = DumperContext("", 0, "", "", 0, 0, False)
+        event = (NetworkItem(1, 101, 2, 0), 1)
+        self.assertEqual(encode([json_format_send_event(*event)]), ctx.dump_send_events([event]))
+        self.assertEqual(1, len(dumped))
+
+    def test_broadcast_groups(self) -> None:
+        """Test that broadcast groups leave out clients that don't want text, until they get invalidated."""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        clients = [typing.cast(Client, types.SimpleNamespace(auth=True, no_text=no_text)) for no_text in (False, True)]
+        ctx.endpoints = [*clients, typing.cast(Client, types.SimpleNamespace(auth=False, no_text=False))]
+        ctx.clients = {0: {1: clients[:1]}, 1: {1: clients[1:]}}
+        self.assertEqual((clients[0],), ctx.get_broadcast_group(None, True))
+        self.assertEqual(tuple(clients), ctx.get_broadcast_group(None, False))
+        self.assertEqual((), ctx.get_broadcast_group(1, True))
+        self.assertEqual((clients[1],), ctx.get_broadcast_group(1, False))
+        clients[1].no_text = False
+        self.assertEqual((), ctx.get_broadcast_group(1, True))
+        ctx.invalidate_broadcast_groups()
+        self.assertEqual((clients[1],), ctx.get_broadcast_group(1, True))
@@ -0,0 +1,28 @@
+import unittest
+
+from Utils import FuzzyMatcher, get_fuzzy_results, get_intended_text
+
+
+class TestFuzzyMatcher(unittest.TestCase):
+    words = ["Progressive Sword", "Progressive Shield", "progressive sword", "Sword", "Swords", "Bow", "Bows",
+             "Silver Arrows", "Arrows", "Arrow Upgrade", "Master Sword", "İnverted Sword", "", "Wsord"]
+    inputs = ["Progressive Sword", "progressive sword", "PROGRESSIVE SWORD", "Progresive Sword", "Sowrd", "sword",
+              "Bow", "arow", "İnverted", "x", "", "Something else entirely"]
+
+    def test_matches_get_fuzzy_results(self) -> None:
+        """Test that the index gives the same results as searching the plain word list, including the order of ties."""
+        matcher = FuzzyMatcher(self.words)
+        for input_word in self.inputs:
+            for limit in (None, 1, 2, 3, len(self.words)):
+                with self.subTest(input_word=input_word, limit=limit):
+                    self.assertEqual(matcher.get_results(input_word, limit),
+                                     get_fuzzy_results(input_word, self.words, limit))
+                    self.assertEqual(get_fuzzy_results(input_word, matcher, limit),
+                                     get_fuzzy_results(input_word, self.words, limit))
+
+    def test_intended_text(self) -> None:
+        """Test that get_intended_text accepts an index in place of the possible answers."""
+        matcher = FuzzyMatcher(self.words)
+        for input_word in self.inputs:
+            with self.subTest(input_word=input_word):
+                self.assertEqual(get_intended_text(input_word, matcher), get_intended_text(input_word, self.words))
@@ -0,0 +1,70 @@
+import typing
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+from . import TestBase
+
+
+class RecordingLoop:
+    calls: typing.List[typing.Tuple[typing.Any, str]]
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def call_soon_threadsafe(self, callback: typing.Any, text: str) -> None:
+        self.calls.append((callback, text))
+
+
+class TestDBCommandDispatcher(TestBase):
+    room_ids: typing.List[UUID]
+
+    def setUp(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room, Seed
+
+        super().setUp()
+        with db_session:
+            owner = uuid4()
+            seed = Seed(multidata=b"", owner=owner)
+            self.room_ids = [Room(seed=seed, owner=owner, tracker=uuid4()).id for _ in range(3)]
+
+    def tearDown(self) -> None:
+        from pony.orm import db_session, select
+        from WebHostLib.models import Command, Room
+
+        with db_session:
+            select(command for command in Command if command.room.id in self.room_ids).delete(bulk=True)
+            for room_id in self.room_ids:
+                room = Room.get(id=room_id)
+                seed = room.seed
+                room.delete()
+            seed.delete()
+
+    def test_dispatch(self) -> None:
+        """Test that commands of registered rooms are delivered in order and removed, and others are left alone."""
+        from pony.orm import count, db_session
+        from WebHostLib.customserver import DBCommandDispatcher
+        from WebHostLib.models import Command, Room
+
+        dispatcher = DBCommandDispatcher()
+        dispatcher.batch_size = 1
+        contexts = [SimpleNamespace(room_id=room_id, main_loop=RecordingLoop()) for room_id in self.room_ids]
+        for ctx in contexts[:2]:
+            dispatcher.register(ctx)
+        with db_session:
+            for index, room_id in enumerate(self.room_ids * 2):
+                Command(room=Room.get(id=room_id), commandtext=f"/command {index}")
+
+        dispatcher.dispatch()
+        for index, ctx in enumerate(contexts[:2]):
+            self.assertEqual([text for _, text in ctx.main_loop.calls], [f"/command {index}", f"/command {index + 3}"])
+            self.assertIs(ctx.main_loop.calls[0][0].ctx, ctx)
+        self.assertEqual(contexts[2].main_loop.calls, [])
+        with db_session:
+            self.assertEqual(count(command for command in Command if command.room.id in self.room_ids), 2)
+
+        dispatcher.unregister(self.room_ids[0])
+        dispatcher.register(contexts[2])
+        dispatcher.dispatch()
+        self.assertEqual([text for _, text in contexts[2].main_loop.calls], ["/command 2", "/command 5"])
+        self.assertEqual(len(contexts[0].main_loop.calls), 2)
@@ -0,0 +1,69 @@
+import pickle
+
+from . import TestBase
+
+
+class TestMultidataCache(TestBase):
+    def test_game_data_package(self) -> None:
+        """Test that data packages are decoded once, shared and evicted least recently used first."""
+        from pony.orm import db_session
+        from WebHostLib.models import GameDataPackage
+        from WebHostLib.multidata import MultidataCache
+
+        packages = {
+            f"checksum {index}": {"item_name_to_id": {f"Item {index}": index},
+                                  "location_name_to_id": {f"Location {index}": index}}
+            for index in range(3)
+        }
+        with db_session:
+            for checksum, package in packages.items():
+                GameDataPackage(checksum=checksum, data=pickle.dumps(package))
+            size = len(pickle.dumps(packages["checksum 0"]))
+            cache = MultidataCache(max_size=2 * size)
+
+            first = cache.get_game_data_package("checksum 0")
+            self.assertEqual(first, packages["checksum 0"])
+            self.assertIs(cache.get_game_data_package("checksum 0"), first)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertIsNone(cache.get_game_data_package("missing"))
+
+            cache.get_game_data_package("checksum 1")
+            cache.get_game_data_package("checksum 0")
+            cache.get_game_data_package("checksum 2")
+            self.assertEqual(cache.size, 2 * size)
+            # checksum 1 was the least recently used and got evicted
+            self.assertIs(cache.get_game_data_package("checksum 0"), first)
+            misses = cache.misses
+            cache.get_game_data_package("checksum 1")
+            self.assertEqual(cache.misses, misses + 1)
+
+            names = cache.get_game_names("checksum 2")
+            self.assertEqual(names.item_id_to_name, {2: "Item 2"})
+            self.assertEqual(names.location_id_to_name, {2: "Location 2"})
+
+    def test_multidata(self) -> None:
+        """Test that multidata is decoded once per seed, also when the seed is looked up again in another session."""
+        from unittest import mock
+        from uuid import uuid4
+        from zlib import compress
+
+        from pony.orm import commit, db_session
+        from MultiServer import Context
+        from WebHostLib.models import Seed
+        from WebHostLib.multidata import MultidataCache
+
+        cache = MultidataCache()
+        with mock.patch.object(Context, "decompress", wraps=Context.decompress) as decompress:
+            with db_session:
+                seed = Seed(multidata=bytes([3]) + compress(pickle.dumps({"version": 1})), owner=uuid4())
+                other_seed = Seed(multidata=bytes([3]) + compress(pickle.dumps({"version": 2})), owner=uuid4())
+                commit()
+                first = cache.get_multidata(seed)
+                self.assertEqual(first, {"version": 1})
+                self.assertEqual(cache.get_multidata(other_seed), {"version": 2})
+            with db_session:
+                self.assertIs(cache.get_multidata(Seed.get(id=seed.id)), first)
+                Seed.get(id=seed.id).delete()
+                Seed.get(id=other_seed.id).delete()
+        self.assertEqual(decompress.call_count, 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
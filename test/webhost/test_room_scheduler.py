@@ -0,0 +1,87 @@
+import datetime
+import time
+import typing
+from uuid import UUID, uuid4
+
+from . import TestBase
+
+
+class TestRoomScheduler(TestBase):
+    room_ids: typing.List[UUID]
+
+    def setUp(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.autolauncher import MultiworldInstance, RoomScheduler
+        from WebHostLib.models import Room, Seed
+
+        super().setUp()
+        self.hosters = [MultiworldInstance(self.app.config, hoster_id) for hoster_id in range(2)]
+        self.scheduler = RoomScheduler(self.hosters)
+        with db_session:
+            owner = uuid4()
+            seed = Seed(multidata=b"", owner=owner)
+            inactive = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
+            self.room_ids = [Room(seed=seed, owner=owner, tracker=uuid4()).id,
+                             Room(seed=seed, owner=owner, tracker=uuid4()).id,
+                             Room(seed=seed, owner=owner, tracker=uuid4(), timeout=60, last_activity=inactive).id]
+
+    def tearDown(self) -> None:
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+
+        with db_session:
+            for room_id in self.room_ids:
+                room = Room.get(id=room_id)
+                seed = room.seed
+                room.delete()
+            seed.delete()
+
+    def poll(self) -> None:
+        from pony.orm import db_session
+
+        with db_session:
+            self.scheduler.poll()
+
+    def test_start_rooms(self) -> None:
+        """Test that active rooms are started once and inactive rooms are not."""
+        self.poll()
+        active, other_active, inactive = self.room_ids
+        self.assertIn(active, self.scheduler.hosted)
+        self.assertIn(other_active, self.scheduler.hosted)
+        self.assertNotIn(inactive, self.scheduler.hosted)
+        hoster = self.scheduler.hosted[active]
+        self.assertIn(active, hoster.room_ids)
+
+        hosted = dict(self.scheduler.hosted)
+        self.poll()
+        self.assertEqual(self.scheduler.hosted, hosted)
+        self.assertEqual(sum(len(hoster.room_ids) for hoster in self.hosters), len(hosted))
+
+    def test_least_loaded_hoster(self) -> None:
+        """Test that rooms, clients and memory all count towards the load of a hoster."""
+        self.assertIs(self.scheduler.get_least_loaded_hoster(), self.hosters[0])
+        self.hosters[0].connected_clients.value = 10
+        self.assertIs(self.scheduler.get_least_loaded_hoster(), self.hosters[1])
+        self.hosters[1].room_ids.add(uuid4())
+        self.hosters[1].memory_usage.value = 1024
+        self.assertIs(self.scheduler.get_least_loaded_hoster(), self.hosters[0])
+
+    def test_restart_after_shutdown(self) -> None:
+        """Test that a room that shut down is started again if it has seen activity since."""
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+
+        active = self.room_ids[0]
+        self.poll()
+        started = self.scheduler.started
+        hoster = self.scheduler.hosted[active]
+        with db_session:
+            Room.get(id=active).last_activity = datetime.datetime.utcnow()
+        hoster.rooms_shutting_down.put(active)
+        for _ in range(100):
+            self.poll()
+            if self.scheduler.started > started:
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.scheduler.started, started + 1)
+        self.assertIn(active, self.scheduler.hosted)
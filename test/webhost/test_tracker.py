@@ -103,3 +103,92 @@ class TestTracker(TestBase):
                 self.assertEqual(response.status_code, 200)
             with self.client.open(url_for("api.tracker_slot_data", tracker=self.tracker_uuid)) as response:
                 self.assertEqual(response.status_code, 200)
+
+    @staticmethod
+    def make_save() -> dict:
+        from NetUtils import ClientStatus, Hint, NetworkItem
+
+        return {
+            "received_items": {(0, 1, True): [NetworkItem(1, 2, 1, 0)], (0, 1, False): []},
+            "location_checks": {(0, 1): {2}},
+            "hints": {(0, 1): {Hint(1, 1, 2, 1, False)}},
+            "client_game_state": {(0, 1): ClientStatus.CLIENT_PLAYING},
+            "name_aliases": {(0, 1): "Alias"},
+            "client_activity_timers": (((0, 1), 1700000000.0),),
+            "client_connection_timers": (((0, 1), 1600000000.0),),
+            "video": [((0, 1), ("Twitch", "someone"))],
+        }
+
+    def test_tracker_slots(self) -> None:
+        """Verify that trackers read the same from the tracker slots saved by the room as from an older multisave."""
+        from pony.orm import db_session
+        from NetUtils import ClientStatus, Hint, NetworkItem
+        from WebHostLib.customserver import WebHostContext
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData
+
+        save = self.make_save()
+        with db_session:
+            room = Room.get(id=self.room_id)
+            room.multisave = pickle.dumps(save)
+            from_multisave = TrackerData(room)
+            ctx = WebHostContext.__new__(WebHostContext)
+            ctx.tracker_slot_signatures = {}
+            ctx._save_tracker_slots(room, save)
+            room.multisave = pickle.dumps({})
+            from_snapshot = TrackerData(room)
+
+            for tracker_data in (from_multisave, from_snapshot):
+                self.assertEqual(tracker_data.get_player_received_items(0, 1), [NetworkItem(1, 2, 1, 0)])
+                self.assertEqual(tracker_data.get_player_checked_locations(0, 1), {2})
+                self.assertEqual(tracker_data.get_player_hints(0, 1), {Hint(1, 1, 2, 1, False)})
+                self.assertEqual(tracker_data.get_player_client_status(0, 1), ClientStatus.CLIENT_PLAYING)
+                self.assertEqual(tracker_data.get_player_alias(0, 1), "Alias")
+                self.assertEqual(tracker_data.get_player_activity_time(0, 1).timestamp(), 1700000000.0)
+                self.assertEqual(tracker_data.get_player_connection_time(0, 1).timestamp(), 1600000000.0)
+                self.assertIsNone(tracker_data.get_player_connection_time(0, 2))
+                self.assertEqual(tracker_data.get_room_videos(), {(0, 1): ("Twitch", "someone")})
+
+    def test_sphere_tracker_pages(self) -> None:
+        """Verify that the sphere tracker shows the first page by default and rejects pages past the last one."""
+        with self.app.test_request_context():
+            with self.client.open(url_for("get_multiworld_sphere_tracker", tracker=self.tracker_uuid)) as response:
+                self.assertEqual(response.status_code, 200)
+            with self.client.open(url_for("get_multiworld_sphere_tracker", tracker=self.tracker_uuid,
+                                          page=1)) as response:
+                self.assertEqual(response.status_code, 200)
+            with self.client.open(url_for("get_multiworld_sphere_tracker", tracker=self.tracker_uuid,
+                                          page=2)) as response:
+                self.assertEqual(response.status_code, 404)
+
+    def test_tracker_slots_deltas(self) -> None:
+        """Verify that the room only writes the tracker slots that changed since its last save."""
+        from pony.orm import db_session
+        from NetUtils import Hint, NetworkItem
+        from WebHostLib.customserver import WebHostContext
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData
+
+        save = self.make_save()
+        save["location_checks"][0, 2] = {3}
+        ctx = WebHostContext.__new__(WebHostContext)
+        ctx.tracker_slot_signatures = {}
+        with db_session:
+            room = Room.get(id=self.room_id)
+            signatures = ctx._save_tracker_slots(room, save)
+            self.assertEqual(signatures.keys(), {(0, 1), (0, 2)})
+            ctx.tracker_slot_signatures.update(signatures)
+            self.assertEqual(ctx._save_tracker_slots(room, save), {})
+
+            save["received_items"][0, 1, True].append(NetworkItem(3, 3, 2, 0))
+            save["hints"][0, 1] = {Hint(1, 1, 2, 1, True)}
+            self.assertEqual(ctx._save_tracker_slots(room, save).keys(), {(0, 1)})
+            save["location_checks"][0, 2].add(4)
+            del save["name_aliases"][0, 1]
+            self.assertEqual(ctx._save_tracker_slots(room, save).keys(), {(0, 1), (0, 2)})
+
+            tracker_data = TrackerData(room)
+            self.assertEqual(len(tracker_data.get_player_received_items(0, 1)), 2)
+            self.assertEqual(tracker_data.get_player_hints(0, 1), {Hint(1, 1, 2, 1, True)})
+            self.assertEqual(tracker_data.get_player_checked_locations(0, 2), {3, 4})
+            self.assertIsNone(tracker_data.get_player_alias(0, 1))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
 import logging
+import multiprocessing
 import pathlib
 import sys
+import threading
 import time
 from random import Random
 from dataclasses import make_dataclass
@@ -204,6 +207,45 @@ def call_all(multiworld: "MultiWorld", method_name: str, *args: Any) -> None:
     call_stage(multiworld, method_name, *args)
 
 
+_precompute_multiworld: Optional["MultiWorld"] = None
+"""MultiWorld inherited by forked precompute workers"""
+
+
+def _call_precompute_in_worker(player: int, seed: int) -> Any:
+    assert _precompute_multiworld, "precompute workers have to be forked from call_precompute"
+    return call_single(_precompute_multiworld, "precompute", player, Random(seed))
+
+
+def call_precompute(multiworld: "MultiWorld", workers: int = 1) -> None:
+    """
+    Runs World.precompute for every player whose world implements it, and stores the results in World.precomputed.
+    With more than one worker, the players are split over that many forked processes, if the platform can fork and no
+    other threads are running, as those would not be forked along and could leave locks held in the workers.
+    """
+    global _precompute_multiworld
+    call_stage(multiworld, "precompute")
+    # seeds are drawn in player order either way, so the results do not depend on the amount of workers
+    seeds = {player: multiworld.worlds[player].random.getrandbits(64) for player in multiworld.player_ids
+             if multiworld.worlds[player].__class__.precompute is not World.precompute}
+    can_fork = "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+    if workers > 1 and len(seeds) > 1 and can_fork:
+        _precompute_multiworld = multiworld
+        try:
+            with concurrent.futures.ProcessPoolExecutor(min(workers, len(seeds)),
+                                                        multiprocessing.get_context("fork")) as pool:
+                futures = {player: pool.submit(_call_precompute_in_worker, player, seed)
+                           for player, seed in seeds.items()}
+                for player, future in futures.items():
+                    multiworld.worlds[player].precomputed = future.result()
+        finally:
+            _precompute_multiworld = None
+    else:
+        if workers > 1 and len(seeds) > 1:
+            logging.info("Can't fork safely, running precompute in the main process.")
+        for player, seed in seeds.items():
+            multiworld.worlds[player].precomputed = call_single(multiworld, "precompute", player, Random(seed))
+
+
 def call_stage(multiworld: "MultiWorld", method_name: str, *args: Any) -> None:
     world_types = {multiworld.worlds[player].__class__ for player in multiworld.player_ids}
     for world_type in sorted(world_types, key=lambda world: world.__name__):
@@ -314,6 +356,15 @@ class World(metaclass=AutoWorldRegister):
     If False, everything is rechecked at every step, which is slower computationally, 
     but may be desirable in complex/dynamic worlds."""
 
+    incremental_reachability: bool = False
+    """If True, CollectionState records which items and regions each failed Entrance access rule read,
+    and after a collect only re-tests the entrances affected by the items that changed.
+    This makes explicit_indirect_conditions unnecessary, but requires that the world's entrance rules only depend on
+    this player's items and regions, and that state is only modified through
+    CollectionState.add_item, remove_item and set_item, as World.collect and World.remove do.
+    Sweeps over locations then also only re-test this world's locations once an item or region their access rule read
+    changed, which requires location rules to only depend on the items and regions of any player."""
+
     multiworld: "MultiWorld"
     """autoset on creation. The MultiWorld object for the currently generating multiworld."""
     player: int
@@ -343,6 +394,8 @@ class World(metaclass=AutoWorldRegister):
     """path it was loaded from"""
     world_version: ClassVar[Version] = Version(0, 0, 0)
     """Optional world version loaded from archipelago.json"""
+    precomputed: Any = None
+    """result of precompute, available from generate_early onward"""
 
     def __init__(self, multiworld: "MultiWorld", player: int):
         assert multiworld is not None
@@ -369,6 +422,23 @@ class World(metaclass=AutoWorldRegister):
         """
         pass
 
+    def precompute(self, random: Random) -> Any:
+        """
+        Optional method for expensive work of this player that only depends on its options, such as searching for a
+        valid layout. Runs right before generate_early, in a worker process if the generator was started with more than
+        one worker, so any changes it makes to the World or MultiWorld are lost. Instead, return a picklable result,
+        which ends up in self.precomputed. Use the passed random instead of self.random.
+        """
+        return None
+
+    @classmethod
+    def stage_precompute(cls, multiworld: "MultiWorld") -> None:
+        """
+        Runs once per present world type in the main process before precompute, so workers inherit what it sets up,
+        such as loaded data files.
+        """
+        pass
+
     def generate_early(self) -> None:
         """
         Run before any general steps of the MultiWorld other than options. Useful for getting and adjusting option
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import abc
 import json
+import struct
 import zipfile
 from enum import IntEnum
 import os
@@ -265,6 +266,7 @@ class APProcedurePatch(APAutoPatchInterface):
     hash: Optional[str]  # base checksum of source file
     source_data: bytes
     files: Dict[str, bytes]
+    _unread_files: Dict[str, str]  # files only read from the container at this path once they are needed
 
     @classmethod
     def get_source_data(cls) -> bytes:
@@ -280,6 +282,7 @@ class APProcedurePatch(APAutoPatchInterface):
     def __init__(self, *args: Any, **kwargs: Any):
         super(APProcedurePatch, self).__init__(*args, **kwargs)
         self.files = {}
+        self._unread_files = {}
 
     def get_manifest(self) -> Dict[str, Any]:
         manifest = super(APProcedurePatch, self).get_manifest()
@@ -297,32 +300,57 @@ class APProcedurePatch(APAutoPatchInterface):
             self.procedure = [("apply_bsdiff4", ["delta.bsdiff4"])]
         else:
             self.procedure = manifest["procedure"]
+        # a container on disk can be opened again, so its files are only read once they're needed
+        container_path = opened_zipfile.filename
+        lazy = isinstance(container_path, str) and os.path.isfile(container_path)
         for file in opened_zipfile.namelist():
             if file not in ["archipelago.json"]:
-                self.files[file] = opened_zipfile.read(file)
+                if lazy:
+                    self.files.pop(file, None)
+                    self._unread_files[file] = container_path
+                else:
+                    self.files[file] = opened_zipfile.read(file)
         return manifest
 
+    def write(self, file: Optional[Union[str, BinaryIO]] = None) -> None:
+        # the container the unread files are in may be the one about to be overwritten
+        self._read_unread_files()
+        super(APProcedurePatch, self).write(file)
+
     def write_contents(self, opened_zipfile: zipfile.ZipFile) -> None:
         super(APProcedurePatch, self).write_contents(opened_zipfile)
+        self._read_unread_files()
         for file in self.files:
             opened_zipfile.writestr(file, self.files[file],
                                     compress_type=zipfile.ZIP_STORED if file.endswith(".bsdiff4") else None)
 
+    def _read_unread_files(self) -> None:
+        for file in list(self._unread_files):
+            self.get_file(file)
+
     def get_file(self, file: str) -> bytes:
         """ Retrieves a file from the patch container."""
-        if file not in self.files:
+        if file not in self.files and file not in self._unread_files:
             self.read()
+        if file in self._unread_files:
+            with zipfile.ZipFile(self._unread_files.pop(file), "r") as zf:
+                self.files[file] = zf.read(file)
         return self.files[file]
 
     def write_file(self, file_name: str, file: bytes) -> None:
         """ Writes a file to the patch container, to be retrieved upon patching. """
         self.files[file_name] = file
+        self._unread_files.pop(file_name, None)
 
     def patch(self, target: str) -> None:
         self.read()
-        base_data = self.get_source_data_with_cache()
+        base_data: Union[bytes, bytearray] = self.get_source_data_with_cache()
         patch_extender = AutoPatchExtensionRegister.get_handler(self.game)
         assert not isinstance(self.procedure, str), f"{type(self)} must define procedures"
+        # the steps of APPatchExtension itself change a bytearray in place instead of copying it for every step,
+        # but any other extension is handed bytes, as it always was
+        in_place_steps = (APPatchExtension.apply_bsdiff4, APPatchExtension.apply_tokens, APPatchExtension.calc_snes_crc)
+        in_place = False
         for step, args in self.procedure:
             if isinstance(patch_extender, list):
                 extension = next((item for item in [getattr(extender, step, None) for extender in patch_extender]
@@ -330,7 +358,10 @@ class APProcedurePatch(APAutoPatchInterface):
             else:
                 extension = getattr(patch_extender, step, None)
             if extension is not None:
+                if in_place and extension not in in_place_steps:
+                    base_data = bytes(base_data)
                 base_data = extension(self, base_data, *args)
+                in_place = extension in in_place_steps
             else:
                 raise NotImplementedError(f"Unknown procedure {step} for {self.game}.")
         with open(target, 'wb') as f:
@@ -433,6 +464,12 @@ class APTokenMixin:
         self._tokens.append((token_type, offset, data))
 
 
+_token_count = struct.Struct("<I")
+_token_header = struct.Struct("<BII")  # type, offset, size of the data following it
+_bitwise_tokens = frozenset((APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8))
+_range_tokens = frozenset((APTokenTypes.COPY, APTokenTypes.RLE))
+
+
 class APPatchExtension(metaclass=AutoPatchExtensionRegister):
     """Class that defines patch extension functions for a given game.
     Patch extension functions must have the following two arguments in the following order:
@@ -444,54 +481,59 @@ class APPatchExtension(metaclass=AutoPatchExtensionRegister):
     Further arguments are passed in from the procedure as defined.
 
     Patch extension functions must return the changed bytes.
+    The functions defined here also accept a bytearray, which APProcedurePatch.patch passes between them.
+    apply_tokens and calc_snes_crc change such a bytearray in place and return it instead of a copy, so pass bytes or a
+    copy if the original data is still needed.
     """
     game: str
     required_extensions: ClassVar[Tuple[str, ...]] = ()
 
     @staticmethod
-    def apply_bsdiff4(caller: APProcedurePatch, rom: bytes, patch: str) -> bytes:
+    def apply_bsdiff4(caller: APProcedurePatch, rom: Union[bytes, bytearray], patch: str) -> bytes:
         """Applies the given bsdiff4 from the patch onto the current file."""
-        return bsdiff4.patch(rom, caller.get_file(patch))
+        # bsdiff4 only takes immutable source data
+        return bsdiff4.patch(bytes(rom) if isinstance(rom, bytearray) else rom, caller.get_file(patch))
 
     @staticmethod
-    def apply_tokens(caller: APProcedurePatch, rom: bytes, token_file: str) -> bytes:
+    def apply_tokens(caller: APProcedurePatch, rom: Union[bytes, bytearray], token_file: str) -> bytearray:
         """Applies the given token file from the patch onto the current file."""
-        token_data = caller.get_file(token_file)
-        rom_data = bytearray(rom)
-        token_count = int.from_bytes(token_data[0:4], "little")
+        token_data = memoryview(caller.get_file(token_file))
+        rom_data = rom if isinstance(rom, bytearray) else bytearray(rom)
+        token_count, = _token_count.unpack_from(token_data)
+        read_header = _token_header.unpack_from
         bpr = 4
         for _ in range(token_count):
-            token_type = token_data[bpr:bpr + 1][0]
-            offset = int.from_bytes(token_data[bpr + 1:bpr + 5], "little")
-            size = int.from_bytes(token_data[bpr + 5:bpr + 9], "little")
-            data = token_data[bpr + 9:bpr + 9 + size]
-            if token_type in [APTokenTypes.AND_8, APTokenTypes.OR_8, APTokenTypes.XOR_8]:
-                arg = data[0]
+            token_type, offset, size = read_header(token_data, bpr)
+            bpr += 9
+            if token_type in _bitwise_tokens:
+                arg = token_data[bpr]
                 if token_type == APTokenTypes.AND_8:
-                    rom_data[offset] = rom_data[offset] & arg
+                    rom_data[offset] &= arg
                 elif token_type == APTokenTypes.OR_8:
-                    rom_data[offset] = rom_data[offset] | arg
+                    rom_data[offset] |= arg
                 else:
-                    rom_data[offset] = rom_data[offset] ^ arg
-            elif token_type in [APTokenTypes.COPY, APTokenTypes.RLE]:
-                length = int.from_bytes(data[:4], "little")
-                value = int.from_bytes(data[4:], "little")
+                    rom_data[offset] ^= arg
+            elif token_type in _range_tokens:
+                length, = _token_count.unpack_from(token_data, bpr)
+                value = int.from_bytes(token_data[bpr + 4:bpr + size], "little")
                 if token_type == APTokenTypes.COPY:
                     rom_data[offset: offset + length] = rom_data[value: value + length]
                 else:
-                    rom_data[offset: offset + length] = bytes([value] * length)
+                    rom_data[offset: offset + length] = bytes((value,)) * length
             else:
+                # a memoryview slice, so the data isn't copied before it's written
+                data = token_data[bpr:bpr + size]
                 rom_data[offset:offset + len(data)] = data
-            bpr += 9 + size
-        return bytes(rom_data)
+            bpr += size
+        return rom_data
 
     @staticmethod
-    def calc_snes_crc(caller: APProcedurePatch, rom: bytes) -> bytes:
+    def calc_snes_crc(caller: APProcedurePatch, rom: Union[bytes, bytearray]) -> bytearray:
         """Calculates and applies a valid CRC for the SNES rom header."""
-        rom_data = bytearray(rom)
+        rom_data = rom if isinstance(rom, bytearray) else bytearray(rom)
         if len(rom) < 0x8000:
             raise Exception("Tried to calculate SNES CRC on file too small to be a SNES ROM.")
-        crc = (sum(rom_data[:0x7FDC] + rom_data[0x7FE0:]) + 0x01FE) & 0xFFFF
+        crc = (sum(rom_data) - sum(rom_data[0x7FDC:0x7FE0]) + 0x01FE) & 0xFFFF
         inv = crc ^ 0xFFFF
         rom_data[0x7FDC:0x7FE0] = [inv & 0xFF, (inv >> 8) & 0xFF, crc & 0xFF, (crc >> 8) & 0xFF]
-        return bytes(rom_data)
+        return rom_data
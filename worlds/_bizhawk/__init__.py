@@ -7,6 +7,7 @@ naively passed to BizHawk without validation or modification.
 
 import asyncio
 import base64
+import collections
 import enum
 import json
 import sys
@@ -46,47 +47,175 @@ class SyncError(Exception):
 class BizHawkContext:
     streams: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None
     connection_status: ConnectionStatus
-    _lock: asyncio.Lock
     _port: int | None
+    _reader_task: asyncio.Task[None] | None
+    _next_id: int
+    _pending: dict[int, asyncio.Future[list[dict[str, Any]]]]
+    """Batches of requests that were sent and are waiting for their response, by id"""
+    _unnumbered: collections.deque[asyncio.Future[str]]
+    """Messages without an id, like `VERSION`, which are answered in the order they were sent"""
+    _queued_reads: list[tuple[list[dict[str, Any]], asyncio.Future[list[dict[str, Any]]]]]
+    """Reads waiting to be sent together in the next batch"""
 
     def __init__(self) -> None:
         self.streams = None
         self.connection_status = ConnectionStatus.NOT_CONNECTED
-        self._lock = asyncio.Lock()
         self._port = None
-
-    async def _send_message(self, message: str):
-        async with self._lock:
-            if self.streams is None:
-                raise NotConnectedError("You tried to send a request before a connection to BizHawk was made")
-
-            try:
-                reader, writer = self.streams
-                writer.write(message.encode("utf-8") + b"\n")
-                await asyncio.wait_for(writer.drain(), timeout=5)
-
-                res = await asyncio.wait_for(reader.readline(), timeout=5)
+        self._reader_task = None
+        self._next_id = 0
+        self._pending = {}
+        self._unnumbered = collections.deque()
+        self._queued_reads = []
+
+    async def _send_message(self, message: str) -> str:
+        """Sends a message without an id, like `VERSION`, and returns the line the connector answers it with"""
+        self._check_connected()
+        reply: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._unnumbered.append(reply)
+        return await self._wait(self._write(message), reply)
+
+    async def _send_requests(self, requests: list[dict[str, Any]], coalesce: bool = False) -> list[dict[str, Any]]:
+        """Sends a batch of requests and returns their responses without waiting for other batches in flight.
+
+        If `coalesce` is set, the batch is held back until the event loop gets around to it and is then sent together
+        with every other coalesced batch queued until then. Only use this for requests which may be reordered among
+        each other and don't affect the rest of the batch, like unguarded reads."""
+        self._check_connected()
+        if coalesce:
+            reply: asyncio.Future[list[dict[str, Any]]] = asyncio.get_running_loop().create_future()
+            if not self._queued_reads:
+                asyncio.get_running_loop().call_soon(self._flush_reads)
+            self._queued_reads.append((requests, reply))
+            return await self._wait(self.streams, reply)
+
+        # anything queued earlier has to be sent first, so the connector executes requests in the order they were made
+        self._flush_reads()
+        request_id, reply = self._register()
+        return await self._wait(self._write(json.dumps({"id": request_id, "requests": requests})), reply)
+
+    def _check_connected(self) -> None:
+        if self.streams is None:
+            raise NotConnectedError("You tried to send a request before a connection to BizHawk was made")
+
+    def _register(self) -> tuple[int, asyncio.Future[list[dict[str, Any]]]]:
+        request_id = self._next_id
+        self._next_id += 1
+        reply: asyncio.Future[list[dict[str, Any]]] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = reply
+        return request_id, reply
+
+    def _flush_reads(self) -> None:
+        """Sends every queued coalesced batch as a single batch, reading addresses requested more than once only once"""
+        if not self._queued_reads:
+            return
+        queued_reads, self._queued_reads = self._queued_reads, []
+
+        requests: list[dict[str, Any]] = []
+        indices: dict[tuple[Any, ...], int] = {}
+        batches: list[tuple[list[int], asyncio.Future[list[dict[str, Any]]]]] = []
+        for batch, reply in queued_reads:
+            batch_indices: list[int] = []
+            for request in batch:
+                key = tuple(sorted(request.items()))
+                if key not in indices:
+                    indices[key] = len(requests)
+                    requests.append(request)
+                batch_indices.append(indices[key])
+            batches.append((batch_indices, reply))
+
+        request_id, combined_reply = self._register()
+
+        def split(future: asyncio.Future[list[dict[str, Any]]]) -> None:
+            exc = None if future.cancelled() else future.exception()
+            for batch_indices, reply in batches:
+                if reply.done():
+                    continue
+                if future.cancelled():
+                    reply.cancel()
+                elif exc is not None:
+                    reply.set_exception(exc)
+                else:
+                    responses = future.result()
+                    reply.set_result([responses[index] for index in batch_indices])
+
+        combined_reply.add_done_callback(split)
+        self._write(json.dumps({"id": request_id, "requests": requests}))
+
+    def _write(self, message: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Writes a message whose reply was already registered. Messages are sent in the order this is called."""
+        streams = self.streams
+        assert streams is not None
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._receive(streams), name="BizHawkReceive")
+        streams[1].write(message.encode("utf-8") + b"\n")
+        return streams
+
+    async def _wait(self, streams: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None,
+                    reply: asyncio.Future[Any]) -> Any:
+        """Waits for the reply to a message written to streams"""
+        assert streams is not None
+        try:
+            await asyncio.wait_for(streams[1].drain(), timeout=5)
+            return await asyncio.wait_for(reply, timeout=5)
+        except asyncio.TimeoutError as exc:
+            self._close(streams, RequestFailedError("Connection timed out"))
+            raise RequestFailedError("Connection timed out") from exc
+        except ConnectionResetError as exc:
+            self._close(streams, RequestFailedError("Connection reset"))
+            raise RequestFailedError("Connection reset") from exc
+
+    async def _receive(self, streams: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        """Matches each line the connector sends to the message it answers, until the connection is closed"""
+        try:
+            while True:
+                res = await streams[0].readline()
 
                 if res == b"":
-                    writer.close()
-                    self.streams = None
-                    self.connection_status = ConnectionStatus.NOT_CONNECTED
                     raise RequestFailedError("Connection closed")
 
                 if self.connection_status == ConnectionStatus.TENTATIVE:
                     self.connection_status = ConnectionStatus.CONNECTED
 
-                return res.decode("utf-8")
-            except asyncio.TimeoutError as exc:
-                writer.close()
-                self.streams = None
-                self.connection_status = ConnectionStatus.NOT_CONNECTED
-                raise RequestFailedError("Connection timed out") from exc
-            except ConnectionResetError as exc:
-                writer.close()
-                self.streams = None
-                self.connection_status = ConnectionStatus.NOT_CONNECTED
-                raise RequestFailedError("Connection reset") from exc
+                if res.startswith(b"{"):
+                    response = json.loads(res)
+                    reply = self._pending.pop(response["id"], None)
+                    if reply is not None and not reply.done():
+                        reply.set_result(response["responses"])
+                elif self._unnumbered:
+                    unnumbered_reply = self._unnumbered.popleft()
+                    if not unnumbered_reply.done():
+                        unnumbered_reply.set_result(res.decode("utf-8"))
+        except RequestFailedError as exc:
+            self._close(streams, exc)
+        except ConnectionResetError as exc:
+            failure = RequestFailedError("Connection reset")
+            failure.__cause__ = exc
+            self._close(streams, failure)
+
+    def _close(self, streams: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None,
+               exc: Exception | None = None) -> None:
+        """Closes the connection and fails everything still waiting on a reply from it"""
+        if streams is not self.streams:
+            # a failure of a connection that was already replaced
+            return
+        if self.streams is not None:
+            self.streams[1].close()
+            self.streams = None
+        self.connection_status = ConnectionStatus.NOT_CONNECTED
+
+        if self._reader_task is not None:
+            if self._reader_task is not asyncio.current_task():
+                self._reader_task.cancel()
+            self._reader_task = None
+
+        replies: list[asyncio.Future[Any]] = [*self._pending.values(), *self._unnumbered,
+                                              *(reply for _, reply in self._queued_reads)]
+        self._pending.clear()
+        self._unnumbered.clear()
+        self._queued_reads.clear()
+        for reply in replies:
+            if not reply.done():
+                reply.set_exception(exc if exc is not None else RequestFailedError("Connection closed"))
 
 
 async def connect(ctx: BizHawkContext) -> bool:
@@ -112,10 +241,7 @@ async def connect(ctx: BizHawkContext) -> bool:
 
 def disconnect(ctx: BizHawkContext) -> None:
     """Closes the connection to the connector script."""
-    if ctx.streams is not None:
-        ctx.streams[1].close()
-        ctx.streams = None
-    ctx.connection_status = ConnectionStatus.NOT_CONNECTED
+    ctx._close(ctx.streams)
 
 
 async def get_script_version(ctx: BizHawkContext) -> int:
@@ -125,8 +251,14 @@ async def get_script_version(ctx: BizHawkContext) -> int:
 async def send_requests(ctx: BizHawkContext, req_list: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Sends a list of requests to the BizHawk connector and returns their responses.
 
-    It's likely you want to use the wrapper functions instead of this."""
-    responses = json.loads(await ctx._send_message(json.dumps(req_list)))
+    It's likely you want to use the wrapper functions instead of this.
+
+    Several calls may be awaited at once, and the connector will answer all of them on the same frame if they arrive in
+    time. They're still executed in the order they were sent."""
+    return _raise_errors(await ctx._send_requests(req_list))
+
+
+def _raise_errors(responses: list[dict[str, Any]]) -> list[dict[str, Any]]:
     errors: list[ConnectorError] = []
 
     for response in responses:
@@ -249,8 +381,10 @@ async def guarded_read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int,
     - `domain` is the name of the region of memory the address corresponds to
 
     Returns None if any item in guard_list failed to validate. Otherwise returns a list of bytes in the order they
-    were requested."""
-    res = await send_requests(ctx, [{
+    were requested.
+
+    Reads without guards made while other reads are waiting to be sent are coalesced into a single batch."""
+    res = _raise_errors(await ctx._send_requests([{
         "type": "GUARD",
         "address": address,
         "expected_data": base64.b64encode(bytes(expected_data)).decode("ascii"),
@@ -260,7 +394,7 @@ async def guarded_read(ctx: BizHawkContext, read_list: Sequence[tuple[int, int,
         "address": address,
         "size": size,
         "domain": domain
-    } for address, size, domain in read_list])
+    } for address, size, domain in read_list], coalesce=not guard_list))
 
     ret: list[bytes] = []
     for item in res:
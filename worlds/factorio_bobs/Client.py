@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import concurrent.futures
 import copy
 import json
 import logging
@@ -10,9 +12,10 @@ import re
 import string
 import subprocess
 import sys
+import threading
 import time
 import typing
-from queue import Queue
+from queue import Queue, SimpleQueue
 
 import factorio_rcon
 
@@ -29,6 +32,72 @@ def check_stdin() -> None:
         print("WARNING: Console input is not routed reliably on Windows, use the GUI instead.")
 
 
+class RCONBridge:
+    """
+    Runs the commands of a factorio_rcon.RCONClient on a dedicated I/O thread, so a slow Factorio server can't stall
+    the event loop. Commands that queue up while others are in flight get pipelined in one send_commands call,
+    keeping their order.
+    """
+    def __init__(self, ip_address: str, port: int, password: str, timeout: float | None = None):
+        self.rcon_client = factorio_rcon.RCONClient(ip_address, port, password, timeout=timeout)
+        self.queue: SimpleQueue[tuple[str, concurrent.futures.Future[str | None]] | None] = SimpleQueue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="RCON Bridge", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            closing = None in batch
+            commands = [command for command in batch if command is not None]
+            if commands:
+                try:
+                    responses = self.rcon_client.send_commands(
+                        {index: command for index, (command, _) in enumerate(commands)})
+                except Exception as e:
+                    for _, future in commands:
+                        future.set_exception(e)
+                else:
+                    for index, (_, future) in enumerate(commands):
+                        future.set_result(responses[index])
+            if closing:
+                self.rcon_client.close()
+                return
+
+    def _submit(self, command: str) -> concurrent.futures.Future[str | None]:
+        if self.closed:
+            raise factorio_rcon.RCONNotConnected("The RCON bridge has been closed.")
+        future: concurrent.futures.Future[str | None] = concurrent.futures.Future()
+        self.queue.put((command, future))
+        return future
+
+    @staticmethod
+    def _log_failure(future: concurrent.futures.Future[str | None]) -> None:
+        if future.exception():
+            logger.exception("RCON command failed", exc_info=future.exception())
+
+    def send_command(self, command: str) -> None:
+        """Queues a command, without waiting for its response."""
+        self._submit(command).add_done_callback(self._log_failure)
+
+    def send_commands(self, commands: typing.Mapping[typing.Any, str]) -> None:
+        """Queues multiple commands, without waiting for their responses."""
+        for command in commands.values():
+            self.send_command(command)
+
+    async def request(self, command: str) -> str | None:
+        """Sends a command and returns its response."""
+        return await asyncio.wrap_future(self._submit(command))
+
+    def close(self) -> None:
+        """Closes the connection after all queued commands were sent."""
+        if not self.closed:
+            self.closed = True
+            self.queue.put(None)
+
+
 class FactorioCommandProcessor(ClientCommandProcessor):
     ctx: FactorioContext
 
@@ -42,9 +111,14 @@ class FactorioCommandProcessor(ClientCommandProcessor):
         if self.ctx.rcon_client:
             # TODO: Print the command non-silently only for race seeds, or otherwise block anything but /factorio /save in race seeds.
             self.ctx.print_to_game(f"/factorio {text}")
-            result = self.ctx.rcon_client.send_command(text)
-            if result:
-                self.output(result)
+            rcon_client = self.ctx.rcon_client
+
+            async def send_command():
+                result = await rcon_client.request(text)
+                if result:
+                    self.output(result)
+
+            async_start(send_command())
             return True
         return False
 
@@ -60,6 +134,16 @@ class FactorioCommandProcessor(ClientCommandProcessor):
         """Toggle sending of chat messages from players on the Factorio server to Archipelago."""
         self.ctx.toggle_bridge_chat_out()
 
+    def _cmd_bridge_latency(self):
+        """Print how long the recent round-trips to the Factorio server took."""
+        latencies = self.ctx.bridge_latencies
+        if latencies:
+            self.output(f"Bridge round-trips: last {latencies[-1] * 1000:.1f} ms, "
+                        f"average {sum(latencies) / len(latencies) * 1000:.1f} ms, "
+                        f"max {max(latencies) * 1000:.1f} ms over the last {len(latencies)}.")
+        else:
+            self.output("No bridge round-trips yet.")
+
 
 class FactorioContext(CommonContext):
     command_processor = FactorioCommandProcessor
@@ -74,8 +158,10 @@ class FactorioContext(CommonContext):
                  factorio_server_args: tuple[str, ...]):
         super(FactorioContext, self).__init__(server_address, password)
         self.send_index: int = 0
-        self.rcon_client = None
+        self.rcon_client: RCONBridge | None = None
         self.awaiting_bridge = False
+        self.bridge_latencies: collections.deque[float] = collections.deque(maxlen=100)
+        """seconds taken by the recent /ap-sync round-trips, including time spent queued behind other commands"""
         self.write_data_path = None
         self.death_link_tick: int = 0  # last send death link on Factorio layer
         self.factorio_json_text_parser = FactorioJSONtoTextParser(self)
@@ -236,16 +322,28 @@ class FactorioContext(CommonContext):
         self.ui_task = asyncio.create_task(self.ui.async_run(), name="UI")
 
 
+bridge_interval_min = 0.25
+"""seconds between bridge polls right after something happened"""
+bridge_interval_max = 1
+"""seconds between bridge polls while nothing happens, the interval doubles towards this"""
+
+
 async def game_watcher(ctx: FactorioContext):
     bridge_logger = logging.getLogger("FactorioWatcher")
+    bridge_interval = bridge_interval_max
     next_bridge = time.perf_counter() + 1
     try:
         while not ctx.exit_event.is_set():
-            # TODO: restore on-demand refresh
-            if ctx.rcon_client and time.perf_counter() > next_bridge:
-                next_bridge = time.perf_counter() + 1
+            # the mod announces changes to its data, see factorio_server_watcher
+            if ctx.rcon_client and (ctx.awaiting_bridge or time.perf_counter() > next_bridge):
                 ctx.awaiting_bridge = False
-                data = json.loads(ctx.rcon_client.send_command("/ap-sync"))
+                active = False
+                start = time.perf_counter()
+                data = json.loads(await ctx.rcon_client.request("/ap-sync"))
+                latency = time.perf_counter() - start
+                ctx.bridge_latencies.append(latency)
+                if latency > bridge_interval_max:
+                    bridge_logger.warning(f"Factorio server took {latency:.1f} seconds to answer the bridge.")
                 if not ctx.auth:
                     pass  # auth failed, wait for new attempt
                 elif data["slot_name"] != ctx.auth:
@@ -265,6 +363,7 @@ async def game_watcher(ctx: FactorioContext):
                         ctx.finished_game = True
 
                     if ctx.locations_checked != research_data:
+                        active = True
                         bridge_logger.debug(
                             f"New researches done: "
                             f"{[ctx.location_names.lookup_in_game(rid) for rid in research_data - ctx.locations_checked]}")
@@ -272,6 +371,7 @@ async def game_watcher(ctx: FactorioContext):
                         await ctx.check_locations(research_data)
                     death_link_tick = data.get("death_link_tick", 0)
                     if death_link_tick != ctx.death_link_tick:
+                        active = True
                         ctx.death_link_tick = death_link_tick
                         if "DeathLink" in ctx.tags:
                             async_start(ctx.send_death())
@@ -282,6 +382,7 @@ async def game_watcher(ctx: FactorioContext):
                             in_world_energy = data["energy"]
                             if in_world_energy < (ctx.energy_link_increment * in_world_bridges):
                                 # attempt to refill
+                                active = True
                                 ctx.last_deplete = time.time()
                                 async_start(ctx.send_msgs([{
                                     "cmd": "Set", "key": ctx.energylink_key, "operations":
@@ -292,6 +393,7 @@ async def game_watcher(ctx: FactorioContext):
                             # Above Capacity - (len(Bridges) * ENERGY_INCREMENT)
                             elif in_world_energy > (in_world_bridges * ctx.energy_link_increment * 5) - \
                                     ctx.energy_link_increment * in_world_bridges:
+                                active = True
                                 value = int(ctx.energy_link_increment * in_world_bridges)
                                 async_start(ctx.send_msgs([{
                                     "cmd": "Set", "key": ctx.energylink_key, "operations":
@@ -300,6 +402,8 @@ async def game_watcher(ctx: FactorioContext):
                                 ctx.rcon_client.send_command(
                                     f"/ap-energylink -{value}")
                                 logger.debug(f"EnergyLink: Sent {format_SI_prefix(value)}J")
+                bridge_interval = bridge_interval_min if active else min(bridge_interval * 2, bridge_interval_max)
+                next_bridge = time.perf_counter() + bridge_interval
 
             await asyncio.sleep(0.1)
 
@@ -352,8 +456,7 @@ async def factorio_server_watcher(ctx: FactorioContext):
                 factorio_queue.task_done()
 
                 if not ctx.rcon_client and "Starting RCON interface at IP ADDR:" in msg:
-                    ctx.rcon_client = factorio_rcon.RCONClient("localhost", ctx.rcon_port, ctx.rcon_password,
-                                                               timeout=5)
+                    ctx.rcon_client = RCONBridge("localhost", ctx.rcon_port, ctx.rcon_password, timeout=5)
                     if not ctx.server:
                         logger.info("Established bridge to Factorio Server. "
                                     "Ready to connect to Archipelago via /connect")
@@ -388,7 +491,16 @@ async def factorio_server_watcher(ctx: FactorioContext):
                     commands[ctx.send_index] = f"/ap-get-technology {item_name}\t{ctx.send_index}\t{player_name}"
                     ctx.send_index += 1
                 if commands:
-                    ctx.rcon_client.send_commands(commands)
+                    # unlike polling, received items have to arrive, so a failure aborts the bridge like it used to,
+                    # after rewinding to the first item that didn't make it so it's sent again
+                    rcon_client = ctx.rcon_client
+                    results = await asyncio.gather(*(rcon_client.request(command) for command in commands.values()),
+                                                   return_exceptions=True)
+                    failures = [(index, result) for index, result in zip(commands, results)
+                                if isinstance(result, BaseException)]
+                    if failures:
+                        ctx.send_index = min(index for index, _ in failures)
+                        raise failures[0][1]
             await asyncio.sleep(0.1)
 
     except Exception as e:
@@ -407,7 +519,7 @@ async def factorio_server_watcher(ctx: FactorioContext):
         if ctx.rcon_client:
             # Attempt clean quit through RCON.
             try:
-                ctx.rcon_client.send_command("/quit")
+                await ctx.rcon_client.request("/quit")
             except factorio_rcon.RCONNetworkError:
                 pass
             else:
@@ -424,8 +536,8 @@ async def factorio_server_watcher(ctx: FactorioContext):
             factorio_process.kill()
 
 
-async def get_info(ctx: FactorioContext, rcon_client: factorio_rcon.RCONClient):
-    info = json.loads(rcon_client.send_command("/ap-rcon-info"))
+async def get_info(ctx: FactorioContext, rcon_client: RCONBridge):
+    info = json.loads(await rcon_client.request("/ap-rcon-info"))
     ctx.auth = info["slot_name"]
     ctx.seed_name = info["seed_name"]
     death_link = info["death_link"]
@@ -473,7 +585,7 @@ async def factorio_spinup_server(ctx: FactorioContext) -> bool:
                                     "or a Factorio sharing data directories is already running. "
                                     "Server could not start up.")
                 if not rcon_client and "Starting RCON interface at IP ADDR:" in msg:
-                    rcon_client = factorio_rcon.RCONClient("localhost", ctx.rcon_port, ctx.rcon_password)
+                    rcon_client = RCONBridge("localhost", ctx.rcon_port, ctx.rcon_password)
                     if ctx.mod_version == ctx.__class__.mod_version:
                         raise Exception("No Archipelago mod was loaded. Aborting.")
                     await get_info(ctx, rcon_client)
@@ -491,6 +603,8 @@ async def factorio_spinup_server(ctx: FactorioContext) -> bool:
             f"Got World Information from AP Mod {tuple(ctx.mod_version)} for seed {ctx.seed_name} in slot {ctx.auth}")
         return True
     finally:
+        if rcon_client:
+            rcon_client.close()
         factorio_process.terminate()
         factorio_process.wait(5)
     return False
@@ -16,12 +16,12 @@ if __name__ == '__main__' and (__package__ is None or __package__ == ''):
 
 import json
 
-from .InternalItem import all_ingredients
+from .InternalItem import all_ingredients, base_graph
 
 def main():
     output = {}
     for name, item in all_ingredients.items():
-        raw, best, tech, cat = item.eval()
+        raw, best, tech, cat = item.eval(base_graph)
         output[name] = {"raw_ingredients": {item.name: cost for item, cost in raw.items()},
                         "best_recipe": best.name if best else None,
                         "technologies": list(sorted(technology.name for technology in tech)),
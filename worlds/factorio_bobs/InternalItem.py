@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, AbstractSet, Any
 
 if TYPE_CHECKING:
     from . import Technology
 
+import hashlib
+import logging
+import os
+import tempfile
+from collections.abc import Mapping
 from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 
+import orjson
+
+import Utils
 from .FactorioUtils import FactorioElement, load_json_data
 
 pool = ThreadPoolExecutor(1)
@@ -19,77 +28,379 @@ items_future = pool.submit(load_json_data, "items")
 
 Category = str
 
-def ingredient_score(ingredients: dict[InternalItem, float]):
+def ingredient_score(ingredients: Mapping[InternalItem, float], graph: RecipeGraph):
     cost = 0
 
     for ingredient, amount in ingredients.items():
-        cost += ingredient.get_score() * amount
+        cost += ingredient.get_score(graph) * amount
     return cost
 
 # step 1: find root (finding loops can be incorporated into this)
 # step 2: find non-recursive ingredients
 #
 
-recipe_path: list[tuple[InternalItem, Recipe]] = []
-failure_state = False
+
+class RecipeTreeCache:
+    """
+    Content-addressed cache of InternalItem.eval results, kept in memory and in the user's cache directory.
+    Entries are keyed by a digest of the recipe subgraph below the evaluated item, so randomized recipe sets that
+    repeat across players and seeds reuse them, while any change to the subgraph simply misses.
+    Stored entries use the same format as data/precalc.json, ordered from least to most recently used, and the least
+    recently used ones are evicted beyond max_entries.
+    The file is only rewritten when entries were added or evicted, merged with what other generators wrote meanwhile.
+    """
+    version = 1
+    """bump when the evaluation changes in a way the subgraph digest can't see"""
+    max_entries = 5000
+    """entries are about a kilobyte each"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] | None = None
+        self.dirty = False
+        self.used: set[str] = set()
+        """digests hit or stored since the last save, which move to the most recently used end when saving"""
+        self.hits = 0
+        self.misses = 0
+
+    def read(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.debug(f"Could not load Factorio Bob's recipe tree cache: {e}")
+        return {}
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        if self.entries is None:
+            self.entries = self.read()
+            self.evict()
+        return self.entries
+
+    def evict(self) -> None:
+        """Drops the least recently used entries beyond max_entries."""
+        entries = self.load()
+        if len(entries) > self.max_entries:
+            for digest in list(entries)[:len(entries) - self.max_entries]:
+                del entries[digest]
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        # other generators may have saved since this one loaded, so their entries are kept and only the ones used here
+        # move to the end, in the order they were used
+        entries = self.read()
+        for digest, entry in self.load().items():
+            if digest in self.used:
+                entries.pop(digest, None)
+                entries[digest] = entry
+        self.entries = entries
+        self.evict()
+        temp_path = None
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            # written next to the cache and renamed over it, so other generators never read a partial file
+            fd, temp_path = tempfile.mkstemp(".tmp", "recipe_trees", directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(self.entries))
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logging.debug(f"Could not store Factorio Bob's recipe tree cache: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+        else:
+            self.dirty = False
+            self.used.clear()
+
+    def _digest_components(self, root: InternalItem, graph: RecipeGraph) -> bool:
+        """
+        Digests the strongly connected components of the recipe graph below root, dependencies first, so every digest
+        covers the whole subgraph and doesn't depend on the order it is traversed in.
+        Digests are kept by the graph owning the item, so digests of the shared base graph are shared by all worlds.
+        Returns False if the subgraph can't be cached.
+        """
+        index: dict[InternalItem, int] = {}
+        low: dict[InternalItem, int] = {}
+        stack: list[InternalItem] = []
+
+        def visit(item: InternalItem) -> bool:
+            if item is not root and all_ingredients.get(item.name) is not item:
+                # only the evaluated item may be a world's custom product, everything below is resolved by name
+                return False
+            index[item] = low[item] = len(index)
+            stack.append(item)
+            for recipe in item.recipes:
+                for ingredient in recipe.ingredients:
+                    if ingredient in graph.owner(ingredient).digests:
+                        continue
+                    if ingredient not in index:
+                        if not visit(ingredient):
+                            return False
+                        low[item] = min(low[item], low[ingredient])
+                    elif ingredient in stack:
+                        low[item] = min(low[item], index[ingredient])
+            if low[item] == index[item]:
+                component = stack[stack.index(item):]
+                del stack[stack.index(item):]
+                self._digest_component(component, graph)
+            return True
+
+        return visit(root)
+
+    def _digest_component(self, component: list[InternalItem], graph: RecipeGraph) -> None:
+        members = set(component)
+        lines = []
+        for item in sorted(component, key=lambda member: member.name):
+            lines.append(f"{item.name}|{item.is_fluid}|{item.root_item}")
+            for recipe in sorted(item.recipes, key=lambda item_recipe: item_recipe.name):
+                products = ",".join(sorted(f"{product.name}:{amount!r}" for product, amount in recipe.products.items()))
+                ingredients = ",".join(sorted(
+                    f"{ingredient.name if ingredient in members else graph.owner(ingredient).digests[ingredient].hex()}"
+                    f":{amount!r}"
+                    for ingredient, amount in recipe.ingredients.items()))
+                lines.append(f"{recipe.name}|{recipe.category}|{recipe.energy!r}|"
+                             f"{','.join(sorted(recipe_sources.get(recipe.name, ())))}|{products}|{ingredients}")
+        component_digest = hashlib.sha1("\n".join(lines).encode()).digest()
+        for item in component:
+            graph.owner(item).digests[item] = hashlib.sha1(component_digest + item.name.encode()).digest()
+
+    def digest(self, item: InternalItem, graph: RecipeGraph) -> str | None:
+        """Returns the cache key of item's recipe subgraph, or None if it can't be cached."""
+        digests = graph.owner(item).digests
+        if item not in digests and not self._digest_components(item, graph):
+            return None
+        return hashlib.sha1(f"{self.version}{sorted(rel_cost.items())}".encode() + digests[item]).hexdigest()
+
+    def get(self, item: InternalItem, digest: str) \
+            -> tuple[dict[InternalItem, float], Recipe | None, set[Technology], set[Category]] | None:
+        from .Technologies import technology_table
+        entries = self.load()
+        result = entries.pop(digest, None)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entries[digest] = result
+        self.used.add(digest)
+        best_recipe = next(recipe for recipe in item.recipes if recipe.name == result["best_recipe"]) \
+            if result["best_recipe"] else None
+        return ({item if name == item.name else all_ingredients[name]: cost
+                 for name, cost in result["raw_ingredients"].items()},
+                best_recipe,
+                {technology_table[tech] for tech in result["technologies"]},
+                set(result["category"]))
+
+    def store(self, digest: str, raw_ingredients: dict[InternalItem, float], best_recipe: Recipe | None,
+              ingredient_tech: set[Technology], req_categories: set[Category]) -> None:
+        entries = self.load()
+        entries.pop(digest, None)
+        entries[digest] = {"raw_ingredients": {item.name: cost for item, cost in raw_ingredients.items()},
+                           "best_recipe": best_recipe.name if best_recipe else None,
+                           "technologies": sorted(technology.name for technology in ingredient_tech),
+                           "category": sorted(req_categories)}
+        self.used.add(digest)
+        self.dirty = True
+        self.evict()
+
+    def log_stats(self) -> None:
+        """Logs and resets the hit and miss counters."""
+        total = self.hits + self.misses
+        if total:
+            logging.info(f"Factorio Bob's recipe tree cache: {self.hits} hits, {self.misses} misses "
+                         f"({self.hits / total:.0%} hit rate).")
+        self.hits = self.misses = 0
+
+
+recipe_tree_cache = RecipeTreeCache(Utils.cache_path("factorio_bobs", "recipe_trees.json"))
+
+ItemEvaluation = tuple[Mapping["InternalItem", float], "Recipe | None", AbstractSet["Technology"],
+                       AbstractSet[Category]]
+
+
+class RecipeGraph:
+    """
+    The state and results of evaluating the recipe graph, for the items a graph owns.
+
+    base_graph owns all_ingredients and is frozen once data/precalc.json is loaded into it, after which it is only read.
+    Every world evaluates in its own overlay of base_graph, which owns the world's custom products and their recipes.
+    Items are always evaluated in the graph owning them, so a world never writes to the state of the base graph or of
+    another world, and its results don't depend on what other worlds evaluated before.
+    """
+    base: RecipeGraph | None
+    items: dict[str, InternalItem]
+    """items owned by this graph, by name"""
+    frozen: bool
+    """all owned items are evaluated, so evaluating them only reads and results may be kept"""
+
+    def __init__(self, base: RecipeGraph | None = None, items: dict[str, InternalItem] | None = None):
+        self.base = base
+        self.items = {} if items is None else items
+        self.frozen = False
+        self.used_in: dict[InternalItem, set[Recipe]] = {}
+        """recipes of this graph using items of a base graph"""
+
+        self.evaluating: set[InternalItem] = set()
+        self.recipe_path: list[tuple[InternalItem, Recipe]] = []
+        self.existing_loops: set[RecursiveRecipeLoop] = set()
+        self.recursive_loops: dict[InternalItem, set[RecursiveRecipeLoop]] = {}
+
+        self.evaluations: dict[InternalItem, tuple[Mapping[InternalItem, float], AbstractSet[Technology],
+                                                   AbstractSet[Category]]] = {}
+        self.best_recipes: dict[InternalItem, Recipe | None] = {}
+        self.non_recursive: dict[InternalItem, tuple[Mapping[InternalItem, float], Recipe | None]] = {}
+        self.recipe_evaluations: dict[Recipe, tuple[dict[InternalItem, float], set[Technology], set[Category]]] = {}
+        self.unlocking_technologies: dict[InternalItem, frozenset[Technology]] = {}
+        """results of InternalItem.all_unlocking_technologies, kept once frozen"""
+        self.energies: dict[InternalItem, float | None] = {}
+        """results of InternalItem.get_energy, kept once frozen"""
+        self.digests: dict[InternalItem, bytes] = {}
+        """digests of the subgraphs below items for recipe_tree_cache, valid until recipes are added"""
+
+    def owner(self, item: InternalItem) -> RecipeGraph:
+        """The graph item is evaluated in: this graph if it owns item, else the base graph owning it."""
+        graph = self
+        while graph.base and graph.items.get(item.name) is not item:
+            graph = graph.base
+        return graph
+
+    def get_item(self, name: str) -> InternalItem:
+        """The item called name, preferring the items of this graph over those of its base graphs."""
+        graph = self
+        while name not in graph.items and graph.base:
+            graph = graph.base
+        return graph.items[name]
+
+    def add_item(self, item: InternalItem) -> InternalItem:
+        self.items[item.name] = item
+        return item
+
+    def own_item(self, item: InternalItem) -> InternalItem:
+        """This graph's own version of item, created on first use, so it can get recipes without changing item."""
+        own = self.items.get(item.name)
+        if own is None:
+            own = self.add_item(InternalItem(item.name, item.is_fluid))
+        return own
+
+    def add_recipe(self, recipe: Recipe) -> Recipe:
+        """Adds recipe to the recipes of its products, which have to be owned by this graph."""
+        if self.frozen:
+            raise Exception(f"Can't add {recipe} to a frozen recipe graph.")
+        self.digests.clear()
+        for product in recipe.products:
+            if self.owner(product) is not self:
+                raise Exception(f"Can't add {recipe} for {product}, which belongs to another recipe graph.")
+            product.recipes.add(recipe)
+            self.invalidate(product)
+
+        for ingredient in recipe.ingredients:
+            if self.owner(ingredient) is self:
+                ingredient.is_used_in.add(recipe)
+            else:
+                self.used_in.setdefault(ingredient, set()).add(recipe)
+
+        if recipe.category in root_categories:
+            for product in recipe.products:
+                product.root_item = True
+                self.best_recipes[product] = recipe
+        return recipe
+
+    def remove_recipe(self, recipe: Recipe) -> None:
+        if self.frozen:
+            raise Exception(f"Can't remove {recipe} from a frozen recipe graph.")
+        self.digests.clear()
+        for product in recipe.products:
+            product.recipes.remove(recipe)
+            if recipe == self.best_recipes.get(product):
+                self.invalidate(product)
+
+        for ingredient in recipe.ingredients:
+            if self.owner(ingredient) is self:
+                ingredient.is_used_in.remove(recipe)
+            else:
+                self.used_in[ingredient].remove(recipe)
+
+    def get_used_in(self, item: InternalItem) -> set[Recipe]:
+        """Recipes using item, including those of base graphs."""
+        return item.is_used_in | self.used_in.get(item, set())
+
+    def get_best_recipe(self, item: InternalItem) -> Recipe | None:
+        """The recipe item is made with, as of its last evaluation."""
+        return self.owner(item).best_recipes.get(item)
+
+    def get_recursive_loops(self, item: InternalItem) -> set[RecursiveRecipeLoop]:
+        return self.owner(item).recursive_loops.get(item, set())
+
+    def invalidate(self, item: InternalItem) -> None:
+        self.evaluations.pop(item, None)
+        self.best_recipes.pop(item, None)
+
+    def set_cache(self, item: InternalItem, raw_ingredients: Mapping[InternalItem, float], best_recipe: Recipe | None,
+                  ingredient_tech: AbstractSet[Technology], req_categories: AbstractSet[Category]) -> None:
+        self.evaluations[item] = raw_ingredients, ingredient_tech, req_categories
+        self.best_recipes[item] = best_recipe
+
+
 class InternalItem(FactorioElement):
-    evaluating: set[InternalItem] = set()
-    __req_categories: set[Category]
     def __init__(self, name: str, is_fluid: bool):
         self.name = name
         self.is_fluid = is_fluid
         self.recipes: set[Recipe] = set()
         self.is_used_in: set[Recipe] = set()
-
-        self.best_recipe: Recipe | None = None
         self.root_item = False
 
-        self.non_recursive_raw_ingredients: dict[InternalItem, float] = {}
-        self.non_recursive_best_recipe: Recipe | None = None
-        self.recursive_loops: set[RecursiveRecipeLoop] = set()
-        self.has_recursive_recipe = False
-        self.best_loop = None
-
-        self.__raw_ingredients: dict[InternalItem, float] = {}
-        self.__ingredient_unlocking_technologies: set[Technology] = set()
-        self.__req_categories: set[Category] = set()
+    def get_raw_ingredients(self, graph: RecipeGraph) -> Mapping[InternalItem, float]:
+        return self.eval(graph)[0]
 
-    def get_raw_ingredients(self) -> dict[InternalItem, float]:
-        return self.eval()[0]
-
-    def eval(self) -> tuple[dict[InternalItem, float], Recipe | None, set[Technology], set[Category]]:
-        if (self.__raw_ingredients
-                and not any(loop.entry and loop.get_recipe(self) == self.best_recipe for loop in self.recursive_loops)): #  and loop.get_recipe(self) == self.best_recipe
-            return (self.__raw_ingredients, self.best_recipe,
-                    self.__ingredient_unlocking_technologies, self.__req_categories)
+    def eval(self, graph: RecipeGraph) -> ItemEvaluation:
+        graph = graph.owner(self)
+        evaluation = graph.evaluations.get(self)
+        if (evaluation and evaluation[0]
+                and not any(loop.entry and loop.get_recipe(self) == graph.best_recipes.get(self)
+                            for loop in graph.recursive_loops.get(self, ()))):
+            return evaluation[0], graph.best_recipes.get(self), evaluation[1], evaluation[2]
         # no cache calculate
 
         if len(self.recipes) == 0:
             # must be an unknown method for item to spontaneously exist
             if self.name not in rel_cost:
                 print(f"spontaneously existing item ({self.name}) doesn't have a cost, defaulting to 1")
-            self.non_recursive_raw_ingredients = {self: 1}
-            self.__raw_ingredients = {self: 1}
-            return self.__raw_ingredients, None, set(), set()
-
-        InternalItem.evaluating.add(self)
-        for loop in self.recursive_loops:
+            graph.non_recursive[self] = {self: 1}, None
+            raw_ingredients = {self: 1}
+            graph.evaluations[self] = raw_ingredients, set(), set()
+            return raw_ingredients, None, set(), set()
+
+        # only evaluations that don't start inside another evaluation are independent of loop state
+        cache_digest = recipe_tree_cache.digest(self, graph) if not graph.evaluating else None
+        if cache_digest:
+            cached = recipe_tree_cache.get(self, cache_digest)
+            if cached:
+                graph.set_cache(self, *cached)
+                graph.non_recursive[self] = cached[0], cached[1]
+                return cached
+
+        graph.evaluating.add(self)
+        for loop in graph.recursive_loops.get(self, ()):
             loop.enter_loop(self)
 
         if self.root_item:
-            recipe_path.append((self, self.best_recipe))
-            (self.__raw_ingredients, self.__ingredient_unlocking_technologies,
-             self.__req_categories) = self.best_recipe.eval()
-            recipe_path.pop()
+            best_recipe = graph.best_recipes.get(self)
+            graph.recipe_path.append((self, best_recipe))
+            raw_ingredients, ingredient_tech, req_categories = best_recipe.eval(graph)
+            graph.recipe_path.pop()
 
-            if not self.__raw_ingredients:
-                self.__raw_ingredients = {self: 1}
+            if not raw_ingredients:
+                raw_ingredients = {self: 1}
 
-            self.non_recursive_best_recipe = self.best_recipe
-            self.non_recursive_raw_ingredients = self.__raw_ingredients
-            InternalItem.evaluating.remove(self)
-            return (self.__raw_ingredients, self.best_recipe,
-                    self.__ingredient_unlocking_technologies, self.__req_categories)
+            graph.evaluations[self] = raw_ingredients, ingredient_tech, req_categories
+            graph.non_recursive[self] = raw_ingredients, best_recipe
+            graph.evaluating.remove(self)
+            if cache_digest:
+                recipe_tree_cache.store(cache_digest, raw_ingredients, best_recipe, ingredient_tech, req_categories)
+            return raw_ingredients, best_recipe, ingredient_tech, req_categories
 
 
         lowest_score = float('inf')
@@ -98,14 +409,14 @@ class InternalItem(FactorioElement):
         best_categories = set()
         best_raw_ingredients = {}
         for recipe in self.recipes:
-            recipe_path.append((self, recipe))
-            raw_ingredients, tech, cat = recipe.eval()
-            recipe_path.pop()
+            graph.recipe_path.append((self, recipe))
+            raw_ingredients, tech, cat = recipe.eval(graph)
+            graph.recipe_path.pop()
 
             if not raw_ingredients:
                 continue
 
-            recipe_score = ingredient_score(raw_ingredients) / recipe.products[self]
+            recipe_score = ingredient_score(raw_ingredients, graph) / recipe.products[self]
             if recipe_score < lowest_score:
                 lowest_score = recipe_score
                 best_recipe = recipe
@@ -113,12 +424,12 @@ class InternalItem(FactorioElement):
                 best_categories = cat
                 best_raw_ingredients = {ingredient: cost / recipe.products[self] for ingredient, cost in raw_ingredients.items()}
 
-        for loop in self.recursive_loops:
+        for loop in graph.recursive_loops.get(self, ()):
             loop.exit_loop(self)
 
-        if any(loop.entry for loop in self.recursive_loops):
+        if any(loop.entry for loop in graph.recursive_loops.get(self, ())):
             # in loop, calculation not valid for cache or recursive calculation
-            InternalItem.evaluating.remove(self)
+            graph.evaluating.remove(self)
             return best_raw_ingredients, best_recipe, best_tech, best_categories
 
         if not best_raw_ingredients:
@@ -127,29 +438,26 @@ class InternalItem(FactorioElement):
             if self.name not in rel_cost:
                 print(f"spontaneously existing sample item ({self.name}) doesn't have a cost, defaulting to 1")
 
-        self.non_recursive_raw_ingredients = best_raw_ingredients
-        self.non_recursive_best_recipe = best_recipe
+        graph.non_recursive[self] = best_raw_ingredients, best_recipe
         # todo non_recursive_tech
 
-        if not self.recursive_loops or True: # todo fix recursion
-            self.__raw_ingredients = best_raw_ingredients
-            self.best_recipe = best_recipe
-            self.__ingredient_unlocking_technologies = best_tech
-            self.__req_categories = best_categories
-            InternalItem.evaluating.remove(self)
-            return (self.__raw_ingredients, self.best_recipe,
-                    self.__ingredient_unlocking_technologies, self.__req_categories)
+        if not graph.recursive_loops.get(self) or True: # todo fix recursion
+            graph.set_cache(self, best_raw_ingredients, best_recipe, best_tech, best_categories)
+            graph.evaluating.remove(self)
+            if cache_digest:
+                recipe_tree_cache.store(cache_digest, best_raw_ingredients, best_recipe, best_tech, best_categories)
+            return best_raw_ingredients, best_recipe, best_tech, best_categories
 
         # recursive calculate
         raise NotImplementedError("recursion takes too long and should be implemented yet. How did you get here?")
         # todo recursive tech handling & categories
 
-        for loop in self.recursive_loops:
+        for loop in graph.recursive_loops.get(self, ()):
             loop.enter_loop(self)
 
         non_recursive_score = lowest_score
         best_loop = None
-        for loop in self.recursive_loops:
+        for loop in graph.recursive_loops.get(self, ()):
             loop_ingredients = loop.get_cost(self)
 
             if loop_ingredients[self] >= 1: # costs more for the loop
@@ -160,7 +468,7 @@ class InternalItem(FactorioElement):
 
             raw_loop_ingredients = {}
             for loop_ingredient, loop_amount in loop_ingredients.items():
-                raw_ingredients = loop_ingredient.get_raw_ingredients()
+                raw_ingredients = loop_ingredient.get_raw_ingredients(graph)
 
                 for ingredient, amount in raw_ingredients.items():
                     if ingredient in raw_loop_ingredients:
@@ -168,73 +476,78 @@ class InternalItem(FactorioElement):
                     else:
                         raw_loop_ingredients[ingredient] = amount * loop_amount
 
-            self.has_recursive_recipe = True
-
-            recipe_score = ingredient_score(raw_loop_ingredients) + non_recursive_score * discount
+            recipe_score = ingredient_score(raw_loop_ingredients, graph) + non_recursive_score * discount
 
             if recipe_score < lowest_score:
                 lowest_score = recipe_score
                 best_loop = loop
                 best_raw_ingredients = raw_loop_ingredients
-                for ingredient, amount in self.non_recursive_raw_ingredients.items():
+                for ingredient, amount in graph.non_recursive[self][0].items():
                     if ingredient in best_raw_ingredients:
                         best_raw_ingredients[ingredient] += amount * discount
                     else:
                         best_raw_ingredients[ingredient] = amount * discount
 
-        for loop in self.recursive_loops:
+        for loop in graph.recursive_loops.get(self, ()):
             loop.exit_loop(self)
 
-        self.__raw_ingredients = best_raw_ingredients
-        self.best_loop = best_loop
-        if best_loop is None:
-            self.best_recipe = best_recipe
-        else:
-            self.best_recipe = best_loop.get_recipe(self)
+        if best_loop is not None:
+            best_recipe = best_loop.get_recipe(self)
+        graph.set_cache(self, best_raw_ingredients, best_recipe, best_tech, best_categories)
 
-        InternalItem.evaluating.remove(self)
-        return self.__raw_ingredients
+        graph.evaluating.remove(self)
+        return best_raw_ingredients
 
-    def get_score(self) -> float:
+    def get_score(self, graph: RecipeGraph) -> float:
         if self.name in rel_cost:
             return rel_cost[self.name]
-        raw_ingredients = self.get_raw_ingredients()
+        raw_ingredients = self.get_raw_ingredients(graph)
         if len(raw_ingredients) == 1 and self in raw_ingredients:
             return 1
-        return ingredient_score(self.get_raw_ingredients())
-
-    def all_unlocking_technologies(self) -> set[Technology]:
-        if self in InternalItem.evaluating:
+        return ingredient_score(self.get_raw_ingredients(graph), graph)
+
+    def get_energy(self, graph: RecipeGraph) -> float | None:
+        """Energy (crafting time) of crafting one with the best recipe, None if there is no recipe."""
+        graph = graph.owner(self)
+        if self in graph.energies:
+            return graph.energies[self]
+        self.get_raw_ingredients(graph)
+        best_recipe = graph.best_recipes.get(self)
+        energy = best_recipe.total_energy(graph) / best_recipe.products[self] if best_recipe else None
+        if graph.frozen:
+            graph.energies[self] = energy
+        return energy
+
+    def all_unlocking_technologies(self, graph: RecipeGraph,
+                                   machines_evaluating: set[Machine] | None = None) -> set[Technology]:
+        graph = graph.owner(self)
+        if self in graph.evaluating:
             return set()
 
-        _,_,all_unlocking_technologies, categories = self.eval()
-        all_unlocking_technologies = all_unlocking_technologies.copy()
-        categories = categories.copy()
+        # only results that don't depend on machines evaluated further up are the same on every call
+        top_level = machines_evaluating is None
+        if top_level:
+            if self in graph.unlocking_technologies:
+                return set(graph.unlocking_technologies[self])
+            machines_evaluating = set()
+
+        _,_,all_unlocking_technologies, categories = self.eval(graph)
+        all_unlocking_technologies = set(all_unlocking_technologies)
 
         for category in categories:
-            all_unlocking_technologies |= machine_per_category[category].all_unlocking_technologies()
+            all_unlocking_technologies |= machine_per_category[category].all_unlocking_technologies(
+                graph, machines_evaluating)
 
+        if top_level and graph.frozen:
+            graph.unlocking_technologies[self] = frozenset(all_unlocking_technologies)
         return all_unlocking_technologies
 
-    def invalidate_cache(self):
-        self.__raw_ingredients = set()
-        self.best_recipe = None
-        self.__ingredient_unlocking_technologies = set()
-        self.__req_categories = set()
-
-    def set_cache(self, raw_ingredients: dict[InternalItem, float], best_recipe : Recipe | None,
-                  ingredient_tech: set[Technology], req_categories: set[Category]):
-        self.__raw_ingredients = raw_ingredients
-        self.best_recipe = best_recipe
-        self.__ingredient_unlocking_technologies = ingredient_tech
-        self.__req_categories = req_categories
-
 
 class RecursiveRecipeLoop:
     # entered_loops = 0
-    existing_loops = set()
 
-    def __init__(self, start) -> None:
+    def __init__(self, start: InternalItem, graph: RecipeGraph) -> None:
+        recipe_path = graph.recipe_path
         start_index = 0
         try:
             while recipe_path[start_index][0] != start:
@@ -256,15 +569,15 @@ class RecursiveRecipeLoop:
         first_recipe_index = hashed_recipes.index(first_recipe)
         self.recipes = self.recipes[first_recipe_index:] + self.recipes[:first_recipe_index]
 
-        if self in RecursiveRecipeLoop.existing_loops:
+        if self in graph.existing_loops:
             return
-        RecursiveRecipeLoop.existing_loops.add(self)
-        if not len(RecursiveRecipeLoop.existing_loops) % 100:
-            print(f"recursive loops: {len(RecursiveRecipeLoop.existing_loops)}\n"
+        graph.existing_loops.add(self)
+        if not len(graph.existing_loops) % 100:
+            print(f"recursive loops: {len(graph.existing_loops)}\n"
                   f"loop: {self.recipes}")
 
         for item, _ in self.recipes:
-            item.recursive_loops.add(self)
+            graph.recursive_loops.setdefault(item, set()).add(self)
 
     def __hash__(self) -> int:
         return hash(self.recipes)
@@ -357,6 +670,7 @@ def register_iternal_items():
     all_ingredients["rocket-part"] = InternalItem("rocket-part", False)
 
 register_iternal_items()
+base_graph = RecipeGraph(items=all_ingredients)
 
 
 root_categories = {"basic-solid", "basic-fluid", "water", "bob-air-pump"}
@@ -373,50 +687,17 @@ class Recipe(FactorioElement):
 
     def __init__(self, name: str, category: str, ingredients: dict[InternalItem, float],
                  products: dict[InternalItem, float], energy: float):
+        """Only data, a recipe takes part in evaluations once it is added to a RecipeGraph."""
         self.name = name
         self.category = category
         self.ingredients = ingredients
         self.products = products
         self.energy = energy
         self.productivity = False
-        self.__raw_ingredients: dict[InternalItem, float] = {}
-        self.__all_unlocking_technologies: set[Technology] = set()
-        self.__all_categories: set[Category] = set()
-
-        for product in self.products.keys():
-            product.recipes.add(self)
-            product.invalidate_cache()
-
-        for ingredient in self.ingredients.keys():
-            ingredient.is_used_in.add(self)
-
-        if category in root_categories:
-            for product, produced in self.products.items():
-                product.root_item = True
-                product.best_recipe = self
-                product.best_non_recursive_recipe = self
-                # if ingredients:
-                #     for ingredient, cost in ingredients.items():
-                #         product.raw_ingredients |= {ingredient: cost/produced}
-                # else:
-                #     if self.name not in rel_cost:
-                #         print(f"spontaneously existing item ({product.name}) doesn't have a cost, default to 1")
-                #     product.raw_ingredients = {product: 1}
-                #     product.raw_eval = True
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name})"
 
-    def remove(self):
-        del recipes[self.name]
-        for product in self.products.keys():
-            product.recipes.remove(self)
-            if self == product.best_recipe:
-                product.invalidate_cache()
-
-        for ingredient in self.ingredients.keys():
-            ingredient.is_used_in.remove(self)
-
     @property
     def crafting_machine(self) -> Machine:
         """cheapest crafting machine name able to run this recipe"""
@@ -428,19 +709,17 @@ class Recipe(FactorioElement):
         from .Technologies import technology_table
         return {technology_table[tech_name] for tech_name in recipe_sources.get(self.name, ())}
 
-    def all_unlocking_technologies(self) -> set[Technology]:
-        return self.eval()[1]
+    def all_unlocking_technologies(self, graph: RecipeGraph) -> set[Technology]:
+        return self.eval(graph)[1]
 
-
-    @property
-    def total_energy(self) -> float:
+    def total_energy(self, graph: RecipeGraph) -> float:
         """Total required energy (crafting time) for single craft"""
         # TODO: multiply mining energy by 2 since drill has 0.5 speed
         total_energy = self.energy
         for ingredient, cost in self.ingredients.items():
-            ingredient.get_raw_ingredients()
-            if ingredient.best_recipe:
-                total_energy += ingredient.best_recipe.total_energy / ingredient.best_recipe.products[ingredient] * cost
+            ingredient_energy = ingredient.get_energy(graph)
+            if ingredient_energy is not None:
+                total_energy += ingredient_energy * cost
             # if ingredient in craftable:
             #     selected_recipe_energy = float('inf')
             #     for ingredient_recipe in all_product_sources[ingredient]:
@@ -451,29 +730,31 @@ class Recipe(FactorioElement):
             #     total_energy += selected_recipe_energy
         return total_energy
 
-    def get_raw_ingredients(self) -> dict[InternalItem, float]:
-        return self.eval()[0]
+    def get_raw_ingredients(self, graph: RecipeGraph) -> dict[InternalItem, float]:
+        return self.eval(graph)[0]
 
 
-    def eval(self) -> tuple[dict[InternalItem, float], set[Technology], set[Category]]:
-        invalid_cache = any(loop.entry for ingredient in self.ingredients for loop in ingredient.recursive_loops) # todo less invalidation possible?
+    def eval(self, graph: RecipeGraph) -> tuple[dict[InternalItem, float], set[Technology], set[Category]]:
+        invalid_cache = any(loop.entry for ingredient in self.ingredients
+                            for loop in graph.get_recursive_loops(ingredient)) # todo less invalidation possible?
 
-        if self.__raw_ingredients and not invalid_cache:
-            return self.__raw_ingredients, self.__all_unlocking_technologies, self.__all_categories
+        evaluation = graph.recipe_evaluations.get(self)
+        if evaluation and evaluation[0] and not invalid_cache:
+            return evaluation
         invalid = False
 
         base_tech = self.unlocking_technologies
         req_categories = {self.category}
         ingredients = {}
         for ingredient, cost in self.ingredients.items():
-            if ingredient in InternalItem.evaluating:
+            if ingredient in graph.evaluating:
                 # recursion occured log and bounce
-                RecursiveRecipeLoop(ingredient)
+                RecursiveRecipeLoop(ingredient, graph)
                 return {}, set(), set() # todo fix recursion
                 invalid = True
                 continue
 
-            raw_ingredients, _, tech, cat = ingredient.eval()
+            raw_ingredients, _, tech, cat = ingredient.eval(graph)
             if not raw_ingredients:
                 # not currently a valid path fail
                 return {}, set(), set()
@@ -490,14 +771,11 @@ class Recipe(FactorioElement):
             return {}, set(), set()
 
         if not invalid_cache:
-            self.__raw_ingredients = ingredients
-            self.__all_unlocking_technologies = base_tech
-            self.__all_categories = req_categories
+            graph.recipe_evaluations[self] = ingredients, base_tech, req_categories
 
         return ingredients, base_tech, req_categories
 
 class Machine(FactorioElement):
-    evaluating: set[Machine] = set()
     def __init__(self, name, categories):
         self.name: str = name
         self.item: InternalItem | None
@@ -507,13 +785,16 @@ class Machine(FactorioElement):
             self.item = None
         self.categories: set = categories
 
-    def all_unlocking_technologies(self) -> set[Technology]:
+    def all_unlocking_technologies(self, graph: RecipeGraph,
+                                   machines_evaluating: set[Machine] | None = None) -> set[Technology]:
         if self.item:
-            if self in Machine.evaluating:
+            if machines_evaluating is None:
+                machines_evaluating = set()
+            if self in machines_evaluating:
                 return set()
-            Machine.evaluating.add(self)
-            tech = self.item.all_unlocking_technologies()
-            Machine.evaluating.remove(self)
+            machines_evaluating.add(self)
+            tech = self.item.all_unlocking_technologies(graph, machines_evaluating)
+            machines_evaluating.remove(self)
             return tech
         else:
             return set()
@@ -555,7 +836,7 @@ for recipe_name, recipe_data in raw_recipes.items():
                     {all_ingredients[ingredient]: amount for ingredient, amount in recipe_data["ingredients"].items()},
                     {all_ingredients[product]: amount for product, amount in recipe_data["products"].items()},
                     recipe_data["energy"] if "energy" in recipe_data else 0)
-    recipes[recipe_name] = recipe
+    recipes[recipe_name] = base_graph.add_recipe(recipe)
 
     # if (set(recipe.products).isdisjoint(set(recipe.ingredients)) # prevents loop recipes like uranium centrifuging
     #         and ("barrel" not in recipe.products or recipe.name == "barrel")
@@ -585,16 +866,39 @@ machines["bob-steam-mining-drill"] = Machine("bob-steam-mining-drill", {"basic-s
 
 del machines_future
 
+PrecalcEntry = tuple[Mapping[InternalItem, float], Recipe | None, frozenset["Technology"], frozenset[Category]]
+_precalc: dict[InternalItem, PrecalcEntry] | None = None
+
+
+def get_precalc() -> dict[InternalItem, PrecalcEntry]:
+    """
+    The evaluations of all items in data/precalc.json, in the format of InternalItem.eval.
+    Parsed once per process and shared read-only by all players, so the entries are immutable.
+    """
+    global _precalc
+    if _precalc is None:
+        from .Technologies import technology_table
+        categories: dict[Category, Category] = {}
+        _precalc = {}
+        for item_name, result in load_json_data("precalc").items():
+            _precalc[all_ingredients[item_name]] = (
+                MappingProxyType({all_ingredients[ingredient_name]: cost
+                                  for ingredient_name, cost in result["raw_ingredients"].items()}),
+                recipes[result["best_recipe"]] if result["best_recipe"] else None,
+                frozenset(technology_table[tech] for tech in result["technologies"]),
+                frozenset(categories.setdefault(category, category) for category in result["category"]))
+    return _precalc
+
+
 def load_precalc():
-    from .Technologies import technology_table
-    precalc = load_json_data("precalc")
-
-    for item_name, result in precalc.items():
-        item = all_ingredients[item_name]
-        item.set_cache({all_ingredients[ingredient_name]: cost for ingredient_name, cost in result["raw_ingredients"].items()},
-                       recipes[result["best_recipe"]] if result["best_recipe"] else None,
-                       {technology_table[tech] for tech in result["technologies"]},
-                       set(result["category"]))
+    """
+    Loads data/precalc.json into base_graph and freezes it, once per process.
+    Worlds only ever evaluate their custom products in their own overlays, so the base graph never has to be reset.
+    """
+    if not base_graph.frozen:
+        for item, entry in get_precalc().items():
+            base_graph.set_cache(item, *entry)
+        base_graph.frozen = True
 
 
 # build requirements graph for all technology ingredients
@@ -1,11 +1,15 @@
 """Outputs a Factorio Mod to facilitate integration with Archipelago"""
 
 import dataclasses
+import io
 import json
 import os
 import shutil
+import sys
 import threading
+import time
 import zipfile
+import zlib
 from typing import Optional, TYPE_CHECKING, Any, List, Callable, Tuple, Union
 
 import jinja2
@@ -30,6 +34,86 @@ settings_template: Optional[jinja2.Template] = None
 
 template_load_lock = threading.Lock()
 
+
+@dataclasses.dataclass(frozen=True)
+class PrecompressedFile:
+    """A file of data/mod, deflated once per process and copied raw into every player's mod."""
+    path: str  # relative to the mod directory
+    data: bytes
+    crc: int
+    file_size: int
+
+    @classmethod
+    def compress(cls, path: str, content: bytes, compression_level: int) -> "PrecompressedFile":
+        # same raw deflate stream zipfile produces for ZIP_DEFLATED
+        compressor = zlib.compressobj(compression_level, zlib.DEFLATED, -15)
+        data = compressor.compress(content) + compressor.flush()
+        return cls(path, data, zlib.crc32(content), len(content))
+
+    def write(self, opened_zipfile: zipfile.ZipFile, arcname: str) -> None:
+        """
+        Appends this file as arcname without deflating it again, mirroring ZipFile.writestr.
+        That relies on ZipFile internals, so where they aren't known to work, this inflates the file and uses writestr.
+        """
+        if can_append_raw(opened_zipfile):
+            self.append_raw(opened_zipfile, arcname)
+        else:
+            opened_zipfile.writestr(arcname, zlib.decompress(self.data, -15), zipfile.ZIP_DEFLATED)
+
+    def append_raw(self, opened_zipfile: zipfile.ZipFile, arcname: str) -> None:
+        zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.external_attr = 0o600 << 16
+        zinfo.CRC = self.crc
+        zinfo.compress_size = len(self.data)
+        zinfo.file_size = self.file_size
+        with opened_zipfile._lock:
+            if opened_zipfile._seekable:
+                opened_zipfile.fp.seek(opened_zipfile.start_dir)
+            zinfo.header_offset = opened_zipfile.fp.tell()
+            opened_zipfile._writecheck(zinfo)
+            opened_zipfile._didModify = True
+            opened_zipfile.fp.write(zinfo.FileHeader())
+            opened_zipfile.fp.write(self.data)
+            opened_zipfile.start_dir = opened_zipfile.fp.tell()
+            opened_zipfile.filelist.append(zinfo)
+            opened_zipfile.NameToInfo[zinfo.filename] = zinfo
+
+
+raw_append_versions = ((3, 11), (3, 12), (3, 13))
+"""Python versions whose ZipFile internals PrecompressedFile.append_raw was written against."""
+
+
+@Utils.cache_argsless
+def raw_append_works() -> bool:
+    """
+    Whether PrecompressedFile.append_raw works with this Python's ZipFile, checked once per process by appending to a
+    zip in memory and reading it back through the public API.
+    """
+    if sys.version_info[:2] not in raw_append_versions:
+        return False
+    content = b"Archipelago"
+    probe = PrecompressedFile.compress("probe", content, zlib.Z_DEFAULT_COMPRESSION)
+    buffer = io.BytesIO()
+    try:
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as opened_zipfile:
+            opened_zipfile.writestr("first", content)
+            probe.append_raw(opened_zipfile, "probe")
+            opened_zipfile.writestr("last", content)
+        with zipfile.ZipFile(buffer) as opened_zipfile:
+            return opened_zipfile.testzip() is None and opened_zipfile.namelist() == ["first", "probe", "last"] and \
+                all(opened_zipfile.read(name) == content for name in opened_zipfile.namelist())
+    except Exception:
+        return False
+
+
+def can_append_raw(opened_zipfile: zipfile.ZipFile) -> bool:
+    """Whether PrecompressedFile.append_raw works here, and the zipfile is open for writing with no member open."""
+    return opened_zipfile.mode != "r" and getattr(opened_zipfile, "_writing", True) is False and raw_append_works()
+
+
+static_mod_files: Optional[List[PrecompressedFile]] = None
+
 base_info = {
     "version": Utils.__version__,
     "title": "Archipelago",
@@ -85,11 +169,13 @@ class FactorioBobsModFile(worlds.Files.APPlayerContainer):
     game = "Factorio Bob's"
     compression_method = zipfile.ZIP_DEFLATED  # Factorio can't load LZMA archives
     writing_tasks: List[Callable[[], Tuple[str, Union[str, bytes]]]]
+    static_files: List[Tuple[str, PrecompressedFile]]
     patch_file_ending = ".zip"
 
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
         self.writing_tasks = []
+        self.static_files = []
 
     def write_contents(self, opened_zipfile: zipfile.ZipFile):
         # directory containing Factorio mod has to come first, or Factorio won't recognize this file as a mod.
@@ -100,6 +186,8 @@ class FactorioBobsModFile(worlds.Files.APPlayerContainer):
                 opened_zipfile.write(filename,
                                      os.path.relpath(filename,
                                                      os.path.join(mod_dir, '..')))
+        for target, static_file in self.static_files:
+            static_file.write(opened_zipfile, target)
         for task in self.writing_tasks:
             target, content = task()
             opened_zipfile.writestr(target, content)
@@ -107,21 +195,49 @@ class FactorioBobsModFile(worlds.Files.APPlayerContainer):
         super(FactorioBobsModFile, self).write_contents(opened_zipfile)
 
 
+def load_static_mod_files(zip_path: Optional[str]) -> List[PrecompressedFile]:
+    """Reads and deflates data/mod, which is the same for every player, from the apworld or from disk."""
+    compression_level = FactorioBobsModFile.compression_level
+    files: List[PrecompressedFile] = []
+    if zip_path:
+        with zipfile.ZipFile(zip_path) as zf:
+            for file in zf.infolist():
+                if not file.is_dir() and "/data/mod/" in file.filename:
+                    path_part = Utils.get_text_after(file.filename, "/data/mod/")
+                    files.append(PrecompressedFile.compress(path_part, zf.read(file), compression_level))
+    else:
+        basepath = os.path.join(os.path.dirname(__file__), "data", "mod")
+        for dirpath, dirnames, filenames in os.walk(basepath):
+            for filename in filenames:
+                file_path = os.path.join(dirpath, filename)
+                path_part = os.path.relpath(file_path, basepath).replace(os.sep, "/")
+                with open(file_path, "rb") as f:
+                    files.append(PrecompressedFile.compress(path_part, f.read(), compression_level))
+    return files
+
+
 def generate_mod(world: "FactorioBobs", output_directory: str):
     player = world.player
     multiworld = world.multiworld
     random = world.random
 
-    global data_final_template, locale_template, control_template, data_template, settings_template
+    global data_final_template, locale_template, control_template, data_template, settings_template, \
+        static_mod_files
     with template_load_lock:
+        if static_mod_files is None:
+            static_mod_files = load_static_mod_files(world.zip_path)
         if not data_final_template:
             def load_template(name: str):
                 import pkgutil
                 data = pkgutil.get_data(__name__, "data/mod_template/" + name).decode()
                 return data, name, lambda: False
 
+            # compiled templates are kept across processes, keyed by their source's checksum
+            bytecode_dir = Utils.cache_path("factorio_bobs", "templates")
+            os.makedirs(bytecode_dir, exist_ok=True)
             template_env: Optional[jinja2.Environment] = \
-                jinja2.Environment(loader=jinja2.FunctionLoader(load_template))
+                jinja2.Environment(loader=jinja2.FunctionLoader(load_template),
+                                   bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_dir))
 
             data_template = template_env.get_template("data.lua")
             data_final_template = template_env.get_template("data-final-fixes.lua")
@@ -190,21 +306,8 @@ def generate_mod(world: "FactorioBobs", output_directory: str):
     zf_path = os.path.join(output_directory, versioned_mod_name + ".zip")
     mod = FactorioBobsModFile(zf_path, player=player, player_name=world.player_name)
 
-    if world.zip_path:
-        with zipfile.ZipFile(world.zip_path) as zf:
-            for file in zf.infolist():
-                if not file.is_dir() and "/data/mod/" in file.filename:
-                    path_part = Utils.get_text_after(file.filename, "/data/mod/")
-                    mod.writing_tasks.append(lambda arcpath=versioned_mod_name+"/"+path_part, content=zf.read(file):
-                                             (arcpath, content))
-    else:
-        basepath = os.path.join(os.path.dirname(__file__), "data", "mod")
-        for dirpath, dirnames, filenames in os.walk(basepath):
-            base_arc_path = (versioned_mod_name+"/"+os.path.relpath(dirpath, basepath)).rstrip("/.\\")
-            for filename in filenames:
-                mod.writing_tasks.append(lambda arcpath=base_arc_path+"/"+filename,
-                                                file_path=os.path.join(dirpath, filename):
-                                         (arcpath, open(file_path, "rb").read()))
+    mod.static_files.extend((versioned_mod_name + "/" + static_file.path, static_file)
+                            for static_file in static_mod_files)
 
     mod.writing_tasks.append(lambda: (versioned_mod_name + "/data.lua",
                                       data_template.render(**template_data)))
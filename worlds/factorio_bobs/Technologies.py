@@ -9,7 +9,7 @@ import Utils
 from . import FactorioOptions
 from .FactorioUtils import FactorioElement, load_json_data
 from .InternalItem import raw_recipes, Recipe, InternalItem, recipe_sources, mining_with_fluid_sources, \
-    machine_per_category, all_ingredients, valid_ingredients, artifacts, invalid_ingredients
+    machine_per_category, all_ingredients, valid_ingredients, artifacts, invalid_ingredients, RecipeGraph, base_graph
 
 factorio_tech_id = factorio_base_id = 2 ** 17
 
@@ -103,25 +103,25 @@ class CustomTechnology(Technology):
         return technologies
 
 
-def unlock_just_tech(recipe: Recipe, _done) -> Set[Technology]:
+def unlock_just_tech(recipe: Recipe, graph: RecipeGraph, _done) -> Set[Technology]:
     current_technologies = recipe.unlocking_technologies
     for ingredient in recipe.ingredients:
-        current_technologies |= recursively_get_unlocking_technologies(ingredient, _done,
+        current_technologies |= recursively_get_unlocking_technologies(ingredient, graph, _done,
                                                                        unlock_func=unlock_just_tech)
     return current_technologies
 
 
-def unlock(recipe: Recipe, _done) -> Set[Technology]:
+def unlock(recipe: Recipe, graph: RecipeGraph, _done) -> Set[Technology]:
     current_technologies = recipe.unlocking_technologies
     for ingredient in recipe.ingredients:
-        current_technologies |= recursively_get_unlocking_technologies(ingredient, _done, unlock_func=unlock)
-    current_technologies |= machine_per_category[recipe.category].all_unlocking_technologies()
+        current_technologies |= recursively_get_unlocking_technologies(ingredient, graph, _done, unlock_func=unlock)
+    current_technologies |= machine_per_category[recipe.category].all_unlocking_technologies(graph)
 
     return current_technologies
 
 
-def recursively_get_unlocking_technologies(ingredient: InternalItem, _done=None, unlock_func=unlock_just_tech) -> Set[
-    Technology]:
+def recursively_get_unlocking_technologies(ingredient: InternalItem, graph: RecipeGraph = base_graph, _done=None,
+                                           unlock_func=unlock_just_tech) -> Set[Technology]:
     if _done:
         if ingredient in _done:
             return set()
@@ -131,11 +131,11 @@ def recursively_get_unlocking_technologies(ingredient: InternalItem, _done=None,
         _done = {ingredient}
     if ingredient is None:
         return set()
-    ingredient.get_raw_ingredients()
-    recipe = ingredient.best_recipe
+    ingredient.get_raw_ingredients(graph)
+    recipe = graph.get_best_recipe(ingredient)
     if not recipe:
         return set()
-    current_technologies = unlock_func(recipe, _done)
+    current_technologies = unlock_func(recipe, graph, _done)
 
     return current_technologies
 
@@ -186,26 +186,27 @@ del techs_future
 #     recursively_get_unlocking_technologies(ingredient_name, unlock_func=unlock)))
 required_technologies: Dict[str, FrozenSet[Technology]] = (
     Utils.KeyedDefaultDict(lambda ingredient_name:
-                           frozenset(all_ingredients[ingredient_name].all_unlocking_technologies())))
+                           frozenset(all_ingredients[ingredient_name].all_unlocking_technologies(base_graph))))
 required_technologies["water"] = frozenset()
 
 
 
 def get_rocket_requirements(silo_recipe: Optional[Recipe], part_recipe: Recipe,
-                            satellite_recipe: Optional[Recipe], cargo_landing_pad_recipe: Optional[Recipe]) -> Set[str]:
+                            satellite_recipe: Optional[Recipe], cargo_landing_pad_recipe: Optional[Recipe],
+                            graph: RecipeGraph) -> Set[str]:
     techs = set()
     if silo_recipe:
         for ingredient in silo_recipe.ingredients:
-            techs |= ingredient.all_unlocking_technologies()
+            techs |= ingredient.all_unlocking_technologies(graph)
     for ingredient in part_recipe.ingredients:
-        techs |= ingredient.all_unlocking_technologies()
+        techs |= ingredient.all_unlocking_technologies(graph)
     if cargo_landing_pad_recipe:
         for ingredient in cargo_landing_pad_recipe.ingredients:
-            techs |= ingredient.all_unlocking_technologies()
+            techs |= ingredient.all_unlocking_technologies(graph)
     if satellite_recipe:
         techs |= satellite_recipe.unlocking_technologies
         for ingredient in satellite_recipe.ingredients:
-            techs |= ingredient.all_unlocking_technologies()
+            techs |= ingredient.all_unlocking_technologies(graph)
     return {tech.name for tech in techs}
 
 
@@ -446,16 +447,19 @@ excluded_automation_ingredients: Set[str] = {"bob-diamond-ore",
                                             "bob-nickel-ore",
                                             "bob-rutile-ore", }.union(artifacts)
 
-def get_ordered_items(key: Callable[[InternalItem], int] = lambda item: item.get_score()) -> tuple[set[InternalItem], List[InternalItem]]:
+def get_ordered_items(graph: RecipeGraph, key: Callable[[InternalItem], float] | None = None) \
+        -> tuple[set[InternalItem], List[InternalItem]]:
     science_packs = FactorioOptions.MaxSciencePack.get_ordered_science_packs()
-    valid_items = set(x for x in valid_ingredients.values() if all(raw.name not in invalid_ingredients for raw in x.get_raw_ingredients().keys())
+    valid_items = set(x for x in valid_ingredients.values() if all(raw.name not in invalid_ingredients for raw in x.get_raw_ingredients(graph).keys())
                                                             and x.name not in science_packs)
     starting_pool = set()
     for item in valid_items:
-        if not item.all_unlocking_technologies() and not item.is_fluid and all(raw.name not in excluded_automation_ingredients for raw in item.get_raw_ingredients().keys()):
+        if not item.all_unlocking_technologies(graph) and not item.is_fluid and all(raw.name not in excluded_automation_ingredients for raw in item.get_raw_ingredients(graph).keys()):
             starting_pool.add(item)
 
     valid_items.difference_update(starting_pool)
+    if key is None:
+        key = lambda item: item.get_score(graph)
     ordered_items: list[InternalItem] = list(sorted(valid_items, key=key))
     return starting_pool, ordered_items
 
@@ -471,11 +475,11 @@ def get_science_pack_pools() -> Dict[str, List[InternalItem]]:
         for name, item in valid_ingredients.items():
             if (item.name not in science_packs
                     and not (science_pack == "automation-science-pack"
-                             and (item.all_unlocking_technologies()
+                             and (item.all_unlocking_technologies(base_graph)
                                   or item.is_fluid
-                                  or any(raw.name in excluded_automation_ingredients for raw in item.get_raw_ingredients().keys())))
+                                  or any(raw.name in excluded_automation_ingredients for raw in item.get_raw_ingredients(base_graph).keys())))
                     and item not in already_taken
-                    and item.get_score() < current_difficulty):
+                    and item.get_score(base_graph) < current_difficulty):
                 current.add(item)
 
         if science_pack == "logistic-science-pack":
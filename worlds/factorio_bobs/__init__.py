@@ -3,13 +3,15 @@ from __future__ import annotations
 import collections
 import logging
 import typing
+from random import Random
 
 import Utils
-from BaseClasses import Region, Location, Item, Tutorial, ItemClassification
+from BaseClasses import CollectionState, Region, Location, Item, Tutorial, ItemClassification, MultiWorld
 from worlds.AutoWorld import World, WebWorld
 from worlds.LauncherComponents import Component, components, Type, launch as launch_component
 from worlds.generic import Rules
-from .InternalItem import recipes, Recipe, all_ingredients, artifacts, load_precalc, InternalItem
+from .InternalItem import recipes, Recipe, all_ingredients, artifacts, load_precalc, InternalItem, recipe_tree_cache, \
+    RecipeGraph, base_graph
 from .Locations import location_pools, location_table
 from .Mod import generate_mod
 from .FactorioOptions import (FactorioOptions, MaxSciencePack, Silo, Satellite, TechTreeInformation, Goal,
@@ -85,6 +87,7 @@ class FactorioBobs(World):
     tech_mix: int = 0
     skip_silo: bool = False
     origin_region_name = "Nauvis"
+    incremental_reachability = True
     science_locations: typing.List[FactorioScienceLocation]
     removed_technologies: typing.Set[str]
     settings: typing.ClassVar[FactorioSettings]
@@ -97,12 +100,54 @@ class FactorioBobs(World):
         self.removed_technologies = useless_technologies.copy()
         self.advancement_technologies: set[Technology] = set()
         self.custom_recipes : typing.Dict[str, Recipe] = {}
-        self.custom_products: dict[str, InternalItem] = {}
+        self.recipe_graph = RecipeGraph(base_graph)
+        """custom recipes and products of this world, evaluated apart from other worlds"""
         self.science_locations = []
         self.tech_tree_layout_prerequisites = {}
 
     generate_output = generate_mod
 
+    @classmethod
+    def stage_precompute(cls, multiworld: MultiWorld) -> None:
+        # forked precompute workers inherit the loaded base graph instead of each parsing data/precalc.json again
+        load_precalc()
+
+    def precompute(self, random: Random) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        """Randomizes the custom recipes, returned by item names, which create_items then adds to self.recipe_graph."""
+        if hasattr(self.multiworld, "generation_is_fake"):
+            return None
+        load_precalc()
+        world_random = self.random
+        self.random = random
+        try:
+            self.set_custom_recipes()
+            return {
+                "recipes": {name: (recipe.category,
+                                   {ingredient.name: amount for ingredient, amount in recipe.ingredients.items()},
+                                   {product.name: amount for product, amount in recipe.products.items()},
+                                   recipe.energy, recipe.productivity)
+                            for name, recipe in self.custom_recipes.items()},
+                "advancement_technologies": sorted(technology.name for technology in self.advancement_technologies),
+            }
+        finally:
+            # only the result is kept, the same as when precompute runs in a worker process
+            self.random = world_random
+            self.recipe_graph = RecipeGraph(base_graph)
+            self.custom_recipes = {}
+            self.advancement_technologies = set()
+
+    def apply_precomputed_recipes(self, precomputed: typing.Dict[str, typing.Any]) -> None:
+        for name, (category, ingredients, products, energy, productivity) in precomputed["recipes"].items():
+            # ingredients are drawn from the items of base_graph, products are always solid items owned by this world
+            new_ingredients = {base_graph.items[ingredient]: amount for ingredient, amount in ingredients.items()}
+            custom_products = {self.recipe_graph.items.get(product) or
+                               self.recipe_graph.add_item(InternalItem(product, False)): amount
+                               for product, amount in products.items()}
+            recipe = self.recipe_graph.add_recipe(Recipe(name, category, new_ingredients, custom_products, energy))
+            recipe.productivity = productivity
+            self.custom_recipes[name] = recipe
+        self.advancement_technologies = {technology_table[name] for name in precomputed["advancement_technologies"]}
+
     def generate_early(self) -> None:
         # if max < min, then swap max and min
         if self.options.max_tech_cost < self.options.min_tech_cost:
@@ -174,7 +219,9 @@ class FactorioBobs(World):
     def create_items(self) -> None:
         load_precalc()
         self.custom_technologies = self.set_custom_technologies()
-        if  not hasattr(self.multiworld, "generation_is_fake"):
+        if self.precomputed is not None:
+            self.apply_precomputed_recipes(self.precomputed)
+        elif not hasattr(self.multiworld, "generation_is_fake"):
             self.set_custom_recipes()
 
         for trap_name in self.trap_names:
@@ -239,42 +286,63 @@ class FactorioBobs(World):
             # else:
             #     location.access_rule = lambda state: \
             #         all(state.has(technology.name, player) for technology in ingredient.all_unlocking_technologies())
-            Rules.set_rule(location, lambda state, items=frozenset(ingredient.all_unlocking_technologies()): all(state.has(technology.name, player)
-                                                       for technology in items))
+            Rules.set_rule(location, self.compile_rule({technology.name for technology
+                                                        in ingredient.all_unlocking_technologies(self.recipe_graph)}))
 
-        for location in self.science_locations:
-            Rules.set_rule(location, lambda state: True)
-            for ingredient_name in location.ingredients:
-                Rules.add_rule(location, lambda state, lambda_ingredient=ingredient_name: state.has(f"Automated {lambda_ingredient}", player))
-            # Rules.set_rule(location, lambda state, ingredients=frozenset(location.ingredients):
-            #     all(state.has(f"Automated {ingredient}", player) for ingredient in ingredients))
-            prerequisites = shapes.get(location)
-            if prerequisites:
-                Rules.add_rule(location, lambda state, locations=frozenset(prerequisites):
-                    all(state.can_reach(loc) for loc in locations))
+        for location, requirements in self.get_science_requirements(shapes).items():
+            Rules.set_rule(location, self.compile_rule(requirements))
 
         silo_recipe = None
         cargo_pad_recipe = None
         if self.options.silo != Silo.option_spawn:
-            silo_recipe = self.get_internal_item("rocket-silo").best_recipe
-            cargo_pad_recipe = self.get_internal_item("cargo-landing-pad").best_recipe
+            silo_recipe = self.recipe_graph.get_best_recipe(self.get_internal_item("rocket-silo"))
+            cargo_pad_recipe = self.recipe_graph.get_best_recipe(self.get_internal_item("cargo-landing-pad"))
         part_recipe = self.custom_recipes["rocket-part"]
         satellite_recipe = None
         if self.options.goal == Goal.option_satellite:
-            satellite_recipe = self.get_internal_item("satellite").best_recipe
-        victory_tech_names = get_rocket_requirements(silo_recipe, part_recipe, satellite_recipe, cargo_pad_recipe)
+            satellite_recipe = self.recipe_graph.get_best_recipe(self.get_internal_item("satellite"))
+        victory_tech_names = get_rocket_requirements(silo_recipe, part_recipe, satellite_recipe, cargo_pad_recipe,
+                                                     self.recipe_graph)
         if self.options.silo == Silo.option_spawn:
             victory_tech_names -= {"rocket-silo"}
         else:
             victory_tech_names |= {"rocket-silo"}
-        self.get_location("Rocket Launch").access_rule = lambda state: all(state.has(technology, player)
-                                                                           for technology in
-                                                                           victory_tech_names)
+        self.get_location("Rocket Launch").access_rule = self.compile_rule(victory_tech_names)
         self.multiworld.completion_condition[player] = lambda state: state.has('Victory', player)
 
+    def compile_rule(self, item_names: typing.Iterable[str]) -> typing.Callable[[CollectionState], bool]:
+        """Returns a rule requiring each of item_names once, checked with a single has_all_counts call."""
+        requirements = {item_name: 1 for item_name in sorted(item_names)}
+        player = self.player
+        return lambda state: state.has_all_counts(requirements, player)
+
+    def get_science_requirements(self, shapes: dict[FactorioScienceLocation, set[FactorioScienceLocation]]) \
+            -> dict[FactorioScienceLocation, set[str]]:
+        """
+        Returns the items each science location requires, including those of its tech tree prerequisites.
+        Nauvis is always reachable, so reaching a prerequisite only depends on having its items.
+        """
+        requirements: dict[FactorioScienceLocation, set[str]] = {}
+
+        def get_requirements(location: FactorioScienceLocation) -> set[str]:
+            if location not in requirements:
+                location_requirements = {f"Automated {ingredient}" for ingredient in location.ingredients}
+                for prerequisite in shapes.get(location, ()):
+                    location_requirements |= get_requirements(prerequisite)
+                requirements[location] = location_requirements
+            return requirements[location]
+
+        for location in self.science_locations:
+            get_requirements(location)
+        return requirements
+
+    @classmethod
+    def stage_set_rules(cls, multiworld) -> None:
+        recipe_tree_cache.log_stats()
+        recipe_tree_cache.save()
+
     def get_internal_item(self, name: str) -> InternalItem:
-        return self.custom_products[name] if name in self.custom_products \
-            else all_ingredients[name]
+        return self.recipe_graph.get_item(name)
 
     def generate_basic(self):
         map_basic_settings = self.options.world_gen.value["basic"]
@@ -339,13 +407,9 @@ class FactorioBobs(World):
                 liquids_used += 1 if new_ingredient.is_fluid else 0
             new_ingredients[new_ingredient] = 1
 
-        custom_products = {}
-        for product, amount in products.items():
-            if product.name not in self.custom_products:
-                self.custom_products[product.name] = InternalItem(product.name, product.is_fluid)
-            custom_products[self.custom_products[product.name]] = amount
-        return Recipe(name, self.get_category(category, liquids_used), new_ingredients,
-                      custom_products, energy)
+        custom_products = {self.recipe_graph.own_item(product): amount for product, amount in products.items()}
+        return self.recipe_graph.add_recipe(Recipe(name, self.get_category(category, liquids_used), new_ingredients,
+                                                   custom_products, energy))
 
     def make_quick_recipe(self, original: Recipe, pool: set[InternalItem], allow_liquids: int = 2,
                           ingredients_offset: int = 0) -> Recipe:
@@ -367,20 +431,17 @@ class FactorioBobs(World):
                 liquids_used += 1 if new_ingredient.is_fluid else 0
             new_ingredients[new_ingredient] = 1
 
-        custom_products = {}
-        for product, amount in original.products.items():
-            if product.name not in self.custom_products:
-                self.custom_products[product.name] = InternalItem(product.name, product.is_fluid)
-            custom_products[self.custom_products[product.name]] = amount
-        return Recipe(original.name, self.get_category(original.category, liquids_used), new_ingredients,
-                      custom_products, original.energy)
+        custom_products = {self.recipe_graph.own_item(product): amount for product, amount in original.products.items()}
+        return self.recipe_graph.add_recipe(Recipe(original.name, self.get_category(original.category, liquids_used),
+                                                   new_ingredients, custom_products, original.energy))
 
     def make_balanced_recipe(self, original: Recipe, pool: list[InternalItem], factor: float = 1,
                              allow_liquids: int = 2, ingredients_offset: int = 0) -> Recipe:
         """Generate a recipe from pool with time and cost similar to original * factor"""
         new_ingredients = {}
-        target_raw = int(sum((count for ingredient, count in original.get_raw_ingredients().items())) * factor)
-        target_energy = original.total_energy * factor
+        graph = self.recipe_graph
+        target_raw = int(sum((count for ingredient, count in original.get_raw_ingredients(graph).items())) * factor)
+        target_energy = original.total_energy(graph) * factor
         target_num_ingredients = len(original.ingredients) + ingredients_offset
         remaining_raw = target_raw
         remaining_energy = target_energy
@@ -395,10 +456,10 @@ class FactorioBobs(World):
                 continue  # can't use this lambda_ingredient as we already have maximum liquid in our recipe.
             ingredient_raw = 0
             if ingredient.name in all_ingredients:
-                ingredient_recipe = ingredient.best_recipe
+                ingredient_recipe = graph.get_best_recipe(ingredient)
                 if ingredient_recipe:
-                    ingredient_raw = sum((count for ingredient, count in ingredient_recipe.get_raw_ingredients().items()))
-                    ingredient_energy = ingredient_recipe.total_energy
+                    ingredient_raw = sum((count for ingredient, count in ingredient_recipe.get_raw_ingredients(graph).items()))
+                    ingredient_energy = ingredient_recipe.total_energy(graph)
                 else:
                     print("no best recipe for ingredient", ingredient.name)
             else:
@@ -442,12 +503,12 @@ class FactorioBobs(World):
                 fallback_pool.append(ingredient)
                 continue  # can't use this lambda_ingredient as we already have maximum liquid in our recipe.
 
-            ingredient_recipe = ingredient.best_recipe
+            ingredient_recipe = graph.get_best_recipe(ingredient)
             if not ingredient_recipe:
                 logging.warning(f"missing recipe for {ingredient}")
                 continue
-            ingredient_raw = sum((count for ingredient, count in ingredient.get_raw_ingredients().items()))
-            ingredient_energy = ingredient_recipe.total_energy
+            ingredient_raw = sum((count for ingredient, count in ingredient.get_raw_ingredients(graph).items()))
+            ingredient_energy = ingredient_recipe.total_energy(graph)
             num_raw = remaining_raw / ingredient_raw / remaining_num_ingredients
             num_energy = remaining_energy / ingredient_energy / remaining_num_ingredients
             num = int(min(num_raw, num_energy))
@@ -468,23 +529,20 @@ class FactorioBobs(World):
 
         pool.extend(fallback_pool)
 
-        custom_products = {}
-        for product, amount in original.products.items():
-            if product.name not in self.custom_products:
-                self.custom_products[product.name] = InternalItem(product.name, product.is_fluid)
-            custom_products[self.custom_products[product.name]] = amount
+        custom_products = {self.recipe_graph.own_item(product): amount for product, amount in original.products.items()}
 
-        return Recipe(original.name, self.get_category(original.category, liquids_used), new_ingredients,
-                      custom_products, original.energy)
+        return self.recipe_graph.add_recipe(Recipe(original.name, self.get_category(original.category, liquids_used),
+                                                   new_ingredients, custom_products, original.energy))
 
     def get_internal_item_pools(self) -> dict[str, list[InternalItem]]:
-        automation_pool, ordered_items = get_ordered_items()
+        automation_pool, ordered_items = get_ordered_items(self.recipe_graph)
         item_pools: dict[str, list[InternalItem]] = {"automation-science-pack":
                                                          list(sorted(automation_pool, key=lambda item: item.name))}
 
         # TODO enable artifacts with custom recepes
         ordered_items = [item for item in ordered_items
-                         if all(raw.name not in artifacts for raw in item.get_raw_ingredients().keys())]
+                         if all(raw.name not in artifacts
+                                for raw in item.get_raw_ingredients(self.recipe_graph).keys())]
 
         ordered_items = ordered_items[:int(len(ordered_items) * (self.options.percent_items_in_game.value / 100))]
 
@@ -517,7 +575,7 @@ class FactorioBobs(World):
                 valid_pool = science_pack_pools[pack]
             else:
                 valid_pool += science_pack_pools[pack]
-            if self.options.recipe_ingredients or all_ingredients[pack].best_recipe is None:
+            if self.options.recipe_ingredients or self.recipe_graph.get_best_recipe(all_ingredients[pack]) is None:
                 pack_item = all_ingredients[pack]
                 return_amount = index//2 + 1
                 new_recipe = self.make_custom_recipe(pack, {pack_item: return_amount},
@@ -531,12 +589,12 @@ class FactorioBobs(World):
             rocket_pool = science_pack_pools["rocket"]
         else:
             rocket_pool = science_pack_pools[self.options.max_science_pack.get_max_pack()]
-        custom_rocket_part = InternalItem("rocket-part", False)
-        self.custom_products[custom_rocket_part.name] = custom_rocket_part
-        self.custom_recipes["rocket-part"] = Recipe("rocket-part", original_rocket_part.category,
-                                                     {item: 10 for item in self.random.sample(rocket_pool, 3 + ingredients_offset)},
-                                                     {custom_rocket_part: 1},
-                                                     original_rocket_part.energy)
+        custom_rocket_part = self.recipe_graph.add_item(InternalItem("rocket-part", False))
+        self.custom_recipes["rocket-part"] = self.recipe_graph.add_recipe(
+            Recipe("rocket-part", original_rocket_part.category,
+                   {item: 10 for item in self.random.sample(rocket_pool, 3 + ingredients_offset)},
+                   {custom_rocket_part: 1},
+                   original_rocket_part.energy))
         self.custom_recipes["rocket-part"].productivity = True
 
         if self.options.silo.value == Silo.option_randomize_recipe \
@@ -561,8 +619,7 @@ class FactorioBobs(World):
                     factor=(self.options.max_science_pack.value + 1) / 7,
                     ingredients_offset=ingredients_offset.value)
                 self.custom_recipes["satellite"] = new_recipe
-        bridge = InternalItem("ap-energy-bridge", False)
-        self.custom_products["ap-energy-bridge"] = bridge
+        bridge = self.recipe_graph.add_item(InternalItem("ap-energy-bridge", False))
         new_recipe = self.make_custom_recipe(bridge.name, {bridge: 1}, 6+ingredients_offset.value, 10,
             science_pack_pools[self.options.max_science_pack.get_ordered_science_packs()[0]])
         for ingredient_name in new_recipe.ingredients:
@@ -570,7 +627,7 @@ class FactorioBobs(World):
         self.custom_recipes[bridge.name] = new_recipe
 
         needed_items = {self.get_internal_item(pack) for pack in self.options.max_science_pack.get_allowed_packs()}
-        needed_items.add(self.custom_products["rocket-part"])
+        needed_items.add(custom_rocket_part)
         if self.options.silo != Silo.option_spawn:
             needed_items.add(self.get_internal_item("rocket-silo"))
             needed_items.add(self.get_internal_item("cargo-landing-pad"))
@@ -578,7 +635,7 @@ class FactorioBobs(World):
             needed_items.add(self.get_internal_item("satellite"))
 
         for item in needed_items:
-            self.advancement_technologies |= item.all_unlocking_technologies()
+            self.advancement_technologies |= item.all_unlocking_technologies(self.recipe_graph)
 
         # handle marking progressive techs as advancement
         prog_add = set()
@@ -622,12 +679,9 @@ class FactorioBobs(World):
                     liquids_used += 1
                 new_ingredients[ingredient] = 1
 
-            custom_products = {}
-            if product.name not in self.custom_products:
-                self.custom_products[product.name] = InternalItem(product.name, product.is_fluid)
-            custom_products[self.custom_products[product.name]] = 1
-            self.custom_recipes[product_name] = Recipe(product_name, self.get_category("crafting", liquids_used), new_ingredients,
-                                                       custom_products, 1)
+            custom_products = {self.recipe_graph.own_item(product): 1}
+            self.custom_recipes[product_name] = self.recipe_graph.add_recipe(
+                Recipe(product_name, self.get_category("crafting", liquids_used), new_ingredients, custom_products, 1))
         self.set_rules()
 
 
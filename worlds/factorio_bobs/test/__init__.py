@@ -0,0 +1,5 @@
+from test.bases import WorldTestBase
+
+
+class FactorioBobsTestBase(WorldTestBase):
+    game = "Factorio Bob's"
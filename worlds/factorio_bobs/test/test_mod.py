@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import zipfile
+from unittest import mock
+
+from Fill import distribute_items_restrictive
+from . import FactorioBobsTestBase
+from .. import Mod
+
+
+class TestModFile(FactorioBobsTestBase):
+    run_default_tests = False
+
+    def generate_mod(self, output_directory: str) -> zipfile.ZipFile:
+        Mod.generate_mod(self.world, output_directory)
+        zip_path, = (os.path.join(output_directory, file) for file in os.listdir(output_directory)
+                     if file.endswith(".zip"))
+        return zipfile.ZipFile(zip_path)
+
+    def assert_mod_files(self, mod_zip: zipfile.ZipFile) -> None:
+        self.assertIsNone(mod_zip.testzip())
+        mod_dir = os.path.join(os.path.dirname(Mod.__file__), "data", "mod")
+        static_files = {}
+        for dirpath, dirnames, filenames in os.walk(mod_dir):
+            for filename in filenames:
+                with open(os.path.join(dirpath, filename), "rb") as f:
+                    static_files[os.path.relpath(os.path.join(dirpath, filename), mod_dir).replace(os.sep, "/")] = \
+                        f.read()
+        mod_name = mod_zip.namelist()[0].split("/")[0]
+        members = {name[len(mod_name) + 1:]: name for name in mod_zip.namelist()}
+        self.assertLessEqual(static_files.keys(), members.keys())
+        for path, content in static_files.items():
+            with self.subTest(path=path):
+                self.assertEqual(mod_zip.read(members[path]), content)
+        for path in ("data.lua", "data-final-fixes.lua", "control.lua", "settings.lua", "locale/en/locale.cfg",
+                     "info.json"):
+            self.assertIn(path, members)
+
+    def test_mod_zip(self) -> None:
+        """Test that the mod is a valid zip containing data/mod, with data/mod copied raw and through the fallback."""
+        distribute_items_restrictive(self.multiworld)
+        with tempfile.TemporaryDirectory() as output_directory, self.generate_mod(output_directory) as mod_zip:
+            self.assert_mod_files(mod_zip)
+        with tempfile.TemporaryDirectory() as output_directory, \
+                mock.patch.object(Mod, "can_append_raw", return_value=False) as can_append_raw, \
+                self.generate_mod(output_directory) as mod_zip:
+            self.assertTrue(can_append_raw.called)
+            self.assert_mod_files(mod_zip)
+
+    def test_raw_append_probe(self) -> None:
+        """Test that copying data/mod raw is used exactly on the Python versions it was written against."""
+        self.assertEqual(Mod.raw_append_works(), sys.version_info[:2] in Mod.raw_append_versions)
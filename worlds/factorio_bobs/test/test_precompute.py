@@ -0,0 +1,45 @@
+import os
+import unittest
+from typing import Any
+
+from BaseClasses import MultiWorld
+from test.general import gen_steps, setup_multiworld
+from worlds.AutoWorld import call_all, call_precompute
+from .. import FactorioBobs
+
+
+class TestPrecompute(unittest.TestCase):
+    @staticmethod
+    def generate(workers: int) -> MultiWorld:
+        multiworld = setup_multiworld([FactorioBobs, FactorioBobs], (), seed=0)
+        call_precompute(multiworld, workers)
+        for step in gen_steps:
+            call_all(multiworld, step)
+        return multiworld
+
+    @staticmethod
+    def get_recipes(multiworld: MultiWorld) -> dict[int, Any]:
+        return {player: ({name: (recipe.category, {item.name: amount for item, amount in recipe.ingredients.items()},
+                                 {item.name: amount for item, amount in recipe.products.items()},
+                                 recipe.energy, recipe.productivity)
+                          for name, recipe in world.custom_recipes.items()},
+                         sorted(technology.name for technology in world.advancement_technologies))
+                for player, world in multiworld.worlds.items()}
+
+    def test_precomputed_recipes_are_applied(self) -> None:
+        """Test that create_items adds exactly the precomputed recipes to the world's own recipe graph."""
+        multiworld = self.generate(1)
+        recipes = self.get_recipes(multiworld)
+        for player, world in multiworld.worlds.items():
+            with self.subTest(player=player):
+                self.assertEqual(recipes[player][0], world.precomputed["recipes"])
+                self.assertEqual(recipes[player][1], world.precomputed["advancement_technologies"])
+                for recipe in world.custom_recipes.values():
+                    for product in recipe.products:
+                        self.assertIs(world.recipe_graph.owner(product), world.recipe_graph)
+        self.assertNotEqual(recipes[1], recipes[2])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_workers_match_main_process(self) -> None:
+        """Test that randomizing recipes in worker processes gives the same worlds as doing it in the main process."""
+        self.assertEqual(self.get_recipes(self.generate(1)), self.get_recipes(self.generate(2)))
@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from ..InternalItem import RecipeTreeCache, all_ingredients
+
+
+class TestRecipeTreeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "recipe_trees.json")
+        self.item = next(iter(all_ingredients.values()))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def store(self, cache: RecipeTreeCache, digest: str) -> None:
+        cache.store(digest, {self.item: 1.0}, None, set(), set())
+
+    def test_hits_dont_rewrite(self) -> None:
+        """Test that the cache is only written again when entries were added, not when they were only read."""
+        cache = RecipeTreeCache(self.path)
+        self.store(cache, "a")
+        cache.save()
+        modified = os.stat(self.path).st_mtime_ns
+
+        cache = RecipeTreeCache(self.path)
+        self.assertIsNotNone(cache.get(self.item, "a"))
+        self.assertFalse(cache.dirty)
+        cache.save()
+        self.assertEqual(os.stat(self.path).st_mtime_ns, modified)
+
+    def test_save_merges(self) -> None:
+        """Test that saving keeps the entries other generators saved since the cache was loaded."""
+        first = RecipeTreeCache(self.path)
+        second = RecipeTreeCache(self.path)
+        first.load()
+        second.load()
+        self.store(first, "a")
+        self.store(second, "b")
+        first.save()
+        second.save()
+        self.assertEqual(list(RecipeTreeCache(self.path).load()), ["a", "b"])
+
+        # entries used since loading move to the most recently used end, and the least recently used are evicted
+        third = RecipeTreeCache(self.path)
+        third.max_entries = 2
+        self.assertIsNotNone(third.get(self.item, "a"))
+        self.store(third, "c")
+        third.save()
+        self.assertEqual(list(RecipeTreeCache(self.path).load()), ["a", "c"])